@@ -0,0 +1,62 @@
+"""Measure the cost of a call.
+
+Runs the same calls with more and more global variables set and prints how long a call takes with each engine, so
+the time a call takes can be checked not to grow with the symbols of its caller.
+
+"""
+
+import sys
+import time
+
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.evaluator import Evaluator
+from nem.closures import ClosureEvaluator
+from nem.vm import VirtualMachine
+from nem.stack_evaluator import StackEvaluator
+from nem.transpiler import PythonEvaluator
+from nem.symbol_table import SymbolTable
+import nem.types_ as value
+
+
+CODE = """function add(a, b) (
+    return a + b + offset
+)
+
+i = 0
+total = 0
+while (i < {calls}) (
+    total = add(total, i)
+    i = i + 1
+)
+"""
+
+
+def main():
+    """Measure the cost of a call.
+
+    Used as the entry-point when the file gets ran directly. The number of calls can be given as the only argument.
+
+    """
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    abstract_syntax_tree = list(Parser(Lexer(CODE.format(calls=calls), "<benchmark>").lex()).parse())
+
+    for evaluator in (Evaluator, ClosureEvaluator, VirtualMachine, PythonEvaluator, StackEvaluator):
+        for size in (0, 1000, 100000):
+            symbol_table = SymbolTable()
+            symbol_table.set("offset", value.Number(1))
+
+            # Globals as big as a call could copy, lists included
+            for index in range(size):
+                symbol_table.set("global_{}".format(index), value.List([value.Number(index)] * 10))
+
+            start = time.perf_counter()
+            list(evaluator(abstract_syntax_tree, symbol_table).evaluate())
+            elapsed = time.perf_counter() - start
+
+            print("{:<16} {:>6} globals {:>8.2f} us per call".format(evaluator.__name__, size, elapsed / calls * 1e6))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    main()
@@ -0,0 +1,64 @@
+"""Measure the cost of evaluating a node.
+
+Evaluates small programs that each mostly use one kind of node and prints how long the Evaluator takes per node
+evaluated, so the overhead every node pays, like checking for return, continue and break, can be compared between
+versions of the Evaluator.
+
+"""
+
+import sys
+import time
+
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.evaluator import Evaluator
+from nem.symbol_table import SymbolTable
+import nem.types_ as value
+
+
+# Each program, and how many nodes it evaluates per repetition
+PROGRAMS = (
+    ("literal", "1\n", 1),
+    ("variable", "x\n", 1),
+    ("operation", "x + 1\n", 3),
+    ("unary", "not x\n", 2),
+    ("assignment", "y = x\n", 2),
+    ("block", "(x\nx\nx\nx)\n", 5),
+    ("list", "y = [x, x, x]\n", 5),
+    ("if", "if (x) (x) otherwise (x)\n", 5),
+    ("call", "f(x)\n", 5),
+)
+
+
+def main():
+    """Measure the cost of evaluating a node.
+
+    Used as the entry-point when the file gets ran directly. The number of repetitions can be given as the only
+    argument.
+
+    """
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    for name, code, nodes in PROGRAMS:
+        symbol_table = SymbolTable()
+        symbol_table.set("x", value.Number(1))
+        list(Evaluator(Parser(Lexer("function f(a) (return a)\n", "<benchmark>").lex()).parse(), symbol_table)
+             .evaluate())
+
+        # A single block, so the nodes are evaluated without going back to the top level in between
+        abstract_syntax_tree = list(Parser(Lexer("(" + code * repetitions + ")\n", "<benchmark>").lex()).parse())
+
+        # The fastest of a few runs, as it's the one the least disturbed by anything else running
+        elapsed = float("inf")
+
+        for _ in range(3):
+            start = time.perf_counter()
+            list(Evaluator(abstract_syntax_tree, symbol_table).evaluate())
+            elapsed = min(elapsed, time.perf_counter() - start)
+
+        print("{:<12} {:>8.0f} ns per node".format(name, elapsed / (repetitions * nodes) * 1e9))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    main()
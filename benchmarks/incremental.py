@@ -0,0 +1,47 @@
+"""Measure the latency of editing a Document.
+
+Builds documents of different sizes and prints how long a single character edit in the middle of each one takes, along
+with looking up the line and the column of the tokens around it, so the latency can be checked to follow the size of
+the edit rather than the size of the code.
+
+"""
+
+import sys
+import time
+
+from nem.incremental import Document
+
+
+EXPRESSION = "value = [1, \"text\", value2] # comment\n"
+
+
+def main():
+    """Measure the latency of editing a Document.
+
+    Used as the entry-point when the file gets ran directly. The sizes, in expressions, can be given as the arguments.
+
+    """
+    sizes = [int(size) for size in sys.argv[1:]] or [2000, 20000, 200000]
+    edits = 200
+
+    for size in sizes:
+        document = Document(EXPRESSION * size, "<benchmark>")
+        position = len(EXPRESSION) * (size // 2) + EXPRESSION.index("1")
+
+        start = time.perf_counter()
+
+        for index in range(edits):
+            # Turns the 1 into a 2 and back, so the code stays the same size
+            document.edit(position, position + 1, str(index % 2 + 1))
+
+            token = document.tokens[(size // 2) * 10 + 3]
+            token.line, token.column
+
+        elapsed = time.perf_counter() - start
+
+        print("{} expressions, {:.3f} ms per edit".format(size, elapsed / edits * 1000))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    main()
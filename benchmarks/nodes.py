@@ -0,0 +1,61 @@
+"""Measure the memory of an AST.
+
+Parses generated code and prints how many bytes the AST takes per node, so different versions of the nodes can be
+compared by running it on each of them.
+
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from nem.lexer import Lexer
+import nem.nodes as ast
+from nem.parser import Parser
+
+
+CODE = """function fibonacci(n) (
+    a = 0
+    b = 1
+    while n > 0 (
+        c = a + b * 2 - (a % 3)
+        a = b
+        b = c
+        n = n - 1
+    )
+    return [a, b, "text"[0], fibonacci(n - 1)]
+)
+"""
+
+
+def main():
+    """Measure the memory of an AST.
+
+    Used as the entry-point when the file gets ran directly. The number of copies of the code can be given as the only
+    argument.
+
+    """
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    # The tokens and their values are kept alive while measuring, so only the nodes and their lists are counted
+    tokens = list(Lexer(CODE * copies, "<benchmark>").lex())
+
+    gc.collect()
+    tracemalloc.start()
+
+    abstract_syntax_tree = list(Parser(tokens).parse())
+
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodes = sum(isinstance(temporary, ast.Node) for temporary in gc.get_objects())
+
+    print("{} nodes, {} bytes, {:.1f} bytes per node".format(nodes, size, size / nodes))
+
+    return abstract_syntax_tree
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    main()
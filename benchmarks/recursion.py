@@ -0,0 +1,57 @@
+"""Measure the cost of deep recursion.
+
+Runs a function that recurses down to the depth given, with class Evaluator and with class StackEvaluator, and prints
+how long a call takes and how deep the calls and the stack of the StackEvaluator got, or the error an evaluator fails
+with, so the depth each evaluator can recurse to can be compared.
+
+"""
+
+import sys
+import time
+
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.evaluator import Evaluator
+from nem.stack_evaluator import StackEvaluator
+from nem.symbol_table import SymbolTable
+
+
+CODE = """function down(n) (
+    if (n is 0) (return 0) otherwise (return 1 + down(n - 1))
+)
+
+down({depth})
+"""
+
+
+def main():
+    """Measure the cost of deep recursion.
+
+    Used as the entry-point when the file gets ran directly. The depth can be given as the only argument.
+
+    """
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    abstract_syntax_tree = list(Parser(Lexer(CODE.format(depth=depth), "<benchmark>").lex()).parse())
+
+    for evaluator_class in (Evaluator, StackEvaluator):
+        evaluator = evaluator_class(abstract_syntax_tree, SymbolTable())
+        evaluator.LIMIT = depth + 1
+
+        start = time.perf_counter()
+
+        try:
+            list(evaluator.evaluate())
+        except RecursionError as error:
+            print("{:<16} {}".format(evaluator_class.__name__, error))
+            continue
+
+        elapsed = time.perf_counter() - start
+
+        print("{:<16} {:>8.2f} us per call, deepest {}, largest {}"
+              .format(evaluator_class.__name__, elapsed / (depth + 1) * 1e6, getattr(evaluator, "deepest", "-"),
+                      getattr(evaluator, "largest", "-")))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    main()
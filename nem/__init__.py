@@ -1,11 +1,24 @@
 """Initialize modules."""
 
+import nem.cache
+import nem.closures
+import nem.compiler
 import nem.evaluator
 import nem.exceptions
+import nem.incremental
 import nem.interpreter
 import nem.lexer
 import nem.nodes
+import nem.optimizer
 import nem.parser
+import nem.pratt_parser
+import nem.resolver
+import nem.source
+import nem.stack_evaluator
+import nem.stack_parser
 import nem.symbol_table
 import nem.token_
+import nem.tracer
+import nem.transpiler
 import nem.types_
+import nem.vm
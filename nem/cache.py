@@ -0,0 +1,151 @@
+"""Cache parsed code.
+
+Holds class Cache which stores the AST of a file on disk, so code that didn't change doesn't have to be lexed and parsed
+again.
+
+"""
+
+import gc
+import hashlib
+import os
+import pickle
+
+import nem.nodes
+from nem.source import Source
+
+
+class Cache:
+
+    """Store the AST of a file on disk.
+
+    The AST of a file gets stored in a .nemc file in the __nemcache__ directory next to it. The file starts with a
+    header holding the version of the format and a hash of the code and of the version of the interpreter, so a cache
+    of different code or of another version of Nem is never used. The nodes are stored along with the starts of the
+    lines of the code, so loading them never needs the code itself.
+
+    Setting the NEMNOCACHE environment variable, or ENABLED to False, turns the cache off for everything the
+    interpreter runs.
+
+    """
+
+    MAGIC = b"NEMC"
+
+    # Version of the format of the file, changed whenever the nodes change
+    FORMAT = 6
+
+    # Version of the interpreter
+    VERSION = "1.0.0"
+
+    DIRECTORY = "__nemcache__"
+
+    ENABLED = not os.environ.get("NEMNOCACHE")
+
+    # Amount of a file hashed at once
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, path, directory=None):
+        """Initialize Cache class.
+
+        The path is the one of the file that gets cached. Without a directory, the cache is kept next to the file.
+
+        """
+        if directory is None:
+            directory = os.path.join(os.path.dirname(path), self.DIRECTORY)
+
+        self.path = os.path.join(directory, os.path.splitext(os.path.basename(path))[0] + ".nemc")
+
+    def header(self, code):
+        """Return the header of the cache of the code, or None if the code can't be read again after hashing it.
+
+        The code can be anything the Lexer accepts. Files are hashed chunk by chunk, so the code is never all in memory
+        at once, and a file object is moved back to where it was afterwards, so it can still be lexed. Streams that
+        can't be moved back, like pipes, can't be cached.
+
+        """
+        digest = hashlib.sha256(self.VERSION.encode() + b"\0")
+
+        if isinstance(code, str):
+            digest.update(code.encode())
+        elif isinstance(code, os.PathLike):
+            with open(code, "rb") as file:
+                self._hash(file, digest)
+        elif hasattr(code, "read"):
+            if not (hasattr(code, "seekable") and code.seekable()):
+                return None
+
+            position = code.tell()
+            self._hash(code, digest)
+            code.seek(position)
+        else:
+            digest.update(code)
+
+        return self.MAGIC + bytes([self.FORMAT]) + digest.digest()
+
+    def _hash(self, file, digest):
+        """Hash the rest of the file."""
+        chunk = file.read(self.CHUNK_SIZE)
+
+        while chunk:
+            digest.update(chunk)
+            chunk = file.read(self.CHUNK_SIZE)
+
+    def load(self, header, filename):
+        """Return the cached AST of the code with the header, or None if there isn't a valid one."""
+
+        class Unpickler(pickle.Unpickler):
+
+            """Load nodes located in the file."""
+
+            def find_class(self, module, name):
+                """Return the class of an object, as long as it's a node or a Source."""
+                if module == "nem.source" and name == "Source":
+                    return lambda _, line_starts: Source.located(filename, line_starts)
+                if module == "nem.nodes" and isinstance(getattr(nem.nodes, name, None), type):
+                    return getattr(nem.nodes, name)
+
+                raise pickle.UnpicklingError("Unexpected class {}.{}".format(module, name))
+
+        try:
+            with open(self.path, "rb") as cache_file:
+                if cache_file.read(len(header)) != header:
+                    return None
+
+                # Nodes never form reference cycles, so collecting garbage while they're loaded would be wasted
+                enabled = gc.isenabled()
+                gc.disable()
+
+                try:
+                    return Unpickler(cache_file).load()
+                finally:
+                    if enabled:
+                        gc.enable()
+        except Exception:
+            # A cache that can't be read is as good as a missing one
+            return None
+
+    def dump(self, header, abstract_syntax_tree):
+        """Store the AST of the code with the header.
+
+        The cache is only an optimization, so it's skipped if it can't be written.
+
+        """
+        temporary_path = "{}.{}".format(self.path, os.getpid())
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+            with open(temporary_path, "wb") as cache_file:
+                cache_file.write(header)
+
+                pickler = pickle.Pickler(cache_file, pickle.HIGHEST_PROTOCOL)
+                # Nodes are loaded into a Source for the filename they're loaded for, which only keeps the lines
+                pickler.dispatch_table = {Source: lambda source: (Source, (source.filename, source.lines().tobytes()))}
+                pickler.dump(abstract_syntax_tree)
+
+            # Replaced all at once, so a cache is never read while it's being written
+            os.replace(temporary_path, self.path)
+        except (OSError, RecursionError, pickle.PicklingError):
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
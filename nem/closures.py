@@ -0,0 +1,539 @@
+"""Hold ClosureEvaluator class.
+
+Holds the ClosureEvaluator class which evaluates the Abstract Syntax Tree created by the parser by compiling each node
+into a Python closure once and calling the closures.
+
+"""
+
+from nem.compiler import Code, Compiler
+from nem.evaluator import Evaluator
+from nem.exceptions import EvaluatorException
+from nem.vm import VirtualMachine
+import nem.interpreter
+import nem.nodes as ast
+import nem.types_ as value
+
+
+class ClosureEvaluator:
+
+    """Evaluate the AST as closures.
+
+    Used instead of class Evaluator, with the same results. Each node is compiled once into a closure taking the symbol
+    table, which has its children, its operation and its node for the errors already bound, so evaluating it never looks
+    up how to evaluate a node. Functions get compiled the first time they're called.
+
+    Return, continue and break give a tuple of their kind and value, like the Signal they give class Evaluator, but
+    only where they can end up in a loop or a function. Anywhere else the compiler knows the error they cause, so they
+    raise it straight away.
+
+    """
+
+    BREAK = "BREAK", None
+    CONTINUE = "CONTINUE", None
+
+    NULL = value.Null()
+
+    def __init__(self, abstract_syntax_tree, symbol_table):
+        """Initialize ClosureEvaluator class."""
+        self.abstract_syntax_tree = abstract_syntax_tree
+        self.symbol_table = symbol_table
+
+        # Closure of the body of each function, by the identity of the body, which is kept along with it
+        self.functions = {}
+
+    @classmethod
+    def _signals(cls, node):
+        """Return whether the node can give a return, continue or break, instead of raising its error."""
+        if isinstance(node, (ast.Return, ast.Continue, ast.Break)):
+            return True
+        elif isinstance(node, ast.Expressions):
+            return any(cls._signals(expression) for expression in node.expressions)
+        elif isinstance(node, ast.IfOtherwise):
+            return cls._signals(node.if_expression) or \
+                node.otherwise_expression is not None and cls._signals(node.otherwise_expression)
+        elif isinstance(node, ast.BinaryOperation):
+            return cls._signals(node.left_node) or cls._signals(node.right_node)
+
+        return False
+
+    @staticmethod
+    def _signal(context, kind, signal):
+        """Compile a return, continue or break, its kind being its index in the errors, into a closure of the value."""
+        if context is None:
+            return signal
+
+        errors, location = context
+
+        def error(symbol_table):
+            signal(symbol_table)
+
+            raise EvaluatorException(errors[kind].format(location.filename, location.line))
+
+        return error
+
+    @staticmethod
+    def _compile_number(node, _):
+        """Compile Number node."""
+        number = value.Number(node.value)
+
+        return lambda symbol_table: number
+
+    @staticmethod
+    def _compile_variable(node, _):
+        """Compile Variable node."""
+        name = node.variable
+
+        def variable(symbol_table):
+            temporary = symbol_table.symbols.get(name)
+
+            if temporary is None:
+                temporary = symbol_table.get(name)
+
+                if temporary is None:
+                    raise EvaluatorException("Evaluation Error (File {}) (Line {}): Variable '{}' is not defined"
+                                             .format(node.filename, node.line, name))
+
+            return temporary
+
+        return variable
+
+    @staticmethod
+    def _compile_text(node, _):
+        """Compile Text node."""
+        text = value.Text(node.text)
+
+        return lambda symbol_table: text
+
+    def _compile_list(self, node, _):
+        """Compile List node."""
+        elements = [self._compile_node(element, (Compiler.LIST_ERRORS, node)) for element in node.elements]
+        list_ = value.List
+
+        return lambda symbol_table: list_([element(symbol_table) for element in elements])
+
+    def _compile_listindex(self, node, context):
+        """Compile ListIndex node."""
+        holder = self._compile_node(node.holder, context)
+        index = self._compile_node(node.index, (Compiler.INDEX_ERRORS, node))
+        index_value = VirtualMachine.index_value
+
+        return lambda symbol_table: index_value(node, holder(symbol_table), index(symbol_table))
+
+    def _compile_expressions(self, node, context):
+        """Compile Expressions node."""
+        expressions = [self._compile_node(expression, context) for expression in node.expressions]
+        null = self.NULL
+
+        if context is None and self._signals(node):
+            def checked(symbol_table):
+                temporary = null
+
+                for expression in expressions:
+                    temporary = expression(symbol_table)
+
+                    # If 'return', 'continue' or 'break' is detected, backpropagate
+                    if temporary.__class__ is tuple:
+                        return temporary
+
+                return temporary
+
+            return checked
+
+        def unchecked(symbol_table):
+            temporary = null
+
+            for expression in expressions:
+                temporary = expression(symbol_table)
+
+            return temporary
+
+        return unchecked
+
+    def _compile_unaryoperation(self, node, _):
+        """Compile UnaryOperation node."""
+        operand = self._compile_node(node.node, (Compiler.UNARY_ERRORS, node))
+        operator_ = node.operator
+        unary = VirtualMachine.unary
+
+        if operator_ not in Code.UNARY_OPERATORS:
+            def error(symbol_table):
+                operand(symbol_table)
+
+                raise EvaluatorException(
+                    "Evaluation Error (File {}) (Line {}): Unary operator '{}' not implemented"
+                    .format(node.filename, node.line, operator_)
+                )
+
+            return error
+
+        return lambda symbol_table: unary(node, operator_, operand(symbol_table))
+
+    def _compile_binaryoperation(self, node, context):
+        """Compile BinaryOperation node."""
+        left_operand = self._compile_node(node.left_node, context)
+        right_operand = self._compile_node(node.right_node, context)
+
+        if node.operator not in Code.BINARY_OPERATORS:
+            def error(symbol_table):
+                left_operand(symbol_table)
+                right_operand(symbol_table)
+
+                raise EvaluatorException(
+                    "Evaluation Error (File {}) (Line {}): Binary operator '{}' not implemented"
+                    .format(node.filename, node.line, node.operator)
+                )
+
+            return error
+
+        operation = VirtualMachine.BINARY_OPERATIONS[Code.BINARY_OPERATORS.index(node.operator)]
+        number_operation = VirtualMachine.NUMBER_OPERATIONS[Code.BINARY_OPERATORS.index(node.operator)]
+
+        number = value.Number
+        exact = VirtualMachine.EXACT
+        true = VirtualMachine.TRUE
+        false = VirtualMachine.FALSE
+
+        def apply(left, right):
+            # Gives the same number the methods of class Number would, without calling them
+            if number_operation is not None and left.__class__ is number and right.__class__ is number:
+                temporary = number_operation(left.value, right.value)
+
+                if temporary.__class__ is bool:
+                    return true if temporary else false
+                elif temporary.__class__ is int and -exact <= temporary <= exact:
+                    result = number.__new__(number)
+                    result.value = temporary
+
+                    return result
+
+                return number(temporary)
+
+            try:
+                return operation(left, right)
+            except (NotImplementedError, TypeError):
+                raise EvaluatorException(
+                    "Evaluation Error (File {}) (Line {}): Cannot apply binary operator '{}' to '{}' and '{}'"
+                    .format(node.filename, node.line, node.operator, type(left).__name__, type(right).__name__)
+                )
+
+        if context is None and self._signals(node):
+            def checked(symbol_table):
+                left = left_operand(symbol_table)
+
+                # If 'return', 'continue' or 'break' is detected, backpropagate
+                if left.__class__ is tuple:
+                    return left
+
+                right = right_operand(symbol_table)
+
+                if right.__class__ is tuple:
+                    return right
+
+                return apply(left, right)
+
+            return checked
+
+        def unchecked(symbol_table):
+            left = left_operand(symbol_table)
+            right = right_operand(symbol_table)
+
+            # Same as apply, without calling it
+            if number_operation is not None and left.__class__ is number and right.__class__ is number:
+                temporary = number_operation(left.value, right.value)
+
+                if temporary.__class__ is bool:
+                    return true if temporary else false
+                elif temporary.__class__ is int and -exact <= temporary <= exact:
+                    result = number.__new__(number)
+                    result.value = temporary
+
+                    return result
+
+                return number(temporary)
+
+            return apply(left, right)
+
+        return unchecked
+
+    def _compile_assignmentoperation(self, node, _):
+        """Compile AssignmentOperation node."""
+        value_ = self._compile_node(node.value, (Compiler.ASSIGNMENT_ERRORS, node))
+        name = node.variable
+
+        def assignment(symbol_table):
+            temporary = symbol_table.symbols[name] = value_(symbol_table)
+
+            return temporary
+
+        return assignment
+
+    def _compile_ifotherwise(self, node, context):
+        """Compile IfOtherwise node."""
+        condition = self._compile_node(node.condition, (Compiler.CONDITION_ERRORS, node))
+        if_expression = self._compile_node(node.if_expression, context)
+        null = self.NULL
+
+        if node.otherwise_expression is not None:
+            otherwise_expression = self._compile_node(node.otherwise_expression, context)
+        else:
+            otherwise_expression = lambda symbol_table: null
+
+        if context is None and self._signals(node):
+            def checked(symbol_table):
+                if condition(symbol_table).value:
+                    temporary = if_expression(symbol_table)
+                else:
+                    temporary = otherwise_expression(symbol_table)
+
+                # Only return, continue and break make it out of an if
+                return temporary if temporary.__class__ is tuple else null
+
+            return checked
+
+        def unchecked(symbol_table):
+            if condition(symbol_table).value:
+                if_expression(symbol_table)
+            else:
+                otherwise_expression(symbol_table)
+
+            return null
+
+        return unchecked
+
+    def _compile_while(self, node, _):
+        """Compile While node."""
+        # The condition is checked for return, continue and break on every iteration, as it can give one on any of them
+        condition = self._compile_node(node.condition, (Compiler.CONDITION_ERRORS, node))
+        expression = self._compile_node(node.expression, None)
+
+        break_ = self.BREAK
+        null = self.NULL
+
+        def while_(symbol_table):
+            if condition(symbol_table).value:
+                # Continue and return go on with the loop, break leaves it
+                while expression(symbol_table) is not break_ and condition(symbol_table).value:
+                    pass
+
+            return null
+
+        return while_
+
+    @staticmethod
+    def _compile_functiondefinition(node, _):
+        """Compile FunctionDefinition node."""
+        name = node.name
+        parameters = node.parameters
+        body = node.expression
+        function = value.Function
+
+        def definition(symbol_table):
+            temporary = symbol_table.symbols[name] = function(parameters, body)
+
+            return temporary
+
+        return definition
+
+    def _compile_functioncall(self, node, _):
+        """Compile FunctionCall node."""
+        # Calls of calls call the function the inner call returns
+        if isinstance(node.name, ast.FunctionCall):
+            find = self._compile_node(node.name, None)
+        else:
+            name = node.name
+
+            def find(symbol_table):
+                temporary = symbol_table.symbols.get(name)
+
+                if temporary is None:
+                    temporary = symbol_table.get(name)
+
+                    if temporary is None:
+                        raise EvaluatorException("Evaluation Error (File {}) (Line {}): Function '{}' is not defined"
+                                                 .format(node.filename, node.line, name))
+
+                return temporary
+
+        arguments = [self._compile_node(argument, (Compiler.ARGUMENT_ERRORS, node)) for argument in node.arguments]
+        count = len(arguments)
+
+        check_arguments = VirtualMachine.check_arguments
+        call_built_in = Evaluator.call_built_in
+        body = self.function
+        function_type = value.Function
+        built_in_type = value.BuiltInFunction
+
+        def call(symbol_table):
+            function = find(symbol_table)
+            parameters = function.parameters
+
+            if len(parameters) != count:
+                check_arguments(node, function, count)
+
+            # Arguments are evaluated in the symbol table of the call
+            symbol_table = symbol_table.scope()
+            symbols = symbol_table.symbols
+
+            for parameter, argument in zip(parameters, arguments):
+                symbols[parameter] = argument(symbol_table)
+
+            if isinstance(function, function_type):
+                return body(function)(symbol_table)
+            elif isinstance(function, built_in_type):
+                return call_built_in(node, function, symbol_table)
+
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): Function type '{}' not implemented"
+                .format(node.filename, node.line, type(function))
+            )
+
+        return call
+
+    def _compile_inlinecall(self, node, _):
+        """Compile InlineCall node."""
+        function = value.Function(node.parameters, node.expression)
+        parameters = node.parameters
+        arguments = [self._compile_node(argument, (Compiler.ARGUMENT_ERRORS, node)) for argument in node.arguments]
+        body = self.function
+
+        def call(symbol_table):
+            # Arguments are evaluated in the symbol table of the call
+            symbol_table = symbol_table.scope()
+            symbols = symbol_table.symbols
+
+            for parameter, argument in zip(parameters, arguments):
+                symbols[parameter] = argument(symbol_table)
+
+            return body(function)(symbol_table)
+
+        return call
+
+    def function(self, function):
+        """Return the closure of the body of a function, compiling it the first time."""
+        compiled = self.functions.get(id(function.body))
+
+        if compiled is not None and compiled[0] is function.body:
+            return compiled[1]
+
+        expression = self._compile_node(function.body, None)
+        null = self.NULL
+
+        def body(symbol_table):
+            temporary = expression(symbol_table)
+
+            # Only return gives the function a value
+            if temporary.__class__ is tuple and temporary[0] == "RETURN":
+                return temporary[1]
+
+            return null
+
+        self.functions[id(function.body)] = function.body, body
+
+        return body
+
+    @staticmethod
+    def _compile_import(node, _):
+        """Compile Import node."""
+        return lambda symbol_table: ClosureEvaluator._import(node, symbol_table)
+
+    def _compile_return(self, node, context):
+        """Compile Return node."""
+        value_ = self._compile_node(node.value, (Compiler.RETURN_ERRORS, node))
+
+        return self._signal(context, 0, lambda symbol_table: ("RETURN", value_(symbol_table)))
+
+    def _compile_continue(self, node, context):
+        """Compile Continue node."""
+        continue_ = self.CONTINUE
+
+        return self._signal(context, 1, lambda symbol_table: continue_)
+
+    def _compile_break(self, node, context):
+        """Compile Break node."""
+        break_ = self.BREAK
+
+        return self._signal(context, 2, lambda symbol_table: break_)
+
+    def _compile_null(self, node, _):
+        """Compile Null node."""
+        null = self.NULL
+
+        return lambda symbol_table: null
+
+    def _compile_node(self, node, context):
+        """Compile a node into a closure taking the symbol table and returning the value of the node.
+
+        The context is the errors of return, continue and break in the node and the node they're located at, or None
+        if they end up in a loop or a function, in which case the closure returns them as tuples.
+
+        """
+        try:
+            method = getattr(self, "_compile_{}".format(type(node).__name__.lower()))
+        except AttributeError:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): Node '{}' is not defined"
+                .format(node.filename, node.line, type(node).__name__)
+            )
+
+        return method(node, context)
+
+    @staticmethod
+    def _import(node, symbol_table):
+        """Import a file, evaluating it with closures as well."""
+        try:
+            with open("{}.nem".format(node.file), "rb") as nem_file:
+                nem.interpreter.Interpreter(nem_file, node.file, symbol_table, cache=True,
+                                            evaluator=ClosureEvaluator, inline=False)
+        except FileNotFoundError:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): File '{}.nem' doesn't exist"
+                .format(node.filename, node.line, node.file)
+            )
+
+        return value.Null()
+
+    def compile(self, node):
+        """Return the closure of a top-level expression."""
+        return self._compile_node(node, (Compiler.TOP_LEVEL_ERRORS, node))
+
+    def _evaluate_all(self):
+        """Evaluate all nodes."""
+        for node in self.abstract_syntax_tree:
+            yield self.compile(node)(self.symbol_table)
+
+    def evaluate(self):
+        """Evaluate the AST.
+
+        Compiles each top-level expression of the Abstract Syntax Tree created by the parser into a closure and calls
+        it.
+
+        """
+        return self._evaluate_all()
+
+
+def main():
+    """Debug the closure evaluator.
+
+    Used as the entry-point when the file gets ran directly. Used for debugging the class ClosureEvaluator.
+
+    """
+    # Built-in variables and functions
+    symbol_table = SymbolTable()
+    symbol_table.set("true", value.Number(1))
+    symbol_table.set("false", value.Number(0))
+    symbol_table.set("print", value.BuiltInFunction(["element"], 0))
+    symbol_table.set("input", value.BuiltInFunction([], 1))
+    symbol_table.set("convert", value.BuiltInFunction(["value", "type"], 2))
+
+    while True:
+        print(list(ClosureEvaluator(Parser(Lexer(input(">> ") + "\n", "<stdin>").lex()).parse(), symbol_table)
+                   .evaluate()))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.lexer import Lexer
+    from nem.parser import Parser
+    from nem.symbol_table import SymbolTable
+
+    main()
@@ -0,0 +1,434 @@
+"""Compile the AST into bytecode.
+
+Holds class Code which holds the bytecode of a top-level expression or of the body of a function, and class Compiler
+which compiles nodes into it for class VirtualMachine.
+
+"""
+
+import nem.nodes as ast
+import nem.types_ as value
+
+
+class Code:
+
+    """Hold bytecode.
+
+    The instructions are a list of pairs of an opcode and its argument. Jumps take the index of the instruction they
+    jump to, and the other arguments mostly index the constants, which hold the values, the names and the nodes the
+    instructions use. The locations are the line table, holding the node each instruction was compiled from, so the
+    file and the line of an error are only found once it happens.
+
+    """
+
+    __slots__ = ("instructions", "constants", "locations", "_indexes")
+
+    # Opcodes
+    CONSTANT = 0
+    LOAD = 1
+    STORE = 2
+    POP = 3
+    BINARY = 4
+    UNARY = 5
+    LIST = 6
+    INDEX = 7
+    JUMP = 8
+    JUMP_IF_FALSE = 9
+    JUMP_IF_TRUE = 10
+    FUNCTION = 11
+    FIND = 12
+    ENTER = 13
+    ARGUMENT = 14
+    CALL = 15
+    RETURN = 16
+    IMPORT = 17
+    RAISE = 18
+    END = 19
+    ASSIGN = 20
+
+    # Opcode names, indexed by opcode
+    NAMES = (
+        "CONSTANT", "LOAD", "STORE", "POP", "BINARY", "UNARY", "LIST", "INDEX", "JUMP", "JUMP_IF_FALSE", "JUMP_IF_TRUE",
+        "FUNCTION", "FIND", "ENTER", "ARGUMENT", "CALL", "RETURN", "IMPORT", "RAISE", "END", "ASSIGN"
+    )
+
+    # Operators of BINARY and UNARY, indexed by their argument
+    BINARY_OPERATORS = ("+", "-", "%", "*", "/", "^", "or", "and", "is", "<", "<=", ">", ">=")
+    UNARY_OPERATORS = ("not", "+", "-")
+
+    def __init__(self):
+        """Initialize Code class."""
+        self.instructions = []
+        self.constants = []
+        self.locations = []
+
+        # Index of each constant, by its type and value
+        self._indexes = {}
+
+    def constant(self, constant):
+        """Return the index of the constant, adding it if it's not in the constants yet."""
+        key = type(constant), constant if not isinstance(constant, (value.Type, ast.Node)) else id(constant)
+
+        index = self._indexes.get(key)
+
+        if index is None:
+            index = self._indexes[key] = len(self.constants)
+            self.constants.append(constant)
+
+        return index
+
+    def location(self, index):
+        """Return the node the instruction at the index was compiled from."""
+        return self.locations[index]
+
+    def disassemble(self):
+        """Return the instructions as text, one per line."""
+        lines = []
+
+        for index, (opcode, argument) in enumerate(self.instructions):
+
+            if opcode in (self.CONSTANT, self.LOAD, self.STORE, self.ASSIGN, self.FUNCTION, self.FIND, self.IMPORT,
+                          self.RAISE):
+                detail = repr(self.constants[argument])
+            elif opcode == self.BINARY:
+                detail = self.BINARY_OPERATORS[argument]
+            elif opcode == self.UNARY:
+                detail = self.UNARY_OPERATORS[argument]
+            else:
+                detail = ""
+
+            lines.append("{:>6} {:<4} {:<13} {:<4} {}".format(index, str(self.location(index).line or ""),
+                                                             self.NAMES[opcode], argument, detail).rstrip())
+
+        return "\n".join(lines)
+
+
+class Compiler:
+
+    """Compile nodes into bytecode.
+
+    Return, continue and break never make it into the bytecode as values. The compiler knows what each one ends up in,
+    so it compiles it into a jump out of the loop, a return from the function or the error it would cause.
+
+    """
+
+    # Errors of return, continue and break, by the node they end up in
+    TOP_LEVEL_ERRORS = (
+        "Evaluation Error (File {}) (Line {}): 'return' not in function",
+        "Evaluation Error (File {}) (Line {}): 'continue' not in loop",
+        "Evaluation Error (File {}) (Line {}): 'break' not in loop"
+    )
+    LIST_ERRORS = (
+        "Evaluation Error (File {}) (Line {}): Cannot return value inside of list",
+        "Evaluation Error (File {}) (Line {}): Cannot continue inside of list",
+        "Evaluation Error (File {}) (Line {}): Cannot break inside of list"
+    )
+    INDEX_ERRORS = (
+        "Evaluation Error (File {}) (Line {}): Cannot return value inside of list index",
+        "Evaluation Error (File {}) (Line {}): Cannot continue inside of list index",
+        "Evaluation Error (File {}) (Line {}): Cannot break inside of list index"
+    )
+    UNARY_ERRORS = (
+        "Evaluation Error (File {}) (Line {}): Cannot perform unary operation on return",
+        "Evaluation Error (File {}) (Line {}): Cannot perform unary operation on continue",
+        "Evaluation Error (File {}) (Line {}): Cannot perform unary operation on break"
+    )
+    ASSIGNMENT_ERRORS = (
+        "Evaluation Error (File {}) (Line {}): Cannot assign variable to return value",
+        "Evaluation Error (File {}) (Line {}): Cannot assign variable to continue",
+        "Evaluation Error (File {}) (Line {}): Cannot assign variable to break"
+    )
+    CONDITION_ERRORS = (
+        "Evaluation Error (File {}) (Line {}): Cannot return value in condition",
+        "Evaluation Error (File {}) (Line {}): Cannot continue in condition",
+        "Evaluation Error (File {}) (Line {}): Cannot break in condition"
+    )
+    ARGUMENT_ERRORS = (
+        "Evaluation Error (File {}) (Line {}): Cannot return value in argument",
+        "Evaluation Error (File {}) (Line {}): Cannot continue in argument",
+        "Evaluation Error (File {}) (Line {}): Cannot break in argument"
+    )
+    RETURN_ERRORS = (
+        "Evaluation Error (File {}) (Line {}): Cannot return value within return value",
+        "Evaluation Error (File {}) (Line {}): Cannot continue within return value",
+        "Evaluation Error (File {}) (Line {}): Cannot break within return value"
+    )
+
+    # What return, continue and break end up in
+    ERROR = 0
+    LOOP = 1
+    FUNCTION = 2
+
+    NULL = value.Null()
+
+    def __init__(self):
+        """Initialize Compiler class."""
+        # Code of the body of each function, by the identity of the body, which is kept along with it
+        self.functions = {}
+
+        # Code being compiled and the number of values on its stack
+        self.code = None
+        self.depth = 0
+
+    def _emit(self, opcode, argument, node, effect):
+        """Add an instruction, which adds the effect to the number of values on the stack, and return its index."""
+        self.code.instructions.append((opcode, argument))
+        self.code.locations.append(node)
+
+        self.depth += effect
+
+        return len(self.code.instructions) - 1
+
+    def _patch(self, index):
+        """Make the jump at the index jump to the next instruction."""
+        self.code.instructions[index] = self.code.instructions[index][0], len(self.code.instructions)
+
+    def _signal(self, node, context, kind):
+        """Compile a return, continue or break into what it ends up in, its kind being its index in the errors."""
+        if context[0] == self.ERROR:
+            self._emit(Code.RAISE, self.code.constant(context[1][kind]), context[2], 0)
+        elif context[0] == self.LOOP:
+            # Continue and return go on with the loop, break leaves it
+            if self.depth > context[1]:
+                self._emit(Code.POP, self.depth - context[1], node, context[1] - self.depth)
+
+            (context[3] if kind == 2 else context[2]).append(self._emit(Code.JUMP, None, node, 0))
+        elif context[0] == self.FUNCTION:
+            # Only return gives the function a value
+            if kind != 0:
+                self._emit(Code.CONSTANT, self.code.constant(self.NULL), node, 1)
+
+            self._emit(Code.RETURN, 0, node, -1)
+
+    def _compile_discarded(self, node, context):
+        """Compile a node whose value isn't used."""
+        # An assignment stores its value without keeping it on the stack
+        if isinstance(node, ast.Expressions):
+            for expression in node.expressions:
+                self._compile_discarded(expression, context)
+        elif isinstance(node, ast.AssignmentOperation):
+            self._compile_node(node.value, (self.ERROR, self.ASSIGNMENT_ERRORS, node))
+            self._emit(Code.ASSIGN, self.code.constant(node.variable), node, -1)
+        else:
+            self._compile_node(node, context)
+            self._emit(Code.POP, 1, node, -1)
+
+    def _compile_number(self, node, _):
+        """Compile Number node."""
+        self._emit(Code.CONSTANT, self.code.constant(value.Number(node.value)), node, 1)
+
+    def _compile_variable(self, node, _):
+        """Compile Variable node."""
+        self._emit(Code.LOAD, self.code.constant(node.variable), node, 1)
+
+    def _compile_text(self, node, _):
+        """Compile Text node."""
+        self._emit(Code.CONSTANT, self.code.constant(value.Text(node.text)), node, 1)
+
+    def _compile_list(self, node, _):
+        """Compile List node."""
+        for element in node.elements:
+            self._compile_node(element, (self.ERROR, self.LIST_ERRORS, node))
+
+        self._emit(Code.LIST, len(node.elements), node, 1 - len(node.elements))
+
+    def _compile_listindex(self, node, context):
+        """Compile ListIndex node."""
+        self._compile_node(node.holder, context)
+        self._compile_node(node.index, (self.ERROR, self.INDEX_ERRORS, node))
+
+        self._emit(Code.INDEX, 0, node, -1)
+
+    def _compile_expressions(self, node, context):
+        """Compile Expressions node."""
+        for expression in node.expressions[:-1]:
+            self._compile_discarded(expression, context)
+
+        self._compile_node(node.expressions[-1], context)
+
+    def _compile_unaryoperation(self, node, _):
+        """Compile UnaryOperation node."""
+        self._compile_node(node.node, (self.ERROR, self.UNARY_ERRORS, node))
+
+        self._emit(Code.UNARY, Code.UNARY_OPERATORS.index(node.operator), node, 0)
+
+    def _compile_binaryoperation(self, node, context):
+        """Compile BinaryOperation node."""
+        self._compile_node(node.left_node, context)
+        self._compile_node(node.right_node, context)
+
+        self._emit(Code.BINARY, Code.BINARY_OPERATORS.index(node.operator), node, -1)
+
+    def _compile_assignmentoperation(self, node, _):
+        """Compile AssignmentOperation node."""
+        self._compile_node(node.value, (self.ERROR, self.ASSIGNMENT_ERRORS, node))
+
+        self._emit(Code.STORE, self.code.constant(node.variable), node, 0)
+
+    def _compile_ifotherwise(self, node, context):
+        """Compile IfOtherwise node."""
+        self._compile_node(node.condition, (self.ERROR, self.CONDITION_ERRORS, node))
+        otherwise = self._emit(Code.JUMP_IF_FALSE, None, node, -1)
+
+        self._compile_discarded(node.if_expression, context)
+
+        if node.otherwise_expression is not None:
+            end = self._emit(Code.JUMP, None, node, 0)
+            self._patch(otherwise)
+
+            self._compile_discarded(node.otherwise_expression, context)
+
+            self._patch(end)
+        else:
+            self._patch(otherwise)
+
+        # Only return, continue and break make it out of an if
+        self._emit(Code.CONSTANT, self.code.constant(self.NULL), node, 1)
+
+    def _compile_while(self, node, _):
+        """Compile While node."""
+        # The condition is checked for return, continue and break on every iteration, as it can give one on any of them
+        self._compile_node(node.condition, (self.ERROR, self.CONDITION_ERRORS, node))
+        end = self._emit(Code.JUMP_IF_FALSE, None, node, -1)
+
+        body = len(self.code.instructions)
+        continues = []
+        breaks = [end]
+
+        self._compile_discarded(node.expression, (self.LOOP, self.depth, continues, breaks))
+
+        for index in continues:
+            self._patch(index)
+
+        self._compile_node(node.condition, (self.ERROR, self.CONDITION_ERRORS, node))
+        self._emit(Code.JUMP_IF_TRUE, body, node, -1)
+
+        for index in breaks:
+            self._patch(index)
+
+        self._emit(Code.CONSTANT, self.code.constant(self.NULL), node, 1)
+
+    def _compile_functiondefinition(self, node, _):
+        """Compile FunctionDefinition node."""
+        self._emit(Code.FUNCTION, self.code.constant(node), node, 1)
+
+    def _compile_functioncall(self, node, _):
+        """Compile FunctionCall node."""
+        # Calls of calls call the function the inner call returns
+        if isinstance(node.name, ast.FunctionCall):
+            self._compile_node(node.name, None)
+        else:
+            self._emit(Code.FIND, self.code.constant(node.name), node, 1)
+
+        self._compile_call(node)
+
+    def _compile_inlinecall(self, node, _):
+        """Compile InlineCall node."""
+        self._emit(Code.CONSTANT, self.code.constant(value.Function(node.parameters, node.expression)), node, 1)
+        self._compile_call(node)
+
+    def _compile_call(self, node):
+        """Compile the call of the function on the stack with the arguments of the node."""
+        # Arguments are evaluated in the symbol table of the call
+        self._emit(Code.ENTER, len(node.arguments), node, 1)
+
+        for index, argument in enumerate(node.arguments):
+            self._compile_node(argument, (self.ERROR, self.ARGUMENT_ERRORS, node))
+            self._emit(Code.ARGUMENT, index, node, -1)
+
+        self._emit(Code.CALL, 0, node, -1)
+
+    def _compile_import(self, node, _):
+        """Compile Import node."""
+        self._emit(Code.IMPORT, self.code.constant(node.file), node, 1)
+
+    def _compile_return(self, node, context):
+        """Compile Return node."""
+        self._compile_node(node.value, (self.ERROR, self.RETURN_ERRORS, node))
+
+        depth = self.depth
+        self._signal(node, context, 0)
+        self.depth = depth
+
+    def _compile_continue(self, node, context):
+        """Compile Continue node."""
+        depth = self.depth
+        self._signal(node, context, 1)
+        self.depth = depth + 1
+
+    def _compile_break(self, node, context):
+        """Compile Break node."""
+        depth = self.depth
+        self._signal(node, context, 2)
+        self.depth = depth + 1
+
+    def _compile_null(self, node, _):
+        """Compile Null node."""
+        self._emit(Code.CONSTANT, self.code.constant(self.NULL), node, 1)
+
+    def _compile_node(self, node, context):
+        """Compile a node, which adds its value to the stack.
+
+        The context is what return, continue and break in the node end up in, a tuple starting with ERROR and followed
+        by the errors and the node they're located at, with LOOP and followed by the number of values on the stack in
+        the loop and the lists of jumps to the next iteration and out of the loop, or made of FUNCTION only.
+
+        """
+        method = getattr(self, "_compile_{}".format(type(node).__name__.lower()))
+
+        method(node, context)
+
+    def compile(self, node):
+        """Compile a top-level expression."""
+        self.code = Code()
+        self.depth = 0
+
+        self._compile_node(node, (self.ERROR, self.TOP_LEVEL_ERRORS, node))
+        self._emit(Code.END, 0, node, -1)
+
+        return self.code
+
+    def function(self, function):
+        """Return the code of the body of a function, compiling it the first time."""
+        compiled = self.functions.get(id(function.body))
+
+        if compiled is not None and compiled[0] is function.body:
+            return compiled[1]
+
+        code = self.code
+        depth = self.depth
+
+        self.code = Code()
+        self.depth = 0
+
+        self._compile_discarded(function.body, (self.FUNCTION,))
+        self._emit(Code.CONSTANT, self.code.constant(self.NULL), function.body, 1)
+        self._emit(Code.RETURN, 0, function.body, -1)
+
+        self.functions[id(function.body)] = function.body, self.code
+
+        temporary_code = self.code
+        self.code = code
+        self.depth = depth
+
+        return temporary_code
+
+
+def main():
+    """Debug the compiler.
+
+    Used as the entry-point when the file gets ran directly. Used for debugging the class Compiler.
+
+    """
+    compiler = Compiler()
+
+    while True:
+        for node in Parser(Lexer(input(">> ") + "\n", "<stdin>").lex()).parse():
+            print(compiler.compile(node).disassemble())
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.lexer import Lexer
+    from nem.parser import Parser
+
+    main()
@@ -4,58 +4,195 @@ Holds the Evaluator class which is used for evaluating the Abstract Syntax Tree
 
 """
 
+import operator
+import types
+
+from nem.compiler import Compiler
 from nem.exceptions import EvaluatorException
 import nem.interpreter
 import nem.nodes as ast
+import nem.resolver
+import nem.symbol_table
+import nem.tracer
 import nem.types_ as value
 
 
+class Signal:
+
+    """Hold a return, continue or break.
+
+    Passed up by the nodes it's evaluated in, until the one that handles it. Continue and break hold nothing, so each
+    one is a single shared signal, while a return holds its value.
+
+    """
+
+    __slots__ = ("kind", "value")
+
+    def __init__(self, kind, value_=None):
+        """Initialize Signal class."""
+        self.kind = kind
+        self.value = value_
+
+    def __repr__(self):
+        """Represent Signal class."""
+        return "Signal({}, {})".format(repr(self.kind), repr(self.value))
+
+
 class Evaluator:
 
     """Evaluate the AST.
 
-    Used for evaluating the Abstract Syntax Tree created by the parser.
+    Used for evaluating the Abstract Syntax Tree created by the parser. Function calls get a Frame, with the variables
+    the function names in slots, instead of a copy of the symbol table. Calls a function returns in tail position are
+    made in a loop by the call of the function, in a frame that replaces its own, so they don't use up the stack.
+
+    Binary operations keep an inline cache of the operation on the values of two numbers, while they've only been
+    evaluated with numbers, and use the methods of the values for good once they're evaluated with anything else.
+    While loops count their iterations, and once they're hot the Tracer compiles the trace of an iteration, which runs
+    the loop until it ends or one of its guards fails.
+
+    Return, continue and break give a Signal, which is told apart from a value by its class alone, so the nodes that
+    pass it up don't pay for it when there's none. The nodes where one is an error only format the error once it's
+    raised.
 
     """
 
+    # Operations of the binary operators
+    BINARY_OPERATIONS = {
+        "+": operator.add, "-": operator.sub, "%": operator.mod, "*": operator.mul, "/": operator.truediv,
+        "^": operator.pow, "or": lambda left, right: left or right, "and": lambda left, right: left and right,
+        "is": operator.eq, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge
+    }
+
+    # Operations of the binary operators on the values of two numbers, which skip the methods of class Number
+    NUMBER_OPERATIONS = {
+        "+": operator.add, "-": operator.sub, "%": operator.mod, "*": operator.mul,
+        "is": operator.eq, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge
+    }
+
+    # Integers a number keeps as they are, as they don't change when turned into a float
+    EXACT = 1 << 53
+
+    TRUE = value.Number(1)
+    FALSE = value.Number(0)
+
+    CONTINUE = Signal("CONTINUE")
+    BREAK = Signal("BREAK")
+
+    # Index of the error for each kind of signal, in the errors of class Compiler
+    KINDS = {"RETURN": 0, "CALL": 0, "CONTINUE": 1, "BREAK": 2}
+
+    # Handlers of the nodes registered with register, by the class of the node
+    HANDLERS = {}
+
     def __init__(self, abstract_syntax_tree, symbol_table):
         """Initialize Evaluator class."""
         self.abstract_syntax_tree = abstract_syntax_tree
         self.symbol_table = symbol_table
 
+        # Layout of the frame of each function, by the identity of its parameters and body, which are kept along with it
+        self.layouts = {}
+
+        self.tracer = nem.tracer.Tracer()
+
+        # Method evaluating each class of node, by the class, looked up once instead of by name for every node
+        self.handlers = {}
+
+        # Not class Node itself, as _evaluate_node is what looks the handlers up
+        for node_class in vars(ast).values():
+            if isinstance(node_class, type) and issubclass(node_class, ast.Node) and node_class is not ast.Node:
+                temporary_method = getattr(self, "_evaluate_" + node_class.__name__.lower(), None)
+
+                if temporary_method is not None:
+                    self.handlers[node_class] = temporary_method
+
+        for node_class, handler in self.HANDLERS.items():
+            self.handlers[node_class] = types.MethodType(handler, self)
+
+    @classmethod
+    def register(cls, node_class, handler):
+        """Register the handler evaluating nodes of the class, for the evaluators of the class made from then on.
+
+        Used for nodes that aren't in module nodes. The handler is called like the methods evaluating the nodes, with
+        the evaluator, the node and the symbol table, and returns the value of the node or a Signal.
+
+        """
+        # Subclasses get their own handlers, so registering one doesn't change the evaluator it's subclassing
+        if "HANDLERS" not in cls.__dict__:
+            cls.HANDLERS = dict(cls.HANDLERS)
+
+        cls.HANDLERS[node_class] = handler
+
+    def override(self, node_class, handler):
+        """Evaluate nodes of the class with the handler in this evaluator only, and return the handler it replaces.
+
+        The handler is called with the node and the symbol table, so it can wrap the one it replaces, like to count or
+        time the nodes evaluated.
+
+        """
+        temporary_handler = self.handlers.get(node_class)
+        self.handlers[node_class] = handler
+
+        return temporary_handler
+
     @staticmethod
-    def _check(value_, return_error=None, continue_error=None, break_error=None):
-        """Check for return, continue and break."""
-        try:
-            if value_[0] == "RETURN":
-                if return_error is None:
-                    return value_, True
-                else:
-                    raise EvaluatorException(return_error)
-            elif value_[0] == "CONTINUE":
-                if continue_error is None:
-                    return value_, True
-                else:
-                    raise EvaluatorException(continue_error)
-            elif value_[0] == "BREAK":
-                if continue_error is None:
-                    return value_, True
-                else:
-                    raise EvaluatorException(break_error)
-        except TypeError:
-            pass
+    def _raise(signal, errors, node):
+        """Raise the error for the signal in the node.
 
-        return value_, False
+        The errors are the templates of the errors for return, continue and break in one of the contexts of class
+        Compiler, which only get formatted here, once a signal ends up where it can't be.
+
+        """
+        raise EvaluatorException(errors[Evaluator.KINDS[signal.kind]].format(node.filename, node.line))
 
     @staticmethod
     def _evaluate_number(node, _):
         """Evaluate Number node."""
         return value.Number(node.value)
 
+    @staticmethod
+    def _get(node, name, symbol_table):
+        """Return the value of the variable the node names, from its slot if the node is resolved for the table."""
+        if node.layout is not None and node.layout is symbol_table.layout:
+            temporary_value = symbol_table.slots[node.slot]
+
+            if temporary_value is not None:
+                return temporary_value
+
+        return symbol_table.get(name)
+
+    @staticmethod
+    def _set(node, name, value_, symbol_table):
+        """Set the value of the variable the node names, in its slot if the node is resolved for the table."""
+        if node.layout is not None and node.layout is symbol_table.layout:
+            symbol_table.slots[node.slot] = value_
+        else:
+            symbol_table.set(name, value_)
+
+    def _layout(self, function):
+        """Return the layout of the frame of a call of the function, resolving it the first time it's called."""
+        temporary_body = getattr(function, "body", None)
+        temporary_key = id(function.parameters), id(temporary_body)
+
+        try:
+            return self.layouts[temporary_key][2]
+        except KeyError:
+            layout = nem.resolver.Resolver().resolve(function.parameters, temporary_body)
+            self.layouts[temporary_key] = function.parameters, temporary_body, layout
+
+            return layout
+
     @staticmethod
     def _evaluate_variable(node, symbol_table):
         """Evaluate Variable node."""
-        temporary_variable = symbol_table.get(node.variable)
+        # Same as _get, which is inlined since variables are read the most
+        if node.layout is not None and node.layout is symbol_table.layout:
+            temporary_variable = symbol_table.slots[node.slot]
+
+            if temporary_variable is None:
+                temporary_variable = symbol_table.get(node.variable)
+        else:
+            temporary_variable = symbol_table.get(node.variable)
 
         if temporary_variable is not None:
             return temporary_variable
@@ -73,16 +210,10 @@ class Evaluator:
         temporary_elements = []
 
         for temporary_element in node.elements:
-            temporary_value = self._check(
-                self._evaluate_node(temporary_element, symbol_table),
-
-                "Evaluation Error (File {}) (Line {}): Cannot return value inside of list"
-                .format(node.filename, node.line),
-                "Evaluation Error (File {}) (Line {}): Cannot continue inside of list"
-                .format(node.filename, node.line),
-                "Evaluation Error (File {}) (Line {}): Cannot break inside of list"
-                .format(node.filename, node.line)
-            )[0]
+            temporary_value = self._evaluate_node(temporary_element, symbol_table)
+
+            if temporary_value.__class__ is Signal:
+                self._raise(temporary_value, Compiler.LIST_ERRORS, node)
 
             temporary_elements.append(temporary_value)
 
@@ -92,18 +223,17 @@ class Evaluator:
         """Evaluate ListIndex node."""
         temporary_holder = self._evaluate_node(node.holder, symbol_table)
 
-        temporary_index = self._check(
-            self._evaluate_node(node.index, symbol_table),
+        temporary_index = self._evaluate_node(node.index, symbol_table)
+
+        if temporary_index.__class__ is Signal:
+            self._raise(temporary_index, Compiler.INDEX_ERRORS, node)
 
-            "Evaluation Error (File {}) (Line {}): Cannot return value inside of list index"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot continue inside of list index"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot break inside of list index"
-            .format(node.filename, node.line)
-        )[0]
+        return self._index(node, temporary_holder, temporary_index)
 
-        if not isinstance(temporary_index, value.Number):
+    @staticmethod
+    def _index(node, holder, index):
+        """Index a text or a list."""
+        if not isinstance(index, value.Number):
             raise EvaluatorException(
                 "Evaluation Error (File {}) (Line {}): List index has to be a number"
                 .format(node.filename, node.line)
@@ -111,15 +241,15 @@ class Evaluator:
 
         try:
             # Text indexing
-            if isinstance(temporary_holder, value.Text):
-                return value.Text(temporary_holder.value[temporary_index.value])
+            if isinstance(holder, value.Text):
+                return value.Text(holder.value[index.value])
             # List indexing
-            elif isinstance(temporary_holder, value.List):
-                return temporary_holder.value[temporary_index.value]
+            elif isinstance(holder, value.List):
+                return holder.value[index.value]
             else:
                 raise EvaluatorException(
                     "Evaluation Error (Filename {}) (Line {}): '{}' does not support indexing"
-                    .format(node.filename, node.line, type(temporary_holder).__name__)
+                    .format(node.filename, node.line, type(holder).__name__)
                 )
         except IndexError:
             raise EvaluatorException(
@@ -129,59 +259,58 @@ class Evaluator:
 
     def _evaluate_expressions(self, node, symbol_table):
         """Evaluate Expressions node."""
-        temporary_value = (value.Null(), False)
+        temporary_value = value.Null()
 
         for expression in node.expressions:
-            temporary_value = self._check(self._evaluate_node(expression, symbol_table))
+            temporary_value = self._evaluate_node(expression, symbol_table)
 
             # If 'return', 'continue' or 'break' is detected, backpropagate
-            if temporary_value[1]:
-                return temporary_value[0]
+            if temporary_value.__class__ is Signal:
+                return temporary_value
 
-        return temporary_value[0]
+        return temporary_value
 
     def _evaluate_unaryoperation(self, node, symbol_table):
         """Evaluate UnaryOperation node."""
-        temporary_value = self._check(
-            self._evaluate_node(node.node, symbol_table),
+        temporary_value = self._evaluate_node(node.node, symbol_table)
+
+        if temporary_value.__class__ is Signal:
+            self._raise(temporary_value, Compiler.UNARY_ERRORS, node)
 
-            "Evaluation Error (File {}) (Line {}): Cannot perform unary operation on return"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot perform unary operation on continue"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot perform unary operation on break"
-            .format(node.filename, node.line)
-        )[0]
+        return self._unary(node, temporary_value)
 
+    @staticmethod
+    def _unary(node, operand):
+        """Apply the unary operator of the node."""
         if node.operator == "not":
-            if isinstance(temporary_value, value.Number):
-                return value.Number(0 if temporary_value.value else 1)
-            elif isinstance(temporary_value, value.Text):
-                return value.Number(0 if temporary_value.value else 1)
-            elif isinstance(temporary_value, value.List):
-                return value.Number(0 if temporary_value.value else 1)
-            elif isinstance(temporary_value, value.Null):
+            if isinstance(operand, value.Number):
+                return value.Number(0 if operand.value else 1)
+            elif isinstance(operand, value.Text):
+                return value.Number(0 if operand.value else 1)
+            elif isinstance(operand, value.List):
+                return value.Number(0 if operand.value else 1)
+            elif isinstance(operand, value.Null):
                 return value.Number(1)
             else:
                 raise EvaluatorException(
                     "Evaluation Error (File {}) (Line {}): Cannot apply unary operator 'not' on '{}'"
-                    .format(node.filename, node.line, type(temporary_value).__name__)
+                    .format(node.filename, node.line, type(operand).__name__)
                 )
         elif node.operator == "+":
-            if isinstance(temporary_value, value.Number):
-                return temporary_value
+            if isinstance(operand, value.Number):
+                return operand
             else:
                 raise EvaluatorException(
                     "Evaluation Error (File {}) (Line {}): Cannot apply unary operator '+' on '{}'"
-                    .format(node.filename, node.line, type(temporary_value).__name__)
+                    .format(node.filename, node.line, type(operand).__name__)
                 )
         elif node.operator == "-":
-            if isinstance(temporary_value, value.Number):
-                return value.Number(-temporary_value.value)
+            if isinstance(operand, value.Number):
+                return value.Number(-operand.value)
             else:
                 raise EvaluatorException(
                     "Evaluation Error (File {}) (Line {}): Cannot apply unary operator '-' on '{}'"
-                    .format(node.filename, node.line, type(temporary_value).__name__)
+                    .format(node.filename, node.line, type(operand).__name__)
                 )
         else:
             raise EvaluatorException(
@@ -191,142 +320,248 @@ class Evaluator:
 
     def _evaluate_binaryoperation(self, node, symbol_table):
         """Evaluate BinaryOperation node."""
-        temporary_left_value = self._check(self._evaluate_node(node.left_node, symbol_table))
+        temporary_left_value = self._evaluate_node(node.left_node, symbol_table)
 
         # If 'return', 'continue' or 'break' is detected, backpropagate
-        if temporary_left_value[1]:
-            return temporary_left_value[0]
-        temporary_left_value = temporary_left_value[0]
+        if temporary_left_value.__class__ is Signal:
+            return temporary_left_value
 
-        temporary_right_value = self._check(self._evaluate_node(node.right_node, symbol_table))
+        temporary_right_value = self._evaluate_node(node.right_node, symbol_table)
 
         # If 'return', 'continue' or 'break' is detected, backpropagate
-        if temporary_right_value[1]:
-            return temporary_right_value[0]
-        temporary_right_value = temporary_right_value[0]
+        if temporary_right_value.__class__ is Signal:
+            return temporary_right_value
 
-        try:
-            if node.operator == "+":
-                return temporary_left_value + temporary_right_value
-            elif node.operator == "-":
-                return temporary_left_value - temporary_right_value
-            elif node.operator == "%":
-                return temporary_left_value % temporary_right_value
-            elif node.operator == "*":
-                return temporary_left_value * temporary_right_value
-            elif node.operator == "/":
-                return temporary_left_value / temporary_right_value
-            elif node.operator == "^":
-                return temporary_left_value ** temporary_right_value
-            elif node.operator == "or":
-                return temporary_left_value or temporary_right_value
-            elif node.operator == "and":
-                return temporary_left_value and temporary_right_value
-            elif node.operator == "is":
-                return temporary_left_value == temporary_right_value
-            elif node.operator == "<":
-                return temporary_left_value < temporary_right_value
-            elif node.operator == "<=":
-                return temporary_left_value <= temporary_right_value
-            elif node.operator == ">":
-                return temporary_left_value > temporary_right_value
-            elif node.operator == ">=":
-                return temporary_left_value >= temporary_right_value
+        return self._operate(node, temporary_left_value, temporary_right_value)
+
+    def _operate(self, node, left, right):
+        """Apply the binary operator of the node to the values of its operands."""
+        operation = node.cache
+
+        # The node is specialized for the operands it's first evaluated with
+        if operation is None:
+            if left.__class__ is value.Number and right.__class__ is value.Number:
+                operation = node.cache = self.NUMBER_OPERATIONS.get(node.operator, False)
             else:
-                raise EvaluatorException(
-                    "Evaluation Error (File {}) (Line {}): Binary operator '{}' not implemented"
-                    .format(node.filename, node.line, node.operator)
-                )
+                operation = node.cache = False
+
+        if operation is not False:
+            # Gives the same number the methods of class Number would, without calling them
+            if left.__class__ is value.Number and right.__class__ is value.Number:
+                temporary_value = operation(left.value, right.value)
+
+                if temporary_value.__class__ is bool:
+                    return self.TRUE if temporary_value else self.FALSE
+                elif temporary_value.__class__ is int and -self.EXACT <= temporary_value <= self.EXACT:
+                    temporary_number = value.Number.__new__(value.Number)
+                    temporary_number.value = temporary_value
+
+                    return temporary_number
+
+                return value.Number(temporary_value)
+
+            # Any other operands deoptimize the node, which then always uses the methods of the values
+            node.cache = False
+
+        operation = self.BINARY_OPERATIONS.get(node.operator)
+
+        if operation is None:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): Binary operator '{}' not implemented"
+                .format(node.filename, node.line, node.operator)
+            )
+
+        try:
+            return operation(left, right)
         except (NotImplementedError, TypeError):
             raise EvaluatorException(
                 "Evaluation Error (File {}) (Line {}): Cannot apply binary operator '{}' to '{}' and '{}'"
                 .format(
                     node.filename, node.line, node.operator,
-                    type(temporary_left_value).__name__, type(temporary_right_value).__name__
+                    type(left).__name__, type(right).__name__
                 )
             )
 
     def _evaluate_assignmentoperation(self, node, symbol_table):
         """Evaluate AssignmentOperation node."""
-        temporary_value = self._check(
-            self._evaluate_node(node.value, symbol_table),
+        temporary_value = self._evaluate_node(node.value, symbol_table)
 
-            "Evaluation Error (File {}) (Line {}): Cannot assign variable to return value"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot assign variable to continue"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot assign variable to break"
-            .format(node.filename, node.line)
-        )[0]
+        if temporary_value.__class__ is Signal:
+            self._raise(temporary_value, Compiler.ASSIGNMENT_ERRORS, node)
 
-        symbol_table.set(node.variable, temporary_value)
+        self._set(node, node.variable, temporary_value, symbol_table)
 
         return temporary_value
 
     def _evaluate_ifotherwise(self, node, symbol_table):
         """Evaluate IfOtherwise node."""
-        temporary_condition = self._check(
-            self._evaluate_node(node.condition, symbol_table),
+        temporary_condition = self._evaluate_node(node.condition, symbol_table)
 
-            "Evaluation Error (File {}) (Line {}): Cannot return value in condition"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot continue in condition"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot break in condition"
-            .format(node.filename, node.line)
-        )[0]
+        if temporary_condition.__class__ is Signal:
+            self._raise(temporary_condition, Compiler.CONDITION_ERRORS, node)
 
         # If condition is true
         if temporary_condition.value:
-            temporary_expression = self._check(self._evaluate_node(node.if_expression, symbol_table))
+            temporary_expression = self._evaluate_node(node.if_expression, symbol_table)
 
             # If 'return', 'continue' or 'break' is detected, backpropagate
-            if temporary_expression[1]:
-                return temporary_expression[0]
+            if temporary_expression.__class__ is Signal:
+                return temporary_expression
         # Otherwise
         elif node.otherwise_expression is not None:
-            temporary_expression = self._check(self._evaluate_node(node.otherwise_expression, symbol_table))
+            temporary_expression = self._evaluate_node(node.otherwise_expression, symbol_table)
 
             # If 'return', 'continue' or 'break' is detected, backpropagate
-            if temporary_expression[1]:
-                return temporary_expression[0]
+            if temporary_expression.__class__ is Signal:
+                return temporary_expression
 
         return value.Null()
 
     def _evaluate_while(self, node, symbol_table):
         """Evaluate While node."""
-        temporary_condition = self._check(
-            self._evaluate_node(node.condition, symbol_table),
+        while True:
+            temporary_condition = self._evaluate_node(node.condition, symbol_table)
 
-            "Evaluation Error (File {}) (Line {}): Cannot return value in condition"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot continue in condition"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot break in condition"
-            .format(node.filename, node.line)
-        )[0]
+            # The condition is checked on every iteration, as it can give a signal on any of them
+            if temporary_condition.__class__ is Signal:
+                self._raise(temporary_condition, Compiler.CONDITION_ERRORS, node)
 
-        while temporary_condition.value:
-            temporary_return_value = self._check(self._evaluate_node(node.expression, symbol_table))
+            if not temporary_condition.value:
+                break
 
             # If 'break' is detected, break the loop
-            if temporary_return_value[1] and temporary_return_value[0][0] == "BREAK":
+            if self._evaluate_node(node.expression, symbol_table) is self.BREAK:
                 break
 
-            temporary_condition = self._evaluate_node(node.condition, symbol_table)
+            if node.cache is not False and self._trace(node, symbol_table):
+                break
 
         return value.Null()
 
-    @staticmethod
-    def _evaluate_functiondefinition(node, symbol_table):
+    def _trace(self, node, symbol_table):
+        """Count an iteration of the While node, and return whether the loop ended in its trace, once it's hot."""
+        temporary_trace = node.cache
+
+        if temporary_trace.__class__ is not nem.tracer.Trace:
+            temporary_count = (temporary_trace or 0) + 1
+
+            if temporary_count < self.tracer.HOT:
+                node.cache = temporary_count
+
+                return False
+
+            # Loops that can't be traced with the values they have now are counted again
+            temporary_trace = node.cache = self.tracer.trace(node, symbol_table)
+
+            if temporary_trace is None:
+                node.cache = 0
+
+            if not temporary_trace:
+                return False
+
+        if temporary_trace.run(symbol_table):
+            return True
+
+        # Loops whose guards keep failing early are traced again, along the branches they take now
+        if temporary_trace.failures > self.tracer.FAILURES:
+            node.cache = 0
+
+        return False
+
+    def _evaluate_functiondefinition(self, node, symbol_table):
         """Evaluate FunctionDefinition node."""
         temporary_function = value.Function(node.parameters, node.expression)
-        symbol_table.set(node.name, temporary_function)
+        self._set(node, node.name, temporary_function, symbol_table)
         return temporary_function
 
+    @staticmethod
+    def call_built_in(node, function, symbol_table):
+        """Call a built-in function, with its arguments already set in the symbol table."""
+        # 'print(element)' built-in function
+        if function.index == 0:
+            parameter_element = symbol_table.get("element")
+
+            print(parameter_element, end="")
+
+            return value.Null()
+        # 'input()' built-in function
+        elif function.index == 1:
+            return value.Text(input())
+        # 'convert(value, type)' built-in function
+        elif function.index == 2:
+            parameter_value = symbol_table.get("value")
+            parameter_type = symbol_table.get("type")
+
+            # Convert Number to...
+            if isinstance(parameter_value, value.Number):
+                # ... Number
+                if parameter_type.value == "number":
+                    return parameter_value
+                # ... Text
+                elif parameter_type.value == "text":
+                    return value.Text(str(parameter_value.value))
+                # ... List
+                elif parameter_type.value == "list":
+                    return value.List(list(str(parameter_value.value)))
+                else:
+                    return parameter_value
+            # Convert Text to...
+            elif isinstance(parameter_value, value.Text):
+                # ... Number
+                if parameter_type.value == "number":
+                    try:
+                        return value.Number(float(parameter_value.value))
+                    except ValueError:
+                        return parameter_value
+                # ... Text
+                elif parameter_type.value == "text":
+                    return parameter_value
+                # ... List
+                elif parameter_type.value == "list":
+                    return value.List(list(str(parameter_value.value)))
+                else:
+                    return parameter_value
+            # Convert List to...
+            elif isinstance(parameter_value, value.List):
+                # ... Number
+                if parameter_type.value == "number":
+                    try:
+                        return value.Number(float("".join(map(str, parameter_value.value))))
+                    except ValueError:
+                        return parameter_value
+                # ... Text
+                elif parameter_type.value == "text":
+                    return value.Text("".join(map(str, parameter_value.value)))
+                # ... List
+                elif parameter_type.value == "list":
+                    return parameter_value
+                else:
+                    return parameter_value
+            else:
+                return parameter_value
+        else:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): Built-in function '{}' not implemented"
+                .format(node.filename, node.line, node.name)
+            )
+
     def _evaluate_functioncall(self, node, symbol_table):
         """Evaluate FunctionCall node."""
-        temporary_function = symbol_table.get(node.name)
+        temporary_function = self._function(node, symbol_table)
+        temporary_symbol_table = nem.symbol_table.Frame(self._layout(temporary_function), symbol_table)
+
+        return self._call(node, temporary_function, self._arguments(node, temporary_function, temporary_symbol_table))
+
+    def _evaluate_inlinecall(self, node, symbol_table):
+        """Evaluate InlineCall node."""
+        temporary_function = value.Function(node.parameters, node.expression)
+        temporary_symbol_table = nem.symbol_table.Frame(self._layout(temporary_function), symbol_table)
+
+        return self._call(node, temporary_function, self._arguments(node, temporary_function, temporary_symbol_table))
+
+    def _function(self, node, symbol_table):
+        """Return the function the node calls, once the number of arguments is checked."""
+        temporary_function = self._get(node, node.name, symbol_table)
 
         if temporary_function is None:
             if isinstance(node.name, ast.FunctionCall):
@@ -337,7 +572,14 @@ class Evaluator:
                     .format(node.filename, node.line, node.name)
                 )
 
-        difference = len(temporary_function.parameters) - len(node.arguments)
+        self._check_arguments(node, temporary_function)
+
+        return temporary_function
+
+    @staticmethod
+    def _check_arguments(node, function):
+        """Check the number of arguments of a function call."""
+        difference = len(function.parameters) - len(node.arguments)
 
         if difference > 0:
             raise EvaluatorException(
@@ -350,111 +592,50 @@ class Evaluator:
                 .format(node.filename, node.line, node.name, abs(difference))
             )
 
-        temporary_symbol_table = symbol_table.copy()
+    def _arguments(self, node, function, symbol_table):
+        """Set the parameters of the function to the arguments of the node, evaluated in the frame of the call."""
+        for parameter, argument in zip(function.parameters, node.arguments):
+            argument = self._evaluate_node(argument, symbol_table)
 
-        for parameter, argument in zip(temporary_function.parameters, node.arguments):
-            argument = self._check(
-                self._evaluate_node(argument, temporary_symbol_table),
+            if argument.__class__ is Signal:
+                self._raise(argument, Compiler.ARGUMENT_ERRORS, node)
 
-                "Evaluation Error (File {}) (Line {}): Cannot return value in argument"
-                .format(node.filename, node.line),
-                "Evaluation Error (File {}) (Line {}): Cannot continue in argument"
-                .format(node.filename, node.line),
-                "Evaluation Error (File {}) (Line {}): Cannot break in argument"
-                .format(node.filename, node.line)
-            )[0]
+            symbol_table.set(parameter, argument)
 
-            temporary_symbol_table.set(parameter, argument)
+        return symbol_table
 
-        if isinstance(temporary_function, value.Function):
-            temporary_return_value = self._check(self._evaluate_node(temporary_function.body, temporary_symbol_table))
+    def _call(self, node, function, symbol_table):
+        """Call a function in its frame, with the parameters set."""
+        # Calls in tail position return the call to make instead of its value, so they're made by this loop
+        while isinstance(function, value.Function):
+            temporary_return_value = self._evaluate_node(function.body, symbol_table)
 
-            # If 'return' is detected, return the value
-            if temporary_return_value[1] and temporary_return_value[0][0] == "RETURN":
-                return temporary_return_value[0][1]
-
-            return value.Null()
-        elif isinstance(temporary_function, value.BuiltInFunction):
-            # 'print(element)' built-in function
-            if temporary_function.index == 0:
-                parameter_element = temporary_symbol_table.get("element")
+            # Without 'return', the function returns null
+            if temporary_return_value.__class__ is not Signal:
+                return value.Null()
 
-                print(parameter_element, end="")
+            if temporary_return_value.kind == "RETURN":
+                return temporary_return_value.value
 
+            if temporary_return_value.kind != "CALL":
                 return value.Null()
-            # 'input()' built-in function
-            elif temporary_function.index == 1:
-                return value.Text(input())
-            # 'convert(value, type)' built-in function
-            elif temporary_function.index == 2:
-                parameter_value = temporary_symbol_table.get("value")
-                parameter_type = temporary_symbol_table.get("type")
-
-                # Convert Number to...
-                if isinstance(parameter_value, value.Number):
-                    # ... Number
-                    if parameter_type.value == "number":
-                        return parameter_value
-                    # ... Text
-                    elif parameter_type.value == "text":
-                        return value.Text(str(parameter_value.value))
-                    # ... List
-                    elif parameter_type.value == "list":
-                        return value.List(list(str(parameter_value.value)))
-                    else:
-                        return parameter_value
-                # Convert Text to...
-                elif isinstance(parameter_value, value.Text):
-                    # ... Number
-                    if parameter_type.value == "number":
-                        try:
-                            return value.Number(float(parameter_value.value))
-                        except ValueError:
-                            return parameter_value
-                    # ... Text
-                    elif parameter_type.value == "text":
-                        return parameter_value
-                    # ... List
-                    elif parameter_type.value == "list":
-                        return value.List(list(str(parameter_value.value)))
-                    else:
-                        return parameter_value
-                # Convert List to...
-                elif isinstance(parameter_value, value.List):
-                    # ... Number
-                    if parameter_type.value == "number":
-                        try:
-                            return value.Number(float("".join(map(str, parameter_value.value))))
-                        except ValueError:
-                            return parameter_value
-                    # ... Text
-                    elif parameter_type.value == "text":
-                        return value.Text("".join(map(str, parameter_value.value)))
-                    # ... List
-                    elif parameter_type.value == "list":
-                        return parameter_value
-                    else:
-                        return parameter_value
-                else:
-                    return parameter_value
-            else:
-                raise EvaluatorException(
-                    "Evaluation Error (File {}) (Line {}): Built-in function '{}' not implemented"
-                    .format(node.filename, node.line, node.name)
-                )
+
+            node, function, symbol_table = temporary_return_value.value
+
+        if isinstance(function, value.BuiltInFunction):
+            return self.call_built_in(node, function, symbol_table)
         else:
             raise EvaluatorException(
                 "Evaluation Error (File {}) (Line {}): Function type '{}' not implemented"
-                .format(node.filename, node.line, type(temporary_function))
+                .format(node.filename, node.line, type(function))
             )
 
     @staticmethod
     def _evaluate_import(node, symbol_table):
         """Evaluate Import node."""
         try:
-            with open("{}.nem".format(node.file)) as nem_file:
-                temporary_code = nem_file.read()
-                nem.interpreter.Interpreter(temporary_code, node.file, symbol_table)
+            with open("{}.nem".format(node.file), "rb") as nem_file:
+                nem.interpreter.Interpreter(nem_file, node.file, symbol_table, cache=True, inline=False)
         except FileNotFoundError:
             raise EvaluatorException(
                 "Evaluation Error (File {}) (Line {}): File '{}.nem' doesn't exist"
@@ -465,28 +646,35 @@ class Evaluator:
 
     def _evaluate_return(self, node, symbol_table):
         """Evaluate Return node."""
-        temporary_return_value = self._check(
-            self._evaluate_node(node.value, symbol_table),
+        # A call in tail position is returned to the call of the function, which makes it in place of its own frame
+        if symbol_table.layout is not None and id(node) in symbol_table.layout.tails:
+            return Signal("CALL", self._tail(node.value, symbol_table))
 
-            "Evaluation Error (File {}) (Line {}): Cannot return value within return value"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot continue within return value"
-            .format(node.filename, node.line),
-            "Evaluation Error (File {}) (Line {}): Cannot break within return value"
-            .format(node.filename, node.line)
-        )[0]
+        temporary_return_value = self._evaluate_node(node.value, symbol_table)
 
-        return "RETURN", temporary_return_value
+        if temporary_return_value.__class__ is Signal:
+            self._raise(temporary_return_value, Compiler.RETURN_ERRORS, node)
 
-    @staticmethod
-    def _evaluate_continue(_, __):
+        return Signal("RETURN", temporary_return_value)
+
+    def _tail(self, node, symbol_table):
+        """Return the call of the node, the function and its frame, for the call in tail position to make."""
+        if isinstance(node, ast.InlineCall):
+            temporary_function = value.Function(node.parameters, node.expression)
+        else:
+            temporary_function = self._function(node, symbol_table)
+
+        temporary_symbol_table = symbol_table.tail(self._layout(temporary_function))
+
+        return node, temporary_function, self._arguments(node, temporary_function, temporary_symbol_table)
+
+    def _evaluate_continue(self, _, __):
         """Evaluate Continue node."""
-        return "CONTINUE", None
+        return self.CONTINUE
 
-    @staticmethod
-    def _evaluate_break(_, __):
+    def _evaluate_break(self, _, __):
         """Evaluate Break node."""
-        return "BREAK", None
+        return self.BREAK
 
     @staticmethod
     def _evaluate_null(_, __):
@@ -496,28 +684,32 @@ class Evaluator:
     def _evaluate_node(self, node, symbol_table):
         """Evaluate a node."""
         try:
-            method = getattr(self, "_evaluate_{}".format(type(node).__name__.lower()))
-        except AttributeError:
-            raise EvaluatorException(
-                "Evaluation Error (File {}) (Line {}): Node '{}' is not defined"
-                .format(node.filename, node.line, type(node).__name__)
-            )
+            method = self.handlers[node.__class__]
+        except KeyError:
+            method = self._handler(node)
 
         return method(node, symbol_table)
 
+    def _handler(self, node):
+        """Return the handler of a class of node that has none yet, which is the one of its closest base class."""
+        for node_class in type(node).__mro__:
+            if node_class in self.handlers:
+                temporary_handler = self.handlers[type(node)] = self.handlers[node_class]
+
+                return temporary_handler
+
+        raise EvaluatorException(
+            "Evaluation Error (File {}) (Line {}): Node '{}' is not defined"
+            .format(node.filename, node.line, type(node).__name__)
+        )
+
     def _evaluate_all(self):
         """Evaluate all nodes."""
         for node in self.abstract_syntax_tree:
-            current_result = self._check(
-                self._evaluate_node(node, self.symbol_table),
-
-                "Evaluation Error (File {}) (Line {}): 'return' not in function"
-                .format(node.filename, node.line),
-                "Evaluation Error (File {}) (Line {}): 'continue' not in loop"
-                .format(node.filename, node.line),
-                "Evaluation Error (File {}) (Line {}): 'break' not in loop"
-                .format(node.filename, node.line)
-            )[0]
+            current_result = self._evaluate_node(node, self.symbol_table)
+
+            if current_result.__class__ is Signal:
+                self._raise(current_result, Compiler.TOP_LEVEL_ERRORS, node)
 
             yield current_result
 
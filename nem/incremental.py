@@ -0,0 +1,604 @@
+"""Lex and parse edited code incrementally.
+
+Holds the Document class which keeps the tokens and the AST of code that keeps getting edited, class Segment which
+locates the tokens and the nodes of a single top-level expression, class Tokens which lists the tokens of a Document and
+class Stream which reads its code.
+
+"""
+
+import bisect
+import collections.abc
+import random
+
+from nem.lexer import Lexer
+import nem.nodes as ast
+from nem.parser import Parser
+from nem.source import Source
+from nem.token_ import Token
+
+
+class Segment:
+
+    """Locate positions in a top-level expression.
+
+    Tokens and nodes of a Document store their offset from the start of their top-level expression, so an edit before
+    the expression never has to change them. The segments of a document form a balanced tree (a treap) in the order of
+    the code, each one holding the code from the start of its expression up to the next one. A segment only stores its
+    own code, the starts of the lines in it and its tokens, and their totals for its subtree, so its start, its lines
+    and the tokens before it are all found in logarithmic time.
+
+    """
+
+    __slots__ = ("document", "tokens", "text", "width", "newlines", "priority", "parent", "left", "right", "size",
+                 "total_width", "total_newlines", "total_tokens")
+
+    def __init__(self, document, tokens, text):
+        """Initialize Segment class."""
+        self.document = document
+        self.tokens = tokens
+        self.text = text
+        self.width = len(text)
+        # Offsets from the start of the segment where its lines start
+        self.newlines = [newline.end() for newline in Source.TEXT_NEWLINE.finditer(text)]
+
+        self.priority = random.random()
+        self.parent = self.left = self.right = None
+
+        self.update()
+
+    def update(self):
+        """Count the totals of the subtree again, after one of its segments changed."""
+        size = 1
+        width = self.width
+        newlines = len(self.newlines)
+        tokens = len(self.tokens)
+
+        for child in (self.left, self.right):
+            if child is not None:
+                size += child.size
+                width += child.total_width
+                newlines += child.total_newlines
+                tokens += child.total_tokens
+
+        self.size = size
+        self.total_width = width
+        self.total_newlines = newlines
+        self.total_tokens = tokens
+
+    def before(self):
+        """Return the width, the number of newlines, the number of segments and the number of tokens before it."""
+        left = self.left
+
+        if left is not None:
+            width, newlines, size, tokens = left.total_width, left.total_newlines, left.size, left.total_tokens
+        else:
+            width = newlines = size = tokens = 0
+
+        node = self
+        parent = node.parent
+
+        while parent is not None:
+            if node is parent.right:
+                width += parent.width
+                newlines += len(parent.newlines)
+                size += 1
+                tokens += len(parent.tokens)
+
+                left = parent.left
+
+                if left is not None:
+                    width += left.total_width
+                    newlines += left.total_newlines
+                    size += left.size
+                    tokens += left.total_tokens
+
+            node = parent
+            parent = node.parent
+
+        return width, newlines, size, tokens
+
+    @property
+    def start(self):
+        """Return the offset of the start of the segment."""
+        return self.before()[0]
+
+    @property
+    def filename(self):
+        """Return the name of the file the segment is in."""
+        return self.document.filename
+
+    def line(self, offset):
+        """Return the line of the offset."""
+        return self.before()[1] + bisect.bisect_right(self.newlines, offset) + 1
+
+    def column(self, offset):
+        """Return the column of the offset."""
+        index = bisect.bisect_right(self.newlines, offset)
+
+        if index > 0:
+            return offset - self.newlines[index - 1] + 1
+
+        # The line started in one of the segments before
+        start, newlines = self.before()[:2]
+
+        return start + offset - self.document.line_start(newlines) + 1
+
+    def __deepcopy__(self, memo):
+        """Return the segment itself, like a Source."""
+        return self
+
+    def __repr__(self):
+        """Represent Segment class."""
+        return "Segment({}, {})".format(repr(self.document.filename), repr(self.start))
+
+
+def _next(node):
+    """Return the segment after the segment, or None."""
+    if node.right is not None:
+        node = node.right
+
+        while node.left is not None:
+            node = node.left
+
+        return node
+
+    while node.parent is not None and node is node.parent.right:
+        node = node.parent
+
+    return node.parent
+
+
+def _merge(left, right):
+    """Join two trees of segments, with the segments of the left one first, and return the root."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.right.parent = left
+        left.update()
+
+        return left
+
+    right.left = _merge(left, right.left)
+    right.left.parent = right
+    right.update()
+
+    return right
+
+
+def _split(node, count):
+    """Split a tree of segments into the roots of its first count segments and of the rest."""
+    if node is None:
+        return None, None
+
+    node.parent = None
+    left_size = node.left.size if node.left is not None else 0
+
+    if count <= left_size:
+        left, node.left = _split(node.left, count)
+
+        if node.left is not None:
+            node.left.parent = node
+
+        node.update()
+
+        return left, node
+
+    node.right, right = _split(node.right, count - left_size - 1)
+
+    if node.right is not None:
+        node.right.parent = node
+
+    node.update()
+
+    return node, right
+
+
+class Tokens(collections.abc.Sequence):
+
+    """List the tokens of a Document.
+
+    Reads the tokens out of the segments of the document, so an edit never has to copy them into a single list.
+
+    """
+
+    def __init__(self, document):
+        """Initialize Tokens class."""
+        self.document = document
+
+    def __len__(self):
+        """Return the number of tokens, EOF included."""
+        return self.document.root.total_tokens + 1
+
+    def __getitem__(self, index):
+        """Return the token at the index, or a list of the tokens of a slice."""
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        length = len(self)
+
+        if index < 0:
+            index += length
+
+        if not 0 <= index < length:
+            raise IndexError("token index out of range")
+
+        if index == length - 1:
+            return self.document.eof
+
+        node = self.document.root
+
+        while True:
+            left_tokens = node.left.total_tokens if node.left is not None else 0
+
+            if index < left_tokens:
+                node = node.left
+                continue
+
+            index -= left_tokens
+
+            if index < len(node.tokens):
+                return node.tokens[index]
+
+            index -= len(node.tokens)
+            node = node.right
+
+    def __iter__(self):
+        """Iterate over the tokens in the order of the code."""
+        stack = []
+        node = self.document.root
+
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+            node = stack.pop()
+            yield from node.tokens
+            node = node.right
+
+        yield self.document.eof
+
+    def __repr__(self):
+        """Represent Tokens class."""
+        return repr(list(self))
+
+
+class Stream:
+
+    """Read code given in pieces like a file.
+
+    Used for lexing the code of a Document without joining all of it into a single string. Keeps the chunks it read, as
+    they hold the code of the expressions that get lexed again.
+
+    """
+
+    def __init__(self, pieces):
+        """Initialize Stream class."""
+        self.pieces = pieces
+        self.chunks = []
+
+    def read(self, size=-1):
+        """Read at least the size of code, or all of it, which gives an empty string at the end of the code."""
+        pieces = []
+        length = 0
+
+        for piece in self.pieces:
+            pieces.append(piece)
+            length += len(piece)
+
+            if 0 <= size <= length:
+                break
+
+        chunk = "".join(pieces)
+        self.chunks.append(chunk)
+
+        return chunk
+
+
+class Document:
+
+    """Keep the tokens and the AST of edited code.
+
+    Used for REPLs and editors. After an edit, only the top-level expressions around it are lexed and parsed again, the
+    tokens and nodes of all the others are reused without being moved, so an edit takes time in proportion to the code
+    around it instead of to all of the code.
+
+    """
+
+    # Size of a single read of the code that gets lexed again
+    CHUNK_SIZE = 1 << 10
+
+    def __init__(self, code, filename):
+        """Initialize Document class.
+
+        Raises a LexerException or a ParserException if the code isn't valid. Code that might not be valid can be added
+        to an empty document with an edit instead.
+
+        """
+        self.filename = filename
+
+        # Segments of the last code that was valid. The first one holds the code before the first expression
+        self.root = Segment(self, [], "")
+        self.eof = Token(Token.EOF, None, self, 0)
+        self.ast = []
+
+        # Edit of the valid code that gives the current code, if the current code isn't valid
+        self.pending = None
+
+        self.edit(0, 0, code)
+
+    @property
+    def code(self):
+        """Return the code, which is only joined into a single string when it's asked for."""
+        return "".join(self._pieces(0, self.pending))
+
+    @property
+    def tokens(self):
+        """Return the tokens of the last code that was valid."""
+        return Tokens(self)
+
+    def _find(self, offset):
+        """Return the segment covering the offset, or the last one for the end of the code."""
+        node = self.root
+
+        while True:
+            left = node.left
+
+            if left is not None:
+                if offset < left.total_width:
+                    node = left
+                    continue
+
+                offset -= left.total_width
+
+            if offset < node.width or node.right is None:
+                return node
+
+            offset -= node.width
+            node = node.right
+
+    def _select(self, index):
+        """Return the segment at the index."""
+        node = self.root
+
+        while True:
+            left_size = node.left.size if node.left is not None else 0
+
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def line_start(self, count):
+        """Return the offset of the start of the line that follows the first count newlines."""
+        if count == 0:
+            return 0
+
+        node = self.root
+        start = 0
+
+        while True:
+            left = node.left
+
+            if left is not None:
+                if count <= left.total_newlines:
+                    node = left
+                    continue
+
+                count -= left.total_newlines
+                start += left.total_width
+
+            if count <= len(node.newlines):
+                return start + node.newlines[count - 1]
+
+            count -= len(node.newlines)
+            start += node.width
+            node = node.right
+
+    def line(self, offset):
+        """Return the line of an offset into the code, for the tokens located in the whole document, like EOF."""
+        segment = self._find(offset)
+        return segment.line(offset - segment.start)
+
+    def column(self, offset):
+        """Return the column of an offset into the code."""
+        segment = self._find(offset)
+        return segment.column(offset - segment.start)
+
+    def _pieces(self, offset, edit=None):
+        """Yield the valid code from the offset on in pieces, with an edit of it after the offset applied."""
+        segment = self._find(offset)
+        text = segment.text[offset - segment.start:]
+        position = offset
+        inserted = edit is None
+
+        while True:
+            if edit is None:
+                yield text
+            else:
+                edit_start, edit_end, replacement = edit
+                end = position + len(text)
+
+                if position < edit_start:
+                    yield text[:edit_start - position]
+                if not inserted and end >= edit_start:
+                    inserted = True
+                    yield replacement
+                if end > edit_end:
+                    yield text[max(edit_end - position, 0):]
+
+                position = end
+
+            segment = _next(segment)
+
+            if segment is None:
+                break
+
+            text = segment.text
+
+    def _slice(self, start, end):
+        """Return the code between the offsets."""
+        first = start if self.pending is None else min(start, self.pending[0])
+        pieces = []
+        length = 0
+
+        for piece in self._pieces(first, self.pending):
+            pieces.append(piece)
+            length += len(piece)
+
+            if length >= end - first:
+                break
+
+        return "".join(pieces)[start - first:end - first]
+
+    def _merge(self, start, end, replacement):
+        """Merge the edit with the pending one, giving a single edit of the valid code."""
+        pending_start, pending_end, pending_replacement = self.pending
+        pending_stop = pending_start + len(pending_replacement)
+
+        merged_start = min(start, pending_start)
+        merged_stop = max(end, pending_stop)
+
+        return (merged_start, pending_end + merged_stop - pending_stop,
+                self._slice(merged_start, start) + replacement + self._slice(end, merged_stop))
+
+    def _rebase(self, node, source, segment, start):
+        """Move the nodes located in the source into the segment starting at the offset."""
+        if isinstance(node, list):
+            for temporary_node in node:
+                self._rebase(temporary_node, source, segment, start)
+        elif isinstance(node, ast.Node):
+            if node.source is source:
+                node.source = segment
+                node.offset -= start
+
+            for field in node.fields():
+                self._rebase(getattr(node, field), source, segment, start)
+
+    def _update(self, start, end, replacement):
+        """Lex and parse the top-level expressions damaged by an edit of the valid code."""
+        delta = len(replacement) - (end - start)
+
+        # The expression before the damaged one is parsed again too, as the edit might join the two. The segments are
+        # counted with the one before the first expression
+        first = self._find(start).before()[2] - 1
+
+        if first > 1:
+            segment = self._select(first)
+            position, newlines = segment.before()[:2]
+            line = newlines + 1
+            column = segment.column(0)
+        else:
+            # Comments before the first expression might be edited as well
+            first = 0
+            position = 0
+            line = column = 1
+
+        resume = self.root.size
+
+        recorded = []
+
+        def tokens():
+            """Record the tokens as the parser reads them."""
+            for token in lexer.lex():
+                recorded.append(token)
+
+                yield token
+
+        # The code is read from the position on, so the code before it is never joined or scanned
+        stream = Stream(self._pieces(position, (start, end, replacement)))
+        lexer = Lexer(stream, self.filename, position, line, column)
+        lexer.CHUNK_SIZE = self.CHUNK_SIZE
+        parser = Parser(tokens())
+
+        temporary_ast = []
+        temporary_tokens = []
+        temporary_starts = []
+
+        for temporary in parser.parse():
+            # The last recorded token already belongs to the next expression
+            temporary_tokens.append(recorded[:-1])
+            temporary_starts.append(recorded[0].offset)
+            temporary_ast.append(temporary)
+            del recorded[:-1]
+
+            # Once an expression starts where one started before the edit, the rest of the code is parsed the same
+            following = parser.current_token.offset
+            if parser.current_token.type != Token.EOF and following >= start + len(replacement):
+                segment = self._find(following - delta)
+                before = segment.before()
+
+                if before[2] > 0 and before[0] == following - delta:
+                    resume = before[2]
+                    boundary = following
+                    break
+
+        # Code read from the position on, which holds all of the code that was lexed again
+        code = "".join(stream.chunks)
+
+        if resume < self.root.size:
+            eof = Token(Token.EOF, None, self, self.eof.offset + delta)
+        else:
+            boundary = position + len(code)
+            eof = recorded[-1]
+            eof.source = self
+
+        source = lexer.source
+        temporary_segments = []
+
+        if first == 0:
+            temporary_segments.append(Segment(self, [], code[:temporary_starts[0] if temporary_starts else boundary]))
+
+        for index, (expression_tokens, expression_start) in enumerate(zip(temporary_tokens, temporary_starts)):
+            expression_end = temporary_starts[index + 1] if index + 1 < len(temporary_starts) else boundary
+            segment = Segment(self, expression_tokens, code[expression_start - position:expression_end - position])
+
+            for token in expression_tokens:
+                token.source = segment
+                token.offset -= expression_start
+
+            self._rebase(temporary_ast[index], source, segment, expression_start)
+            temporary_segments.append(segment)
+
+        # Only the damaged segments are replaced, the ones after them move along with the widths before them
+        left, rest = _split(self.root, first)
+        right = _split(rest, resume - first)[1]
+        middle = None
+
+        for segment in temporary_segments:
+            middle = _merge(middle, segment)
+
+        self.root = _merge(_merge(left, middle), right)
+        self.root.parent = None
+
+        self.ast[max(first, 1) - 1:resume - 1] = temporary_ast
+        self.eof = eof
+
+    def edit(self, start, end, replacement):
+        """Edit the code.
+
+        Replaces the code between the start and the end offsets with the replacement, then returns the new tokens and
+        AST. Raises a LexerException or a ParserException if the code isn't valid after the edit, in which case the
+        tokens and the AST stay the ones of the last valid code until a later edit fixes it.
+
+        """
+        if self.pending is not None:
+            start, end, replacement = self._merge(start, end, replacement)
+
+        try:
+            self._update(start, end, replacement)
+        except Exception:
+            # Keeps the edit until the code is valid again
+            self.pending = start, end, replacement
+            raise
+
+        self.pending = None
+
+        return self.tokens, self.ast
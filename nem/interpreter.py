@@ -5,9 +5,13 @@ Holds class Interpreter.
 """
 
 
+import os
+
+import nem.cache
 import nem.lexer
 import nem.parser
 import nem.evaluator
+import nem.optimizer
 import nem.types_ as value
 
 
@@ -19,24 +23,102 @@ class Interpreter:
 
     """
 
-    def __init__(self, code, filename, symbol_table):
+    def __init__(self, code, filename, symbol_table, parser=nem.parser.Parser, cache=False, evaluator=None,
+                 optimization=None, inline=None):
         """Initialize the Interpreter class.
 
-        Initializes the Interpreter class
+        Initializes the Interpreter class. The code can be anything the Lexer accepts, including a binary file object,
+        in which case it gets lexed, parsed and evaluated while it's being read. The parser can be any class with the
+        interface of Parser, like PrattParser, which reads all of the tokens first. Likewise, the evaluator can be any
+        class with the interface of Evaluator, like VirtualMachine, and is Evaluator by default.
+
+        With the cache, the AST of the code gets stored on disk next to the file, the one of a file object or the one
+        named by the filename, and the code only gets lexed and parsed again once it changes. The code is hashed
+        without reading all of it into memory, and still streamed to the lexer when it isn't cached. Code that fails
+        while it's evaluated is still cached, as long as all of it parses. Cache.ENABLED turns the cache off.
+
+        The optimization is the level of the Optimizer the AST goes through before it's evaluated, Optimizer.LEVEL by
+        default. The cache keeps the AST from before it's optimized, so it doesn't depend on the level. Inline turns the
+        inlining of the Optimizer on or off, and is off for imports, since the code importing them can rebind their
+        functions.
+
+        A file the lexer memory-maps is unmapped once the code is evaluated.
 
         """
         self.code = code
         self.filename = filename
         self.symbol_table = symbol_table
 
-        self.lexer = nem.lexer.Lexer(self.code, filename)
-        self.tokens = self.lex()
+        self.cache = None
+        self.header = None
+        self.ast = None
+
+        if cache and nem.cache.Cache.ENABLED:
+            path = os.fspath(code) if isinstance(code, os.PathLike) else getattr(code, "name", filename)
+
+            # Files opened from a file descriptor are named by the descriptor
+            self.cache = nem.cache.Cache(path if isinstance(path, str) else filename)
+
+            self.header = self.cache.header(code)
+
+            if self.header is None:
+                self.cache = None
+            else:
+                self.ast = self.cache.load(self.header, filename)
+
+        if self.ast is None:
+            self.lexer = nem.lexer.Lexer(self.code, filename)
+            self.tokens = self.lex()
+
+            self.parser = parser(self.tokens)
+            self.ast = self.parse()
+
+            if self.cache is not None:
+                self.ast = self._store(self.ast)
+        else:
+            self.lexer = self.tokens = self.parser = None
+
+        if evaluator is None:
+            evaluator = nem.evaluator.Evaluator
+
+        optimizer = nem.optimizer.Optimizer(optimization, inline, self.symbol_table)
+        self.evaluator = evaluator(optimizer.optimize(self.ast), self.symbol_table)
+
+        try:
+            self.return_values = tuple(self.evaluator.evaluate())
+        except Exception:
+            self._finish()
+            raise
+        finally:
+            self.close()
+
+    def close(self):
+        """Unmap the file the lexer memory-mapped, if any."""
+        if self.lexer is not None:
+            self.lexer.close()
+
+    def _store(self, nodes):
+        """Cache the nodes once all of them are parsed, while still evaluating each one as soon as it's parsed."""
+        temporary_ast = []
+
+        for node in nodes:
+            temporary_ast.append(node)
+
+            yield node
+
+        self.cache.dump(self.header, temporary_ast)
 
-        self.parser = nem.parser.Parser(self.tokens)
-        self.ast = self.parse()
+    def _finish(self):
+        """Parse the rest of the code after the evaluation failed, so its AST still gets cached."""
+        if self.cache is None or self.parser is None:
+            return
 
-        self.evaluator = nem.evaluator.Evaluator(self.ast, self.symbol_table)
-        self.return_values = tuple(self.evaluator.evaluate())
+        try:
+            for _ in self.ast:
+                pass
+        except Exception:
+            # Code that doesn't parse isn't cached
+            pass
 
     def lex(self):
         """Lex the code.
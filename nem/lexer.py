@@ -50,9 +50,16 @@ Tokens (Extended Backus-Naur form):
 
 """
 
-from nem.token_ import Token
+from nem.source import Source
+from nem.token_ import Token, TokenBuffer
 from nem.exceptions import LexerException
+import concurrent.futures
+import io
+import itertools
+import mmap
+import os
 import re
+from sys import intern
 
 
 class Lexer:
@@ -79,248 +86,227 @@ class Lexer:
         "is": Token.IS
     }
 
-    def __init__(self, code, filename):
-        """Initialize Lexer class."""
-        self.code = code
-        self.filename = filename
+    OPERATORS = {
+        ",": Token.COMMA,
+        "^": Token.CARET,
+        "*": Token.ASTERISK,
+        "/": Token.SLASH,
+        "+": Token.PLUS,
+        "-": Token.MINUS,
+        "%": Token.MODULO,
+        "=": Token.EQUAL,
+        "(": Token.LEFT_BRACKET,
+        ")": Token.RIGHT_BRACKET,
+        "[": Token.LEFT_SQUARE,
+        "]": Token.RIGHT_SQUARE,
+        "<": Token.LESS,
+        "<=": Token.LESS_EQUAL,
+        ">": Token.GREATER,
+        ">=": Token.GREATER_EQUAL
+    }
 
-        self.current_index = 0
-        self.previous_character = None
-        self.current_character = code[0]
+    # One alternation for the whole token set, so every token is found with a single match call
+    PATTERN = r"""
+        (?P<SKIP>[ \t\r\n]+ | \#[^\r\n]*)
+        | (?P<NUMBER>[0-9]*\.?[0-9]+)
+        | (?P<SYMBOL>[a-zA-Z_][a-zA-Z_0-9]*)
+        | (?P<TEXT>"(?:[^"\\]|\\[nt"\\]|\\(?![nt"\\]))*")
+        | (?P<OPERATOR>[<>]=? | [,^*/+\-%=()\[\]])
+    """
 
-        self.line = 1
+    TEXT_PATTERN = re.compile(PATTERN, re.VERBOSE)
+    BINARY_PATTERN = re.compile(PATTERN.encode(), re.VERBOSE)
 
-    def _advance_index(self):
-        """Advance the current character."""
-        self.current_index += 1
-        self.previous_character = self.current_character
-        self.current_character = self.code[self.current_index] if self.current_index < len(self.code) else None
-        if self.previous_character == "\n" and self.current_character is not None:
-            self.line += 1
+    # Size of a single read when the source is a stream that can't be memory-mapped
+    CHUNK_SIZE = 1 << 20
 
-    def _next_number(self):
-        """Return next number relative to the current position."""
-        # Tries to find the next number
-        while self.current_character is not None and not re.match("[0-9.]", self.current_character):
-            self._advance_index()
+    # Texts and comments, the only places a newline or a quotation mark doesn't end or start a token. An unterminated
+    # text runs to the end of the code
+    REGION_PATTERN = r'''"(?:[^"\\]|\\[\s\S])*"? | \#[^\r\n]*'''
 
-        if self.current_character is None:
-            raise LexerException("Lexing Error (File {}) (Line {}): No number found.".format(self.filename, self.line))
+    TEXT_REGION_PATTERN = re.compile(REGION_PATTERN, re.VERBOSE)
+    BINARY_REGION_PATTERN = re.compile(REGION_PATTERN.encode(), re.VERBOSE)
 
-        length = 0
+    TEXT_NEWLINE_PATTERN = re.compile("\n")
+    BINARY_NEWLINE_PATTERN = re.compile(b"\n")
 
-        # "[0-9]*\.?[0-9]*\Z" checks for a valid number (10, 10.2, .4, etc.)
-        while self.current_character is not None                                                                       \
-                and re.match("[0-9]*\.?[0-9]+\Z", self.code[self.current_index - length:self.current_index + 1])       \
-                or self.current_character == ".":
-            length += 1
-            self._advance_index()
+    # Smallest code worth lexing in parallel, below it starting the processes takes longer than lexing
+    PARALLEL_SIZE = 1 << 22
 
-        if self.previous_character == ".":
-            raise LexerException("Lexing Error (File {}) (Line {}): Unrecognized token"
-                                 .format(self.filename, self.line))
+    def __init__(self, code, filename, position=0, line=None, column=1):
+        """Initialize Lexer class.
 
-        return self.code[self.current_index - length:self.current_index]
+        The code can be a string, a bytes-like object (bytes, mmap, etc.), a binary file object or a path-like object.
+        Files are memory-mapped when possible and read in chunks otherwise, so their content is never decoded as a
+        whole. Code that's in memory can be lexed starting from a position other than its start, while a stream that
+        isn't memory-mapped is taken to start at the position. Given the line and the column of the position as well,
+        the tokens are located without ever scanning the code before it.
 
-    def _next_symbol(self):
-        """Return next symbol."""
-        # Tries to find the next symbol
-        while self.current_character is not None and not re.match("[a-zA-Z_]", self.current_character):
-            self._advance_index()
+        The files the lexer memory-maps stay mapped until it's closed, as the Source of the tokens reads their columns
+        from them.
 
-        if self.current_character is None:
-            raise LexerException("Lexing Error (File {}) (Line {}): No symbol found.".format(self.filename, self.line))
+        """
+        self.code = code
+        # Tokens of every lexer for the same file share one filename string
+        self.filename = intern(filename)
+        self.position = position
+        self.line = line
+        self.column = column
 
-        length = 0
+        self.source = None
+        self.mappings = []
 
-        # "[a-zA-Z_][a-zA-Z_0-9]*\Z" checks for a valid symbol, but many other tokens (purposefully) pass as well
-        while self.current_character is not None                                                                       \
-                and re.match("[a-zA-Z_][a-zA-Z_0-9]*\Z", self.code[self.current_index - length:self.current_index + 1]):
-            length += 1
-            self._advance_index()
+    def __enter__(self):
+        """Return the lexer, which gets closed on exit."""
+        return self
 
-        return self.code[self.current_index - length:self.current_index]
+    def __exit__(self, *exception):
+        """Close the lexer."""
+        self.close()
 
-    def _next_text(self):
-        """Return next text.
+    def close(self):
+        """Unmap the files the lexer memory-mapped.
 
-        Everything between the current or found quotation mark and the next unescaped one gets lexed.
+        Their tokens and nodes still have lines afterwards, but their columns count bytes.
 
         """
-        # Tries to find the next text
-        while self.current_character is not None and self.current_character != "\"":
-            self._advance_index()
-
-        if self.current_character is None:
-            raise LexerException("Lexing Error (File {}) (Line {}): No text found.".format(self.filename, self.line))
-
-        length = 0
-        self._advance_index()
-
-        escaped_characters = (
-            "n",
-            "t",
-            "\"",
-            "\\"
-        )
-
-        # Up until it reaches the closing quotation mark, it continues adding all the characters to text
-        while self.current_character is not None and self.current_character != "\"":
-            length += 1
-            self._advance_index()
-
-            if self.previous_character == "\\" and self.current_character in escaped_characters:
-                length += 1
-                self._advance_index()
-
-        if self.current_character is None:
-            raise LexerException("Lexing Error (File {}) (Line {}): Text doesn't have an end"
-                                 .format(self.filename, self.line))
-
-        self._advance_index()
-
-        # -1s are added because of self._advance_index() at the end, which increases self.current_index by 1
-        return self.code[self.current_index - length - 1:self.current_index - 1]\
-            .replace("\\n", "\n").replace("\\t", "\t").replace('\\"', "\"")
-
-    def _next_token(self):
-        """Return next token."""
-        if self.current_character is None:
-            token = None
-
-        # Ignores whitespaces and tabs
-        elif self.current_character in " \t":
-            self._advance_index()
-            token = False
-
-        # Lexes COMMA token
-        elif self.current_character == ",":
-            token = Token(Token.COMMA, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes CARET token
-        elif self.current_character == "^":
-            token = Token(Token.CARET, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes ASTERISK token
-        elif self.current_character == "*":
-            token = Token(Token.ASTERISK, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes SLASH token
-        elif self.current_character == "/":
-            token = Token(Token.SLASH, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes PLUS token
-        elif self.current_character == "+":
-            token = Token(Token.PLUS, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes MINUS token
-        elif self.current_character == "-":
-            token = Token(Token.MINUS, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes MODULO token
-        elif self.current_character == "%":
-            token = Token(Token.MODULO, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes EQUAL token
-        elif self.current_character == "=":
-            token = Token(Token.EQUAL, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes LEFT_BRACKET token
-        elif self.current_character == "(":
-            token = Token(Token.LEFT_BRACKET, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes RIGHT_BRACKET token
-        elif self.current_character == ")":
-            token = Token(Token.RIGHT_BRACKET, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes LEFT_SQUARE token
-        elif self.current_character == "[":
-            token = Token(Token.LEFT_SQUARE, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes RIGHT_SQUARE token
-        elif self.current_character == "]":
-            token = Token(Token.RIGHT_SQUARE, self.current_character, self.filename, self.line)
-            self._advance_index()
-
-        # Lexes LESS or LESS_EQUAL token
-        elif self.current_character == "<":
-            self._advance_index()
-            if self.current_character == "=":
-                token = Token(Token.LESS_EQUAL, "{}{}".format(self.previous_character, self.current_character),
-                              self.filename, self.line)
-                self._advance_index()
-            else:
-                token = Token(Token.LESS, self.previous_character, self.filename, self.line)
-
-        # Lexes GREATER or GREATER_EQUAL token
-        elif self.current_character == ">":
-            self._advance_index()
-            if self.current_character == "=":
-                token = Token(Token.GREATER_EQUAL, "{}{}".format(self.previous_character, self.current_character),
-                              self.filename, self.line)
-                self._advance_index()
-            else:
-                token = Token(Token.GREATER, self.previous_character, self.filename, self.line)
-
-        # Lexes TEXT token - everything between the current quotation mark and the next one gets lexed
-        elif self.current_character == "\"":
-            token = Token(Token.TEXT, self._next_text(), self.filename, self.line)
-
-        # Lexes NUMBER token
-        elif re.match("[0-9.]", self.current_character):
-            token = Token(Token.NUMBER, self._next_number(), self.filename, self.line)
-
-        # Lexes both SYMBOL tokens and tokens comprised of letters
-        elif re.match("[a-zA-Z_]", self.current_character):
-            temporary = self._next_symbol()
+        if self.source is not None and any(self.source.code is mapping for mapping in self.mappings):
+            self.source.release()
 
-            try:
-                token = Token(self.SYMBOLS[temporary], temporary, self.filename, self.line)
-            except KeyError:
-                # If it's not a token comprised of letters, it's a SYMBOL token
-                token = Token(Token.SYMBOL, temporary, self.filename, self.line)
+        for mapping in self.mappings:
+            mapping.close()
 
-        elif self.current_character == "\n":
-            self._advance_index()
-            token = False
+        self.mappings = []
 
-        # Comments - everything in-between '#' character and the next newline character gets ignored
-        elif self.current_character == "#":
-            while self.current_character is not None and self.current_character != "\n":
-                self._advance_index()
-            self._advance_index()
+    def _open(self):
+        """Return the initial buffer, whether it holds the whole source and the stream to read the rest from."""
+        code = self.code
 
-            token = False
+        if isinstance(code, (str, bytes, bytearray, memoryview, mmap.mmap)):
+            return code, True, None
 
-        else:
-            raise LexerException("Lexing Error (File {}) (Line {}): Unrecognized token"
-                                 .format(self.filename, self.line))
+        if isinstance(code, os.PathLike):
+            file = open(code, "rb")
+            buffer, final, stream = self._map(file)
+
+            # A memory-mapped file doesn't need its file object anymore
+            if stream is None:
+                file.close()
+
+            return buffer, final, stream
+
+        return self._map(code)
+
+    def _map(self, file):
+        """Memory-map the file, falling back to reading it in chunks."""
+        try:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            # Empty files, pipes and in-memory streams can't be memory-mapped
+            chunk = file.read(self.CHUNK_SIZE)
+            return chunk, not chunk, file
+
+        self.mappings.append(mapping)
+
+        return mapping, True, None
 
-        return token
+    def _error(self, message, offset):
+        """Return a LexerException for the offset."""
+        return LexerException("Lexing Error (File {}) (Line {}) (Column {}): {}"
+                              .format(self.filename, self.source.line(offset), self.source.column(offset), message))
 
     def _tokens(self):
         """Return all tokens."""
-        current_token = self._next_token()
+        symbols = self.SYMBOLS
+        operators = self.OPERATORS
 
-        while current_token is not None:
-            # If the current token is a comment, skips the yield
-            if current_token:
-                yield current_token
-            current_token = self._next_token()
+        buffer, final, stream = self._open()
 
-        # Appends the EOF token
-        yield Token(Token.EOF, None, self.filename, self.line)
+        # A mapped or in-memory source is kept whole, a streamed one only gets its lines counted as it's read
+        if stream is None and self.line is None:
+            source = self.source = Source(self.filename, buffer)
+        else:
+            source = self.source = Source(self.filename, buffer if stream is None else None, self.position,
+                                          self.line or 1, self.column)
+
+        if stream is not None:
+            source.feed(buffer)
+
+        binary = not isinstance(buffer, str)
+        match = (self.BINARY_PATTERN if binary else self.TEXT_PATTERN).match
+        quotation_mark, dot, newlines = (b"\"", b".", (b"\n", b"\r")) if binary else ("\"", ".", ("\n", "\r"))
+
+        # Offset of the start of the buffer in the whole source
+        base = 0 if stream is None else self.position
+        position = self.position if stream is None else 0
+        end = len(buffer)
+        last = buffer[end - 1:end]
+
+        try:
+            while True:
+                found = match(buffer, position) if position < end else None
+
+                # A token ending next to the end of the buffer might continue in the next chunk (1. and 1.5)
+                if not final and (found is None or found.end() + 1 >= end):
+                    chunk = stream.read(max(self.CHUNK_SIZE, end - position))
+                    source.feed(chunk)
+                    buffer = buffer[position:] + chunk
+                    final = not chunk
+                    base += position
+                    position = 0
+                    end = len(buffer)
+                    last = buffer[end - 1:end] or last
+                    continue
+
+                if found is None:
+                    if position == end:
+                        break
+
+                    # Only an unterminated text can start with a quotation mark and still fail to match
+                    if buffer[position:position + 1] == quotation_mark:
+                        raise self._error("Text doesn't have an end", base + position)
+
+                    raise self._error("Unrecognized token", base + position)
+
+                kind = found.lastgroup
+                offset = base + position
+                position = found.end()
+
+                if kind == "SKIP":
+                    # Ignores whitespaces, tabs, newlines and comments
+                    continue
+
+                value = found.group()
+
+                if binary:
+                    value = value.decode()
+
+                if kind == "OPERATOR":
+                    yield Token(operators[value], value, source, offset)
+                elif kind == "SYMBOL":
+                    # If it's not a token comprised of letters, it's a SYMBOL token. Names repeat a lot, so every
+                    # occurrence shares one string
+                    yield Token(symbols.get(value, Token.SYMBOL), intern(value), source, offset)
+                elif kind == "NUMBER":
+                    # A number can't be followed by a dot (2., 1.2.3, etc.)
+                    if buffer[position:position + 1] == dot:
+                        raise self._error("Unrecognized token", offset)
+
+                    yield Token(Token.NUMBER, value, source, offset)
+                else:
+                    if "\r" in value:
+                        value = value.replace("\r\n", "\n").replace("\r", "\n")
+
+                    value = value[1:-1].replace("\\n", "\n").replace("\\t", "\t").replace('\\"', "\"")
+
+                    yield Token(Token.TEXT, value, source, offset)
+        finally:
+            # Only releases the stream opened here, a memory-mapped file stays open for the Source until close()
+            if stream is not None and stream is not self.code:
+                stream.close()
+
+        # The line only changes once there is a character on it
+        yield Token(Token.EOF, None, source, base + end - (last in newlines))
 
     def lex(self):
         """Lex the code.
@@ -376,6 +362,123 @@ class Lexer:
         """
         return self._tokens()
 
+    def lex_buffer(self):
+        """Lex the code into a TokenBuffer.
+
+        Lexes the whole code at once, storing the tokens as parallel arrays instead of separate Token objects.
+
+        """
+        buffer = TokenBuffer(None)
+        append = buffer.append
+
+        # Each token is dropped as soon as its fields are copied into the arrays
+        for token in self._tokens():
+            append(token.type, token.value, token.offset)
+
+        # The source is only known once lexing starts
+        buffer.source = self.source
+
+        return buffer
+
+    def _split(self, buffer, count):
+        """Return where the code can be split into about as many parts, right after a newline outside of texts."""
+        binary = not isinstance(buffer, str)
+        region = (self.BINARY_REGION_PATTERN if binary else self.TEXT_REGION_PATTERN).search
+        newline = (self.BINARY_NEWLINE_PATTERN if binary else self.TEXT_NEWLINE_PATTERN).search
+
+        end = len(buffer)
+        size = end // count
+        boundaries = [0]
+        # Everything before the position is known to be outside of texts and comments
+        position = 0
+        target = size
+
+        while len(boundaries) < count and target < end:
+            found = newline(buffer, target)
+
+            if found is None:
+                break
+
+            # Skips the texts and comments that end before the newline
+            found_region = region(buffer, position)
+
+            while found_region is not None and found_region.end() <= found.start():
+                found_region = region(buffer, found_region.end())
+
+            # The newline is part of a text, so the search goes on after it
+            if found_region is not None and found_region.start() < found.start():
+                position = target = found_region.end()
+                continue
+
+            position = found.end()
+            boundaries.append(position)
+            target = max(position, len(boundaries) * size)
+
+        boundaries.append(end)
+
+        return boundaries
+
+    def lex_parallel(self, processes=None):
+        """Lex the code into a TokenBuffer using multiple processes.
+
+        Splits the code at newlines outside of texts and comments, lexes the parts in a process pool and joins the
+        tokens back together. Code smaller than PARALLEL_SIZE is lexed in this process.
+
+        """
+        processes = processes or os.cpu_count() or 1
+        buffer, final, stream = self._open()
+
+        # The whole code is needed before it can be split
+        if stream is not None:
+            try:
+                buffer = buffer + stream.read() if not final else buffer
+            finally:
+                if stream is not self.code:
+                    stream.close()
+
+        if processes == 1 or len(buffer) < self.PARALLEL_SIZE:
+            self.code = buffer
+            return self.lex_buffer()
+
+        binary = not isinstance(buffer, str)
+        boundaries = self._split(buffer, processes)
+        parts = [bytes(buffer[start:end]) if binary else buffer[start:end]
+                 for start, end in zip(boundaries, boundaries[1:])]
+
+        try:
+            with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+                results = list(executor.map(_lex_part, parts, itertools.repeat(self.filename)))
+        except LexerException:
+            # Lexing again in this process gives the error the right line and column
+            self.code = buffer
+            return self.lex_buffer()
+
+        source = self.source = Source(self.filename, buffer)
+        tokens = TokenBuffer(source)
+
+        for start, (types, values, offsets) in zip(boundaries, results):
+            tokens.types.extend(types)
+            # Interning is per process, so names are interned again to be shared across the parts
+            tokens.values.extend(map(intern, values))
+            tokens.offsets.extend(offset + start for offset in offsets)
+
+        end = len(buffer)
+        tokens.append(Token.EOF, None, end - (buffer[end - 1:end] in ("\n", "\r", b"\n", b"\r")))
+
+        return tokens
+
+
+def _lex_part(code, filename):
+    """Lex a part of the code, for Lexer.lex_parallel.
+
+    Returns the types, values and offsets of its tokens without the EOF token, as they are cheaper to send between
+    processes than the tokens.
+
+    """
+    tokens = Lexer(code, filename).lex_buffer()
+
+    return tokens.types[:-1], tokens.values[:-1], tokens.offsets[:-1]
+
 
 def main():
     """Debug the lexer.
@@ -2,12 +2,34 @@
 """Implement nemrun command."""
 
 import nem
+import pathlib
 import sys
 
-HELP = """Usage: nemrun [[-h, --help] | [-v, --version] | [-l, --license] | [file]]
+HELP = """Usage: nemrun [[-h, --help] | [-v, --version] | [-l, --license] |
+\t[-O[LEVEL]] [--no-inline] [--engine=ENGINE] [--no-cache] [--emit-python] [file]]
 \t-h, --help\tShow help.
 \t-v, --version\tShow version.
-\t-l, --license\tShow license."""
+\t-l, --license\tShow license.
+\t-O[LEVEL]\tOptimize the AST, by folding constants and dropping dead code
+\t\t\t(1, same as -O) and simplifying arithmetic and inlining small
+\t\t\tfunctions (2).
+\t--no-inline\tDon't inline functions at level 2.
+\t--engine=ENGINE\tEvaluate with the ENGINE, either tree (default), closure, python, vm
+\t\t\tor stack, which makes calls without recursing.
+\t--no-cache\tDon't read or write __nemcache__, same as setting NEMNOCACHE.
+\t--emit-python\tShow the Python the file is transpiled into, instead of running it."""
+
+# Levels of the optimizer, by their option
+LEVELS = {"-O": 1, "-O0": 0, "-O1": 1, "-O2": 2}
+
+# Classes that evaluate the AST, by their name in --engine
+ENGINES = {
+    "tree": nem.evaluator.Evaluator,
+    "closure": nem.closures.ClosureEvaluator,
+    "python": nem.transpiler.PythonEvaluator,
+    "vm": nem.vm.VirtualMachine,
+    "stack": nem.stack_evaluator.StackEvaluator
+}
 
 VERSION = """Nem 1.0.0 [<insert commit>] 5/1/2020"""
 
@@ -38,14 +60,48 @@ def script():
     """Evaluate the argument variables."""
     del sys.argv[0]
 
+    engine = ENGINES["tree"]
+    emit = False
+
+    while len(sys.argv) > 0 and (sys.argv[0].startswith(("--engine=", "-O")) or
+                                 sys.argv[0] in ("--no-inline", "--no-cache", "--emit-python")):
+        if sys.argv[0].startswith("-O"):
+            if sys.argv[0] not in LEVELS:
+                print("Unknown optimization level '{}'\n{}".format(sys.argv[0][len("-O"):], HELP))
+                return
+
+            # Optimizes the imports as well
+            nem.optimizer.Optimizer.LEVEL = LEVELS[sys.argv.pop(0)]
+        elif sys.argv[0] == "--no-inline":
+            nem.optimizer.Optimizer.INLINE = False
+            sys.argv.pop(0)
+        elif sys.argv[0] == "--no-cache":
+            # Turns off the cache of the imports as well
+            nem.cache.Cache.ENABLED = False
+            sys.argv.pop(0)
+        elif sys.argv[0] == "--emit-python":
+            emit = True
+            sys.argv.pop(0)
+        elif sys.argv[0][len("--engine="):] not in ENGINES:
+            print("Unknown engine '{}'\n{}".format(sys.argv[0][len("--engine="):], HELP))
+            return
+        else:
+            engine = ENGINES[sys.argv.pop(0)[len("--engine="):]]
+
     if len(sys.argv) == 0 or sys.argv[0] in ("-h", "--help"):
         print(HELP)
     elif len(sys.argv) > 0 and sys.argv[0] in ("-v", "--version"):
         print("Nem 1.0.0 5/1/2020")
     elif len(sys.argv) > 0 and sys.argv[0] in ("-l", "--license"):
         print(LICENSE)
+    elif emit:
+        with nem.lexer.Lexer(pathlib.Path(sys.argv[0]), sys.argv[0]) as lexer:
+            for source in nem.transpiler.Transpiler().emit(
+                    nem.optimizer.Optimizer().optimize(nem.parser.Parser(lexer.lex()).parse())):
+                print(source, end="\n\n")
     else:
-        with open(sys.argv[0]) as code:
+        # Opened in binary mode, so the code is hashed and lexed without decoding all of it up front
+        with open(sys.argv[0], "rb") as code:
             # Built-in variables and functions
             symbol_table = nem.symbol_table.SymbolTable()
             symbol_table.set("true", nem.types_.Number(1))
@@ -54,4 +110,10 @@ def script():
             symbol_table.set("input", nem.types_.BuiltInFunction([], 1))
             symbol_table.set("convert", nem.types_.BuiltInFunction(["value", "type"], 2))
 
-            nem.interpreter.Interpreter(code.read(), sys.argv[0], symbol_table)
+            # The stack engine parses without recursing as well, so the depth of the code is limited by neither
+            if engine is nem.stack_evaluator.StackEvaluator:
+                parser = nem.stack_parser.StackParser
+            else:
+                parser = nem.parser.Parser
+
+            nem.interpreter.Interpreter(code, sys.argv[0], symbol_table, parser=parser, cache=True, evaluator=engine)
@@ -13,14 +13,87 @@ class Node:
 
     """
 
-    line = None
-    filename = None
+    # Position of the node, as an offset into its Source, which is shared by all the nodes of a file and holds its name
+    __slots__ = ("source", "offset")
+
+    def _location(self):
+        """Return the source and the offset of the node, or None if it wasn't parsed and isn't located."""
+        try:
+            return self.source, self.offset
+        except AttributeError:
+            return None
+
+    @property
+    def filename(self):
+        """Return the name of the file the node is in."""
+        location = self._location()
+        return location[0].filename if location is not None else None
+
+    @property
+    def line(self):
+        """Return the line of the node."""
+        location = self._location()
+        return location[0].line(location[1]) if location is not None else None
+
+    @property
+    def column(self):
+        """Return the column of the node."""
+        location = self._location()
+        return location[0].column(location[1]) if location is not None else None
+
+    def fields(self):
+        """Return the names of the attributes of the node, other than its location."""
+        return type(self).__slots__
 
     def __eq__(self, other):
-        """Compare equality of classes."""
+        """Compare equality of classes.
+
+        Nodes are located by their file and line, like they were before they kept an offset, so the nodes of two parses
+        of the same code are equal even though each parse has its own Source.
+
+        """
         if not isinstance(other, Node):
             raise NotImplementedError
-        return type(self) == type(other) and self.__dict__ == other.__dict__
+        return type(self) == type(other) and self.filename == other.filename and self.line == other.line and \
+            all(getattr(self, field) == getattr(other, field) for field in self.fields())
+
+
+class Named(Node):
+
+    """Hold template for nodes that name a variable.
+
+    Template for nodes that name a variable. The resolver puts the variable in a slot of the frame of the function the
+    node is in, which isn't one of the fields of the node. The slot isn't pickled, it's only valid for the frame.
+
+    """
+
+    __slots__ = ("layout", "slot")
+
+    def __getstate__(self):
+        """Return the attributes of the node, without its slot."""
+        temporary_state = {name: getattr(self, name) for name in Node.__slots__ + self.fields() if hasattr(self, name)}
+        temporary_state["layout"] = temporary_state["slot"] = None
+
+        return None, temporary_state
+
+
+class Cached(Node):
+
+    """Hold template for nodes with an inline cache.
+
+    Template for nodes that keep what the evaluator learned from evaluating them, which isn't one of the fields of the
+    node. The cache isn't pickled, it's learned again once the node is evaluated.
+
+    """
+
+    __slots__ = ("cache",)
+
+    def __getstate__(self):
+        """Return the attributes of the node, without its cache."""
+        temporary_state = {name: getattr(self, name) for name in Node.__slots__ + self.fields() if hasattr(self, name)}
+        temporary_state["cache"] = None
+
+        return None, temporary_state
 
 
 class Number(Node):
@@ -31,6 +104,8 @@ class Number(Node):
 
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         """Initialize Number class."""
         self.value = value
@@ -40,7 +115,7 @@ class Number(Node):
         return "Number({})".format(repr(self.value))
 
 
-class Variable(Node):
+class Variable(Named):
 
     """Hold a variable.
 
@@ -48,9 +123,12 @@ class Variable(Node):
 
     """
 
+    __slots__ = ("variable",)
+
     def __init__(self, variable):
         """Initialize Variable class."""
         self.variable = variable
+        self.layout = self.slot = None
 
     def __repr__(self):
         """Represent Variable class."""
@@ -65,6 +143,8 @@ class Text(Node):
 
     """
 
+    __slots__ = ("text",)
+
     def __init__(self, text):
         """Initialize Text class."""
         self.text = text
@@ -82,6 +162,8 @@ class List(Node):
 
     """
 
+    __slots__ = ("elements",)
+
     def __init__(self, elements):
         """Initialize List class."""
         self.elements = elements
@@ -99,6 +181,8 @@ class ListIndex(Node):
 
     """
 
+    __slots__ = ("holder", "index")
+
     def __init__(self, holder, index):
         """Initialize ListIndex class."""
         self.holder = holder
@@ -117,6 +201,8 @@ class Expressions(Node):
 
     """
 
+    __slots__ = ("expressions",)
+
     def __init__(self, expressions):
         """Initialize Expressions class."""
         self.expressions = expressions
@@ -134,6 +220,8 @@ class UnaryOperation(Node):
 
     """
 
+    __slots__ = ("node", "operator")
+
     def __init__(self, node, operator):
         """Initialize UnaryOperation class."""
         self.node = node
@@ -144,7 +232,7 @@ class UnaryOperation(Node):
         return "UnaryOperation({}, {})".format(repr(self.node), repr(self.operator))
 
 
-class BinaryOperation(Node):
+class BinaryOperation(Cached):
 
     """Hold a binary operation.
 
@@ -152,18 +240,21 @@ class BinaryOperation(Node):
 
     """
 
+    __slots__ = ("left_node", "operator", "right_node")
+
     def __init__(self, left_node, operator, right_node):
         """Initialize BinaryOperation class."""
         self.left_node = left_node
         self.operator = operator
         self.right_node = right_node
+        self.cache = None
 
     def __repr__(self):
         """Represent BinaryOperation class."""
         return "BinaryOperation({}, {}, {})".format(repr(self.left_node), repr(self.operator), repr(self.right_node))
 
 
-class AssignmentOperation(Node):
+class AssignmentOperation(Named):
 
     """Hold an assignment operation.
 
@@ -171,10 +262,13 @@ class AssignmentOperation(Node):
 
     """
 
+    __slots__ = ("variable", "value")
+
     def __init__(self, variable, value):
         """Initialize AssignmentOperation class."""
         self.variable = variable
         self.value = value
+        self.layout = self.slot = None
 
     def __repr__(self):
         """Represent AssignmentOperation class."""
@@ -189,6 +283,8 @@ class IfOtherwise(Node):
 
     """
 
+    __slots__ = ("condition", "if_expression", "otherwise_expression")
+
     def __init__(self, condition, if_expression, otherwise_expression=None):
         """Initialize IfOtherwise class."""
         self.condition = condition
@@ -201,7 +297,7 @@ class IfOtherwise(Node):
                .format(repr(self.condition), repr(self.if_expression), repr(self.otherwise_expression))
 
 
-class While(Node):
+class While(Cached):
 
     """Hold a while loop.
 
@@ -209,17 +305,20 @@ class While(Node):
 
     """
 
+    __slots__ = ("condition", "expression")
+
     def __init__(self, condition, expression):
         """Initialize While class."""
         self.condition = condition
         self.expression = expression
+        self.cache = None
 
     def __repr__(self):
         """Represent While class."""
         return "While({}, {})".format(repr(self.condition), repr(self.expression))
 
 
-class FunctionDefinition(Node):
+class FunctionDefinition(Named):
 
     """Hold a function definition.
 
@@ -227,18 +326,21 @@ class FunctionDefinition(Node):
 
     """
 
+    __slots__ = ("name", "parameters", "expression")
+
     def __init__(self, name, parameters, expression):
         """Initialize FunctionDefinition class."""
         self.name = name
         self.parameters = parameters
         self.expression = expression
+        self.layout = self.slot = None
 
     def __repr__(self):
         """Represent FunctionDefinition class."""
         return "FunctionDefinition({}, {}, {})".format(repr(self.name), repr(self.parameters), repr(self.expression))
 
 
-class FunctionCall(Node):
+class FunctionCall(Named):
 
     """Hold a function call.
 
@@ -246,10 +348,13 @@ class FunctionCall(Node):
 
     """
 
+    __slots__ = ("name", "arguments")
+
     def __init__(self, name, arguments):
         """Initialize FunctionCall class."""
         self.name = name
         self.arguments = arguments
+        self.layout = self.slot = None
 
     def __repr__(self):
         """Represent FunctionCall class."""
@@ -260,6 +365,30 @@ class FunctionCall(Node):
         return hash("{}{}".format(self.name, self.arguments))
 
 
+class InlineCall(Node):
+
+    """Hold a call of a function known where it's called.
+
+    Holds the name, the parameters and the body of the function, which the optimizer inlines from its definition, along
+    with the arguments of the call. It's called like the function, in a frame of its own, without looking it up.
+
+    """
+
+    __slots__ = ("name", "parameters", "expression", "arguments")
+
+    def __init__(self, name, parameters, expression, arguments):
+        """Initialize InlineCall class."""
+        self.name = name
+        self.parameters = parameters
+        self.expression = expression
+        self.arguments = arguments
+
+    def __repr__(self):
+        """Represent InlineCall class."""
+        return "InlineCall({}, {}, {}, {})".format(repr(self.name), repr(self.parameters), repr(self.expression),
+                                                   repr(self.arguments))
+
+
 class Import(Node):
 
     """Hold an import.
@@ -268,6 +397,8 @@ class Import(Node):
 
     """
 
+    __slots__ = ("file",)
+
     def __init__(self, file):
         """Initialize Import class."""
         self.file = file
@@ -285,6 +416,8 @@ class Return(Node):
 
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value):
         """Initialize Return class."""
         self.value = value
@@ -302,6 +435,8 @@ class Continue(Node):
 
     """
 
+    __slots__ = ()
+
     def __repr__(self):
         """Represent Continue class."""
         return "Continue()"
@@ -315,6 +450,8 @@ class Break(Node):
 
     """
 
+    __slots__ = ()
+
     def __repr__(self):
         """Represent Break class."""
         return "Break()"
@@ -328,6 +465,8 @@ class Null(Node):
 
     """
 
+    __slots__ = ()
+
     def __repr__(self):
         """Represent Null class."""
         return "Null()"
@@ -0,0 +1,497 @@
+"""Hold Optimizer class.
+
+Holds the Optimizer class which rewrites the Abstract Syntax Tree created by the parser into one that evaluates to the
+same values with less work.
+
+"""
+
+import copy
+
+import nem.nodes as ast
+import nem.symbol_table
+import nem.types_ as value
+
+
+class Optimizer:
+
+    """Optimize the AST.
+
+    Used between the parser and the evaluator. Level 1 folds the operations, indexes and lists of literals into the
+    literal they evaluate to, and drops the code that's never evaluated or whose value is never used: the expressions
+    after a return, continue or break, the branch an if with a literal condition doesn't take, a while with a false
+    literal condition and the literals in the middle of brackets. Level 2 also drops the operations that don't change
+    a number, like x + 0 or x ^ 1, and turns the ones that only negate it, like 0 - x or -1 * x, into a negation.
+
+    Nothing gets folded when it gives an error, so the error is still raised when, and only if, the code is evaluated.
+    Operands that aren't known to be numbers are left alone, since x + 0 is an error for text and x * 1 is the list
+    itself. The nodes of the AST aren't changed, the ones that are optimized get copied, so an AST can be cached or
+    evaluated without the optimizer after it's optimized.
+
+    x ^ 2 isn't turned into x * x. It would evaluate x twice, and for big numbers ^ is an error while * is infinity.
+
+    Level 2 also inlines the calls of small functions, defined once at the top level of the code and never named in
+    their own body, with a name nothing else in the code assigns or takes as a parameter, and no imports. Scoping is
+    dynamic, so the inlined body still gets its own frame, for its parameters, variables and return, but the function
+    isn't looked up, nor its arity checked. Code that isn't in the AST, like the code that imports it, isn't seen, so
+    the Interpreter doesn't inline imported code. The symbol table is the one the code is evaluated in, whose functions
+    take parameters that can shadow a function as well.
+
+    """
+
+    # Level nemrun sets with -O, which is also used for the imports
+    LEVEL = 0
+
+    # Largest text or list that gets folded, so folding doesn't make the AST bigger than the code
+    LIMIT = 1 << 10
+
+    # Whether level 2 inlines functions, which nemrun turns off with --no-inline
+    INLINE = True
+
+    # Most nodes in the body of a function that gets inlined
+    BUDGET = 32
+
+    LITERALS = (ast.Number, ast.Text, ast.Null)
+
+    def __init__(self, level=None, inline=None, symbol_table=None):
+        """Initialize Optimizer class."""
+        self.level = self.LEVEL if level is None else level
+        self.inline = self.INLINE if inline is None else inline
+        self.symbol_table = symbol_table
+
+        # Names of the functions that can be inlined, and the definitions of the ones defined so far
+        self.names = set()
+        self.functions = {}
+
+    def optimize(self, abstract_syntax_tree):
+        """Yield the optimized nodes, each one as soon as it's parsed.
+
+        To inline, all of the names in the code have to be known first, so the nodes are only optimized once all of them
+        are parsed, or the ones before the error that stops the parser, which is raised after they're yielded.
+
+        """
+        if self.level < 1:
+            yield from abstract_syntax_tree
+            return
+
+        temporary_error = None
+
+        if self.level > 1 and self.inline:
+            temporary_nodes = []
+
+            try:
+                for node in abstract_syntax_tree:
+                    temporary_nodes.append(node)
+            except Exception as error:
+                temporary_error = error
+
+            self.names = self._names(temporary_nodes)
+            abstract_syntax_tree = temporary_nodes
+
+        for node in abstract_syntax_tree:
+            node = self.optimize_node(node)
+
+            # A function is only inlined in the code after its definition
+            if isinstance(node, ast.FunctionDefinition) and node.name in self.names and self._inlinable(node):
+                self.functions[node.name] = node
+
+            yield node
+
+        if temporary_error is not None:
+            raise temporary_error
+
+    def optimize_node(self, node):
+        """Optimize a node after its children, so it's folded once all of them are."""
+        # Walked with a stack, since code can be nested deeper than Python recurses
+        temporary_stack = [(node, False)]
+        temporary_optimized = []
+
+        while temporary_stack:
+            node, temporary_visited = temporary_stack.pop()
+            temporary_children = self._children(node)
+
+            if not temporary_visited:
+                temporary_stack.append((node, True))
+                temporary_stack.extend((child, False) for child in reversed(temporary_children))
+                continue
+
+            # The children are optimized by now, in the order of the fields they're in
+            temporary_nodes = iter(temporary_optimized[len(temporary_optimized) - len(temporary_children):])
+            del temporary_optimized[len(temporary_optimized) - len(temporary_children):]
+
+            temporary_optimized.append(self._optimize(node, temporary_nodes))
+
+        return temporary_optimized[0]
+
+    def _optimize(self, node, temporary_nodes):
+        """Optimize a node, once the nodes in its fields are optimized into the temporary nodes."""
+        temporary_fields = {}
+
+        for field in node.fields():
+            temporary_child = getattr(node, field)
+
+            if isinstance(temporary_child, ast.Node):
+                temporary_optimized = next(temporary_nodes)
+            elif isinstance(temporary_child, list):
+                temporary_optimized = [next(temporary_nodes) if isinstance(element, ast.Node) else element
+                                       for element in temporary_child]
+
+                if all(new is old for new, old in zip(temporary_optimized, temporary_child)):
+                    temporary_optimized = temporary_child
+            else:
+                continue
+
+            if temporary_optimized is not temporary_child:
+                temporary_fields[field] = temporary_optimized
+
+        if temporary_fields:
+            node = copy.copy(node)
+
+            for field, temporary_child in temporary_fields.items():
+                setattr(node, field, temporary_child)
+
+        method = getattr(self, "_optimize_" + type(node).__name__.lower(), None)
+
+        return node if method is None else method(node)
+
+    def _optimize_unaryoperation(self, node):
+        """Optimize UnaryOperation node."""
+        if self._literal(node.node):
+            return self._fold(node)
+
+        temporary_operand = self._operand(node.node)
+
+        # -(-x) is x
+        if self.level > 1 and node.operator == "-" and isinstance(temporary_operand, ast.UnaryOperation) and \
+                temporary_operand.operator == "-" and self._number(temporary_operand.node):
+            return temporary_operand.node
+
+        return node
+
+    def _optimize_binaryoperation(self, node):
+        """Optimize BinaryOperation node."""
+        if self._literal(node.left_node) and self._literal(node.right_node):
+            if node.operator == "*" and not self._small(node.left_node, node.right_node):
+                return node
+
+            return self._fold(node)
+
+        if self.level < 2:
+            return node
+
+        left, operator, right = node.left_node, node.operator, node.right_node
+
+        if self._number(left):
+            if operator in ("+", "-") and self._equals(right, 0) or \
+                    operator in ("*", "/", "^") and self._equals(right, 1):
+                return left
+
+            if operator == "^" and self._equals(right, 0):
+                return self._locate(ast.Expressions([left, ast.Number("1")]), node)
+
+            if operator == "*" and self._equals(right, -1):
+                return self._locate(ast.UnaryOperation(left, "-"), node)
+
+        if self._number(right):
+            if operator == "+" and self._equals(left, 0) or operator == "*" and self._equals(left, 1):
+                return right
+
+            if operator == "-" and self._equals(left, 0) or operator == "*" and self._equals(left, -1):
+                return self._locate(ast.UnaryOperation(right, "-"), node)
+
+        return node
+
+    def _optimize_expressions(self, node):
+        """Optimize Expressions node."""
+        temporary_expressions = []
+
+        for expression in node.expressions:
+            # Brackets in brackets only group the expressions
+            if isinstance(expression, ast.Expressions) and expression.expressions:
+                temporary_expressions.extend(expression.expressions)
+            else:
+                temporary_expressions.append(expression)
+
+        for index, expression in enumerate(temporary_expressions):
+            if isinstance(expression, (ast.Return, ast.Continue, ast.Break)):
+                del temporary_expressions[index + 1:]
+                break
+
+        # Only the value of the last expression is used
+        temporary_expressions = [expression for expression in temporary_expressions[:-1]
+                                 if not self._literal(expression)] + temporary_expressions[-1:]
+
+        if len(temporary_expressions) == len(node.expressions) and \
+                all(new is old for new, old in zip(temporary_expressions, node.expressions)):
+            return node
+
+        return self._locate(ast.Expressions(temporary_expressions), node)
+
+    def _optimize_ifotherwise(self, node):
+        """Optimize IfOtherwise node."""
+        temporary_condition = self._constant(node.condition)
+
+        if temporary_condition is None:
+            return node
+
+        temporary_branch = node.if_expression if temporary_condition.value else node.otherwise_expression
+
+        if temporary_branch is None:
+            return self._locate(ast.Null(), node)
+
+        # An if gives null, unless the branch returns, continues or breaks
+        return self._optimize_expressions(self._locate(ast.Expressions([temporary_branch, ast.Null()]), node))
+
+    def _optimize_while(self, node):
+        """Optimize While node."""
+        temporary_condition = self._constant(node.condition)
+
+        if temporary_condition is not None and not temporary_condition.value:
+            return self._locate(ast.Null(), node)
+
+        return node
+
+    def _optimize_functioncall(self, node):
+        """Optimize FunctionCall node."""
+        # The function a call gives is only called when the call isn't inlined
+        if isinstance(node.name, ast.InlineCall):
+            node = copy.copy(node)
+            node.name = self._locate(ast.FunctionCall(node.name.name, node.name.arguments), node.name)
+
+        temporary_function = self.functions.get(node.name) if isinstance(node.name, str) else None
+
+        if temporary_function is None or len(temporary_function.parameters) != len(node.arguments):
+            return node
+
+        return self._locate(ast.InlineCall(node.name, temporary_function.parameters, temporary_function.expression,
+                                           node.arguments), node)
+
+    def _optimize_listindex(self, node):
+        """Optimize ListIndex node."""
+        if self._literal(node.holder) and self._literal(node.index):
+            return self._fold(node)
+
+        return node
+
+    def _names(self, nodes):
+        """Return the names of the functions defined at the top level that nothing else binds."""
+        temporary_bindings = {}
+
+        # The parameters of the functions in the symbol table, like the built-in ones, are set when they're called
+        if self.symbol_table is not None:
+            for temporary_value in self.symbol_table.flatten().values():
+                for parameter in getattr(temporary_value, "parameters", ()):
+                    temporary_bindings[parameter] = 2
+
+        temporary_stack = list(nodes)
+
+        while temporary_stack:
+            node = temporary_stack.pop()
+
+            # An import can bind any name
+            if isinstance(node, ast.Import):
+                return set()
+
+            if isinstance(node, ast.FunctionDefinition) and isinstance(node.name, str):
+                temporary_bindings[node.name] = temporary_bindings.get(node.name, 0) + 1
+            elif isinstance(node, ast.AssignmentOperation):
+                temporary_bindings[node.variable] = 2
+
+            for parameter in getattr(node, "parameters", ()):
+                temporary_bindings[parameter] = 2
+
+            temporary_stack.extend(self._children(node))
+
+        return {node.name for node in nodes
+                if isinstance(node, ast.FunctionDefinition) and temporary_bindings.get(node.name) == 1}
+
+    def _inlinable(self, node):
+        """Return whether the body of the function is within the budget, and doesn't name the function."""
+        temporary_size = 0
+        temporary_stack = [node.expression]
+
+        while temporary_stack:
+            temporary_node = temporary_stack.pop()
+            temporary_size += 1
+
+            if temporary_size > self.BUDGET:
+                return False
+
+            # Recursive functions would be inlined in themselves
+            if isinstance(temporary_node, ast.Variable) and temporary_node.variable == node.name or \
+                    isinstance(temporary_node, ast.FunctionCall) and temporary_node.name is node.name:
+                return False
+
+            temporary_stack.extend(self._children(temporary_node))
+
+        return True
+
+    @staticmethod
+    def _children(node):
+        """Return the nodes in the fields of the node."""
+        temporary_children = []
+
+        for field in node.fields():
+            temporary_child = getattr(node, field)
+
+            if isinstance(temporary_child, ast.Node):
+                temporary_children.append(temporary_child)
+            elif isinstance(temporary_child, list):
+                temporary_children.extend(element for element in temporary_child if isinstance(element, ast.Node))
+
+        return temporary_children
+
+    @staticmethod
+    def _operand(node):
+        """Return the expression in the brackets around an operand, which gives the same value."""
+        while isinstance(node, ast.Expressions) and len(node.expressions) == 1:
+            node = node.expressions[0]
+
+        return node
+
+    def _literal(self, node):
+        """Return whether the node is a literal, including a list of literals."""
+        temporary_stack = [node]
+
+        while temporary_stack:
+            node = self._operand(temporary_stack.pop())
+
+            if isinstance(node, ast.List):
+                temporary_stack.extend(node.elements)
+            elif not isinstance(node, self.LITERALS):
+                return False
+
+        return True
+
+    def _small(self, left, right):
+        """Return whether repeating literal text or a list gives one small enough to fold."""
+        for holder, times in ((left, right), (right, left)):
+            holder, times = self._operand(holder), self._operand(times)
+
+            if isinstance(holder, (ast.Text, ast.List)) and isinstance(times, ast.Number):
+                try:
+                    return len(holder.text if isinstance(holder, ast.Text) else holder.elements) * \
+                        float(times.value) <= self.LIMIT
+                except ValueError:
+                    return False
+
+        return True
+
+    def _number(self, node):
+        """Return whether the node always gives a number, unless it's an error."""
+        node = self._operand(node)
+
+        # Unary operations raise an error for return, continue and break
+        if isinstance(node, (ast.Number, ast.UnaryOperation)):
+            return True
+
+        # Only numbers can be subtracted, divided with a remainder and raised to a power
+        if isinstance(node, ast.BinaryOperation) and node.operator in ("-", "%", "^"):
+            return self._plain(node.left_node) and self._plain(node.right_node)
+
+        return False
+
+    def _plain(self, node):
+        """Return whether the node gives a value, never return, continue or break."""
+        return isinstance(self._operand(node), (ast.Text, ast.Null, ast.Variable, ast.List)) or self._number(node)
+
+    def _equals(self, node, number):
+        """Return whether the node is the number literal."""
+        node = self._operand(node)
+
+        return isinstance(node, ast.Number) and float(node.value) == number
+
+    @staticmethod
+    def _evaluate(node):
+        """Return the value of the node, evaluated without recursing, as literal lists can be nested deeply."""
+        # Imported here, since the evaluators import the optimizer through the interpreter
+        import nem.stack_evaluator
+
+        return next(nem.stack_evaluator.StackEvaluator([node], nem.symbol_table.SymbolTable()).evaluate())
+
+    def _constant(self, node):
+        """Return the value of the node if it's a literal, otherwise None."""
+        if not self._literal(node):
+            return None
+
+        return self._evaluate(self._operand(node))
+
+    def _fold(self, node):
+        """Return the literal the node evaluates to, or the node itself if it gives an error."""
+        try:
+            temporary_value = self._evaluate(node)
+        except Exception:
+            return node
+
+        temporary_literal = self._node(temporary_value)
+
+        return node if temporary_literal is None else self._locate(temporary_literal, node)
+
+    def _node(self, value_):
+        """Return the literal node of the value, or None if it has none or is too big to fold."""
+        # Lists are converted after their elements, with a stack, like the nodes they're folded from
+        temporary_stack = [(value_, False)]
+        temporary_nodes = []
+
+        while temporary_stack:
+            value_, temporary_visited = temporary_stack.pop()
+
+            if isinstance(value_, value.Number):
+                temporary_nodes.append(ast.Number(repr(value_.value)))
+            elif isinstance(value_, value.Text) and len(value_.value) <= self.LIMIT:
+                temporary_nodes.append(ast.Text(value_.value))
+            elif isinstance(value_, value.Null):
+                temporary_nodes.append(ast.Null())
+            elif isinstance(value_, value.List) and len(value_.value) <= self.LIMIT:
+                if not temporary_visited:
+                    temporary_stack.append((value_, True))
+                    temporary_stack.extend((element, False) for element in reversed(value_.value))
+                    continue
+
+                temporary_elements = temporary_nodes[len(temporary_nodes) - len(value_.value):]
+                del temporary_nodes[len(temporary_nodes) - len(value_.value):]
+
+                if all(element is not None for element in temporary_elements):
+                    temporary_nodes.append(ast.List(temporary_elements))
+                else:
+                    temporary_nodes.append(None)
+            else:
+                temporary_nodes.append(None)
+
+        return temporary_nodes[0]
+
+    @staticmethod
+    def _locate(node, location):
+        """Put the node, and the literals in it, where the node it replaces is."""
+        temporary_location = location._location()
+        temporary_stack = [node]
+
+        while temporary_stack:
+            temporary_node = temporary_stack.pop()
+
+            if temporary_location is not None:
+                temporary_node.source, temporary_node.offset = temporary_location
+
+            if isinstance(temporary_node, ast.List):
+                temporary_stack.extend(temporary_node.elements)
+
+        return node
+
+
+def main():
+    """Debug the optimizer.
+
+    Used as the entry-point when the file gets ran directly. It's usually used for debugging the class Optimizer.
+
+    """
+    optimizer = Optimizer(2)
+
+    while True:
+        print(list(optimizer.optimize(Parser(Lexer(input(">> "), "<stdin>").lex()).parse())))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.lexer import Lexer
+    from nem.parser import Parser
+
+    main()
@@ -46,21 +46,43 @@ class Parser:
 
     """
 
+    # Token types of the operators on each level of precedence
+    POWER_OPERATORS = frozenset((Token.CARET,))
+    SIGNS = frozenset((Token.PLUS, Token.MINUS))
+    TERM_OPERATORS = frozenset((Token.ASTERISK, Token.SLASH))
+    ARITHMETIC_OPERATORS = frozenset((Token.PLUS, Token.MINUS, Token.MODULO))
+    COMPARISON_OPERATORS = frozenset((Token.IS, Token.LESS, Token.LESS_EQUAL, Token.GREATER, Token.GREATER_EQUAL))
+    LOGICAL_OPERATORS = frozenset((Token.AND, Token.OR))
+
     def __init__(self, tokens):
         """Initialize Parser class."""
-        self.tokens = tokens
+        self.tokens = iter(tokens)
 
-        self.current_token = next(tokens)
+        self.current_token = next(self.tokens)
 
     def _advance_index(self):
         """Advance the current token."""
         self.current_token = next(self.tokens)
 
+    def _exception(self, message):
+        """Return a ParserException at the current token."""
+        return ParserException("Parsing Error (File {}) (Line {}) (Column {}): {}"
+                               .format(self.current_token.filename, self.current_token.line, self.current_token.column,
+                                       message))
+
+    @staticmethod
+    def _locate(node, location):
+        """Give the node the position of a token or another node."""
+        node.source = location.source
+        node.offset = location.offset
+
+        return node
+
     def _binary_operation(self, element_left, operations, element_right):
         """Parse a binary operation."""
         temporary = element_left()
 
-        start_line = temporary.line
+        start = temporary
 
         while self.current_token.type in operations:
             temporary_operator = self.current_token.value
@@ -69,12 +91,11 @@ class Parser:
             temporary_right = element_right()
 
             temporary = ast.BinaryOperation(temporary, temporary_operator, temporary_right)
-            temporary.line = start_line
-            temporary.filename = temporary_right.filename
+            self._locate(temporary, start)
 
         return temporary
 
-    def _list_index(self, holder, start_line):
+    def _list_index(self, holder, start):
         """Parse a list index.
 
         Extended Backus-Naur form:
@@ -89,17 +110,18 @@ class Parser:
 
             if self.current_token.type == Token.RIGHT_SQUARE:
                 temporary = ast.ListIndex(holder, temporary_expression)
-                temporary.line = start_line
-                temporary.filename = self.current_token.filename
+                self._locate(temporary, start)
                 self._advance_index()
 
                 return temporary
             else:
-                raise ParserException("Parsing Error (File {}) (Line {}): Expected a closing square bracket"
-                                      .format(self.current_token.filename, self.current_token.line))
+                raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected a closing square bracket"
+                                      .format(self.current_token.filename, self.current_token.line,
+                                              self.current_token.column))
 
-        raise ParserException("Parsing Error (File {}) (Line {}): Expected a list index"
-                              .format(self.current_token.filename, self.current_token.line))
+        raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected a list index"
+                              .format(self.current_token.filename, self.current_token.line,
+                                      self.current_token.column))
 
     def _list(self):
         """Parse a list.
@@ -111,13 +133,12 @@ class Parser:
         # list = LEFT_SQUARE, [ expression, { COMMA, expression } ], RIGHT_SQUARE
         if self.current_token.type == Token.LEFT_SQUARE:
             temporary_elements = []
-            start_line = self.current_token.line
+            start = self.current_token
             self._advance_index()
 
             if self.current_token.type == Token.RIGHT_SQUARE:
                 temporary = ast.List(temporary_elements)
-                temporary.line = start_line
-                temporary.filename = self.current_token.filename
+                self._locate(temporary, start)
                 self._advance_index()
 
                 return temporary
@@ -135,28 +156,29 @@ class Parser:
 
                 if self.current_token.type == Token.RIGHT_SQUARE:
                     temporary = ast.List(temporary_elements)
-                    temporary.line = start_line
-                    temporary.filename = self.current_token.filename
+                    self._locate(temporary, start)
                     self._advance_index()
 
                     return temporary
                 else:
-                    raise ParserException("Parsing Error (File {}) (Line {}): Expected a closing square bracket"
-                                          .format(self.current_token.filename, self.current_token.line))
+                    raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): "
+                                          "Expected a closing square bracket"
+                                          .format(self.current_token.filename, self.current_token.line,
+                                                  self.current_token.column))
 
-        raise ParserException("Parsing Error (File {}) (Line {}): Expected a list"
-                              .format(self.current_token.filename, self.current_token.line))
+        raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected a list"
+                              .format(self.current_token.filename, self.current_token.line,
+                                      self.current_token.column))
 
-    def _function(self):
-        """Parse a function.
+    def _signature(self):
+        """Parse the part of a function before its expression.
 
-        Extended Backus-Naur form:
-            function = FUNCTION, [ SYMBOL ], LEFT_BRACKET, [ SYMBOL, { COMMA, SYMBOL } ], RIGHT_BRACKET, expression ;
+        Returns the first token, the name and the parameters of the function.
 
         """
         # function = FUNCTION, [ SYMBOL ], LEFT_BRACKET, [ SYMBOL, { COMMA, SYMBOL } ], RIGHT_BRACKET, expression ;
         if self.current_token.type == Token.FUNCTION:
-            start_line = self.current_token.line
+            start = self.current_token
             self._advance_index()
 
             if self.current_token.type == Token.SYMBOL:
@@ -172,20 +194,15 @@ class Parser:
                 if self.current_token.type == Token.RIGHT_BRACKET:
                     self._advance_index()
 
-                    temporary_expression = self._expression()
-
-                    temporary = ast.FunctionDefinition(temporary_name, temporary_parameters, temporary_expression)
-                    temporary.line = start_line
-                    temporary.filename = self.current_token.filename
-
-                    return temporary
+                    return start, temporary_name, temporary_parameters
                 else:
                     if self.current_token.type == Token.SYMBOL:
                         temporary_parameters.append(self.current_token.value)
                         self._advance_index()
                     else:
-                        raise ParserException("Parsing Error (File {}) (Line {}): Expected a symbol"
-                                              .format(self.current_token.filename, self.current_token.line))
+                        raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected a symbol"
+                                              .format(self.current_token.filename, self.current_token.line,
+                                                      self.current_token.column))
 
                     while self.current_token.type == Token.COMMA:
                         self._advance_index()
@@ -194,28 +211,43 @@ class Parser:
                             temporary_parameters.append(self.current_token.value)
                             self._advance_index()
                         else:
-                            raise ParserException("Parsing Error (File {}) (Line {}): Expected a symbol"
-                                                  .format(self.current_token.filename, self.current_token.line))
+                            raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected a symbol"
+                                                  .format(self.current_token.filename, self.current_token.line,
+                                                          self.current_token.column))
 
                     if self.current_token.type == Token.RIGHT_BRACKET:
                         self._advance_index()
 
-                        temporary_expression = self._expression()
-
-                        temporary = ast.FunctionDefinition(temporary_name, temporary_parameters, temporary_expression)
-                        temporary.line = start_line
-                        temporary.filename = temporary_expression.filename
-
-                        return temporary
+                        return start, temporary_name, temporary_parameters
                     else:
-                        raise ParserException("Parsing Error (File {}) (Line {}): Expected a closing bracket"
-                                              .format(self.current_token.filename, self.current_token.line))
+                        raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): "
+                                              "Expected a closing bracket"
+                                              .format(self.current_token.filename, self.current_token.line,
+                                                      self.current_token.column))
             else:
-                raise ParserException("Parsing Error (File {}) (Line {}): Expected an open bracket"
-                                      .format(self.current_token.filename, self.current_token.line))
+                raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected an open bracket"
+                                      .format(self.current_token.filename, self.current_token.line,
+                                              self.current_token.column))
 
-        raise ParserException("Parsing Error (File {}) (Line {}): Expected a function definition"
-                              .format(self.current_token.filename, self.current_token.line))
+        raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected a function definition"
+                              .format(self.current_token.filename, self.current_token.line,
+                                      self.current_token.column))
+
+    def _function(self):
+        """Parse a function.
+
+        Extended Backus-Naur form:
+            function = FUNCTION, [ SYMBOL ], LEFT_BRACKET, [ SYMBOL, { COMMA, SYMBOL } ], RIGHT_BRACKET, expression ;
+
+        """
+        start, temporary_name, temporary_parameters = self._signature()
+
+        temporary_expression = self._expression()
+
+        temporary = ast.FunctionDefinition(temporary_name, temporary_parameters, temporary_expression)
+        self._locate(temporary, start)
+
+        return temporary
 
     def _arguments(self, holder):
         """Parse arguments.
@@ -232,15 +264,13 @@ class Parser:
             if self.current_token.type == Token.RIGHT_BRACKET:
                 try:
                     temporary = ast.FunctionCall(holder.value, temporary_arguments)
-                    temporary.line = holder.line
-                    temporary.filename = self.current_token.filename
+                    self._locate(temporary, holder)
                     self._advance_index()
 
                     return temporary
                 except AttributeError:
                     temporary = ast.FunctionCall(holder, temporary_arguments)
-                    temporary.line = holder.line
-                    temporary.filename = self.current_token.filename
+                    self._locate(temporary, holder)
                     self._advance_index()
 
                     return temporary
@@ -255,18 +285,23 @@ class Parser:
                     temporary_arguments.append(temporary_expression)
 
                 if self.current_token.type == Token.RIGHT_BRACKET:
+                    # Only a symbol can be called with arguments
+                    if not isinstance(holder, Token):
+                        raise self._exception("Expected a symbol to call with arguments")
+
                     temporary = ast.FunctionCall(holder.value, temporary_arguments)
-                    temporary.line = holder.line
-                    temporary.filename = self.current_token.filename
+                    self._locate(temporary, holder)
                     self._advance_index()
 
                     return temporary
                 else:
-                    raise ParserException("Parsing Error (File {}) (Line {}): Expected a closing bracket"
-                                          .format(self.current_token.filename, self.current_token.line))
+                    raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected a closing bracket"
+                                          .format(self.current_token.filename, self.current_token.line,
+                                                  self.current_token.column))
         else:
-            raise ParserException("Parsing Error (File {}) (Line {}): Expected an open bracket"
-                                  .format(self.current_token.filename, self.current_token.line))
+            raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected an open bracket"
+                                  .format(self.current_token.filename, self.current_token.line,
+                                          self.current_token.column))
 
     def _while(self):
         """Parse a while.
@@ -277,7 +312,7 @@ class Parser:
         """
         # while = WHILE, expression, expression ;
         if self.current_token.type == Token.WHILE:
-            start_line = self.current_token.line
+            start = self.current_token
             self._advance_index()
 
             temporary_condition = self._expression()
@@ -285,13 +320,13 @@ class Parser:
             temporary_expression = self._expression()
 
             temporary = ast.While(temporary_condition, temporary_expression)
-            temporary.line = start_line
-            temporary.filename = temporary_expression.filename
+            self._locate(temporary, start)
 
             return temporary
 
-        raise ParserException("Parsing Error (File {}) (Line {}): Expected a while loop"
-                              .format(self.current_token.filename, self.current_token.line))
+        raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected a while loop"
+                              .format(self.current_token.filename, self.current_token.line,
+                                      self.current_token.column))
 
     def _if(self):
         """Parse an if.
@@ -302,7 +337,7 @@ class Parser:
         """
         # if = IF, expression, expression, [ OTHERWISE, expression ] ;
         if self.current_token.type == Token.IF:
-            start_line = self.current_token.line
+            start = self.current_token
             self._advance_index()
 
             temporary_condition = self._expression()
@@ -315,212 +350,219 @@ class Parser:
                 temporary_else_expression = self._expression()
 
                 temporary = ast.IfOtherwise(temporary_condition, temporary_if_expression, temporary_else_expression)
-                temporary.line = start_line
-                temporary.filename = temporary_else_expression.filename
+                self._locate(temporary, start)
 
                 return temporary
             else:
                 temporary = ast.IfOtherwise(temporary_condition, temporary_if_expression)
-                temporary.line = start_line
-                temporary.filename = temporary_if_expression.filename
+                self._locate(temporary, start)
 
                 return temporary
 
-        raise ParserException("Parsing Error (File {}) (Line {}): Expected an if-otherwise statement"
-                              .format(self.current_token.filename, self.current_token.line))
-
-    def _atom(self):
-        """Parse an atom.
-
-        Extended Backus-Naur form:
-            atom = NUMBER
-                 | LEFT_BRACKET, expression, { expression }, RIGHT_BRACKET
-                 | SYMBOL, { arguments }, { list_index }
-                 | if
-                 | while
-                 | function
-                 | TEXT, { list_index }
-                 | list, { list_index }
-                 | RETURN, expression
-                 | CONTINUE
-                 | BREAK
-                 | NULL
-                 | IMPORT, TEXT ;
+        raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected an if-otherwise statement"
+                              .format(self.current_token.filename, self.current_token.line,
+                                      self.current_token.column))
 
-        """
+    def _atom_number(self):
+        """Parse a number atom."""
         # atom = NUMBER ;
-        if self.current_token.type == Token.NUMBER:
-            temporary_number = self.current_token
-            self._advance_index()
+        temporary_number = self.current_token
+        self._advance_index()
 
-            temporary = ast.Number(temporary_number.value)
-            temporary.line = temporary_number.line
-            temporary.filename = temporary_number.filename
+        temporary = ast.Number(temporary_number.value)
+        self._locate(temporary, temporary_number)
 
-            return temporary
+        return temporary
 
+    def _atom_expressions(self):
+        """Parse an expressions atom."""
         # atom = LEFT_BRACKET, expression, { expression }, RIGHT_BRACKET ;
-        elif self.current_token.type == Token.LEFT_BRACKET:
-            temporary_expressions = []
-            start_line = self.current_token.line
-            self._advance_index()
+        temporary_expressions = []
+        start = self.current_token
+        self._advance_index()
 
-            temporary_expression = self._expression()
+        temporary_expression = self._expression()
 
-            temporary_expressions.append(temporary_expression)
+        temporary_expressions.append(temporary_expression)
 
-            while self.current_token.type != Token.RIGHT_BRACKET:
-                temporary_expression = self._expression()
+        while self.current_token.type != Token.RIGHT_BRACKET:
+            temporary_expression = self._expression()
 
-                temporary_expressions.append(temporary_expression)
+            temporary_expressions.append(temporary_expression)
 
-            self._advance_index()
+        self._advance_index()
 
-            temporary = ast.Expressions(temporary_expressions)
-            temporary.line = start_line
-            temporary.filename = temporary_expression.filename
+        temporary = ast.Expressions(temporary_expressions)
+        self._locate(temporary, start)
 
-            return temporary
+        return temporary
 
+    def _atom_symbol(self):
+        """Parse a symbol atom."""
         # atom = SYMBOL, { arguments }, { list_index } ;
-        elif self.current_token.type == Token.SYMBOL:
-            temporary_symbol = self.current_token
-            temporary_call = temporary_symbol
-            self._advance_index()
-
-            while self.current_token.type == Token.LEFT_BRACKET:
-                temporary_call = self._arguments(temporary_call)
-
-            while self.current_token.type == Token.LEFT_SQUARE:
-                try:
-                    temporary_call = self._list_index(ast.Variable(temporary_call.value), temporary_call.line)
-                except AttributeError:
-                    temporary_call = self._list_index(temporary_call, temporary_call.line)
-
-            if type(temporary_call) in (ast.ListIndex, ast.FunctionCall):
-                temporary = temporary_call
-                temporary.line = temporary_call.line
-                temporary.filename = temporary_call.filename
-
-                return temporary
-            else:
-                temporary = ast.Variable(temporary_call.value)
-                temporary.line = temporary_call.line
-                temporary.filename = temporary_call.filename
-
-                return temporary
+        temporary_symbol = self.current_token
+        temporary_call = temporary_symbol
+        self._advance_index()
 
-        # atom = if ;
-        elif self.current_token.type == Token.IF:
-            temporary = self._if()
+        while self.current_token.type == Token.LEFT_BRACKET:
+            temporary_call = self._arguments(temporary_call)
 
-            return temporary
+        while self.current_token.type == Token.LEFT_SQUARE:
+            try:
+                temporary_call = self._list_index(self._locate(ast.Variable(temporary_call.value), temporary_call),
+                                                 temporary_call)
+            except AttributeError:
+                temporary_call = self._list_index(temporary_call, temporary_call)
 
-        # atom = while ;
-        elif self.current_token.type == Token.WHILE:
-            temporary = self._while()
+        if type(temporary_call) in (ast.ListIndex, ast.FunctionCall):
+            temporary = temporary_call
+            self._locate(temporary, temporary_call)
 
             return temporary
-
-        # atom = function ;
-        elif self.current_token.type == Token.FUNCTION:
-            temporary = self._function()
+        else:
+            temporary = ast.Variable(temporary_call.value)
+            self._locate(temporary, temporary_call)
 
             return temporary
 
+    def _atom_text(self):
+        """Parse a text atom."""
         # atom = TEXT, { list_index } ;
-        elif self.current_token.type == Token.TEXT:
-            temporary_text = self.current_token
-            self._advance_index()
+        temporary_text = self.current_token
+        self._advance_index()
 
-            while self.current_token.type == Token.LEFT_SQUARE:
-                try:
-                    temporary_text = self._list_index(ast.Text(temporary_text.value), temporary_text.line)
-                except AttributeError:
-                    temporary_text = self._list_index(temporary_text, temporary_text.line)
+        while self.current_token.type == Token.LEFT_SQUARE:
+            try:
+                temporary_text = self._list_index(self._locate(ast.Text(temporary_text.value), temporary_text),
+                                                 temporary_text)
+            except AttributeError:
+                temporary_text = self._list_index(temporary_text, temporary_text)
 
-            if isinstance(temporary_text, ast.ListIndex):
-                temporary = temporary_text
+        if isinstance(temporary_text, ast.ListIndex):
+            temporary = temporary_text
 
-                return temporary
-            else:
-                temporary = ast.Text(temporary_text.value)
-                temporary.line = temporary_text.line
-                temporary.filename = temporary_text.filename
+            return temporary
+        else:
+            temporary = ast.Text(temporary_text.value)
+            self._locate(temporary, temporary_text)
 
-                return temporary
+            return temporary
 
+    def _atom_list(self):
+        """Parse a list atom."""
         # atom = list, { list_index } ;
-        elif self.current_token.type == Token.LEFT_SQUARE:
-            temporary_list = self._list()
+        temporary_list = self._list()
 
-            while self.current_token.type == Token.LEFT_SQUARE:
-                temporary_list = self._list_index(temporary_list, temporary_list.line)
+        while self.current_token.type == Token.LEFT_SQUARE:
+            temporary_list = self._list_index(temporary_list, temporary_list)
 
-            temporary = temporary_list
+        temporary = temporary_list
 
-            return temporary
+        return temporary
 
+    def _atom_return(self):
+        """Parse a return atom."""
         # atom = RETURN, expression ;
-        elif self.current_token.type == Token.RETURN:
-            start_line = self.current_token.line
-            self._advance_index()
+        start = self.current_token
+        self._advance_index()
 
-            temporary_expression = self._expression()
+        temporary_expression = self._expression()
 
-            temporary = ast.Return(temporary_expression)
-            temporary.line = start_line
-            temporary.filename = temporary_expression.filename
+        temporary = ast.Return(temporary_expression)
+        self._locate(temporary, start)
 
-            return temporary
+        return temporary
 
+    def _atom_continue(self):
+        """Parse a continue atom."""
         # atom = CONTINUE ;
-        elif self.current_token.type == Token.CONTINUE:
-            temporary = ast.Continue()
-            temporary.line = self.current_token.line
-            temporary.filename = self.current_token.filename
-            self._advance_index()
+        temporary = ast.Continue()
+        self._locate(temporary, self.current_token)
+        self._advance_index()
 
-            return temporary
+        return temporary
 
+    def _atom_break(self):
+        """Parse a break atom."""
         # atom = BREAK ;
-        elif self.current_token.type == Token.BREAK:
-            temporary = ast.Break()
-            temporary.line = self.current_token.line
-            temporary.filename = self.current_token.filename
-            self._advance_index()
+        temporary = ast.Break()
+        self._locate(temporary, self.current_token)
+        self._advance_index()
 
-            return temporary
+        return temporary
 
+    def _atom_null(self):
+        """Parse a null atom."""
         # atom = NULL ;
-        elif self.current_token.type == Token.NULL:
-            temporary = ast.Null()
-            temporary.line = self.current_token.line
-            temporary.filename = self.current_token.filename
-            self._advance_index()
+        temporary = ast.Null()
+        self._locate(temporary, self.current_token)
+        self._advance_index()
 
-            return temporary
+        return temporary
 
+    def _atom_import(self):
+        """Parse an import atom."""
         # atom = IMPORT, TEXT ;
-        elif self.current_token.type == Token.IMPORT:
-            start_line = self.current_token.line
+        start = self.current_token
+        self._advance_index()
+
+        if self.current_token.type == Token.TEXT:
+            temporary_text = self.current_token
             self._advance_index()
 
-            if self.current_token.type == Token.TEXT:
-                temporary_text = self.current_token
-                self._advance_index()
+            temporary = ast.Import(temporary_text.value)
+            self._locate(temporary, start)
 
-                temporary = ast.Import(temporary_text.value)
-                temporary.line = start_line
-                temporary.filename = temporary_text.filename
+            return temporary
+        else:
+            raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected nem file"
+                                  .format(self.current_token.filename, self.current_token.line,
+                                          self.current_token.column))
+
+    # Atom parsers, looked up by the type of the first token of the atom
+    ATOMS = {
+        Token.NUMBER: _atom_number,
+        Token.LEFT_BRACKET: _atom_expressions,
+        Token.SYMBOL: _atom_symbol,
+        Token.IF: _if,
+        Token.WHILE: _while,
+        Token.FUNCTION: _function,
+        Token.TEXT: _atom_text,
+        Token.LEFT_SQUARE: _atom_list,
+        Token.RETURN: _atom_return,
+        Token.CONTINUE: _atom_continue,
+        Token.BREAK: _atom_break,
+        Token.NULL: _atom_null,
+        Token.IMPORT: _atom_import
+    }
 
-                return temporary
-            else:
-                raise ParserException("Parsing Error (File {}) (Line {}): Expected nem file"
-                                      .format(self.current_token.filename, self.current_token.line))
+    def _atom(self):
+        """Parse an atom.
+
+        Extended Backus-Naur form:
+            atom = NUMBER
+                 | LEFT_BRACKET, expression, { expression }, RIGHT_BRACKET
+                 | SYMBOL, { arguments }, { list_index }
+                 | if
+                 | while
+                 | function
+                 | TEXT, { list_index }
+                 | list, { list_index }
+                 | RETURN, expression
+                 | CONTINUE
+                 | BREAK
+                 | NULL
+                 | IMPORT, TEXT ;
+
+        """
+        try:
+            temporary_atom = self.ATOMS[self.current_token.type]
+        except KeyError:
+            raise ParserException("Parsing Error (File {}) (Line {}) (Column {}): Expected an atom"
+                                  .format(self.current_token.filename, self.current_token.line,
+                                          self.current_token.column))
 
-        raise ParserException("Parsing Error (File {}) (Line {}): Expected an atom"
-                              .format(self.current_token.filename, self.current_token.line))
+        return temporary_atom(self)
 
     def _power(self):
         """Parse a power.
@@ -530,7 +572,7 @@ class Parser:
 
         """
         # power = atom, { CARET, factor } ;
-        temporary = self._binary_operation(self._atom, Token.CARET, self._factor)
+        temporary = self._binary_operation(self._atom, self.POWER_OPERATORS, self._factor)
 
         return temporary
 
@@ -542,15 +584,14 @@ class Parser:
 
         """
         # factor = ( PLUS | MINUS ), power ;
-        if self.current_token.type in (Token.PLUS, Token.MINUS):
+        if self.current_token.type in self.SIGNS:
             temporary_sign = self.current_token
             self._advance_index()
 
             temporary_power = self._power()
 
             temporary = ast.UnaryOperation(temporary_power, temporary_sign.value)
-            temporary.line = temporary_sign.line
-            temporary.filename = temporary_power.filename
+            self._locate(temporary, temporary_sign)
 
             return temporary
 
@@ -567,7 +608,7 @@ class Parser:
 
         """
         # term = factor, { ( ASTERISK | SLASH ), factor } ;
-        temporary = self._binary_operation(self._factor, (Token.ASTERISK, Token.SLASH), self._factor)
+        temporary = self._binary_operation(self._factor, self.TERM_OPERATORS, self._factor)
 
         return temporary
 
@@ -579,7 +620,7 @@ class Parser:
 
         """
         # arithmetic = term, { ( PLUS | MINUS | MODULO ), term } ;
-        temporary = self._binary_operation(self._term, (Token.PLUS, Token.MINUS, Token.MODULO), self._term)
+        temporary = self._binary_operation(self._term, self.ARITHMETIC_OPERATORS, self._term)
 
         return temporary
 
@@ -598,8 +639,7 @@ class Parser:
             temporary_arithmetic = self._arithmetic()
 
             temporary = ast.UnaryOperation(temporary_arithmetic, temporary_not.value)
-            temporary.line = temporary_not.line
-            temporary.filename = temporary_arithmetic.filename
+            self._locate(temporary, temporary_not)
 
             return temporary
 
@@ -615,9 +655,7 @@ class Parser:
         """
 
         # comparison = not, { ( IS | LESS | LESS_EQUAL | GREATER | GREATER_EQUAL ), not } ;
-        temporary = self._binary_operation(self._not,
-                                           (Token.IS, Token.LESS, Token.LESS_EQUAL, Token.GREATER, Token.GREATER_EQUAL),
-                                           self._not)
+        temporary = self._binary_operation(self._not, self.COMPARISON_OPERATORS, self._not)
 
         return temporary
 
@@ -630,18 +668,17 @@ class Parser:
 
         """
         # expression = comparison, { ( AND | OR ), comparison } ;
-        temporary = self._binary_operation(self._comparison, (Token.AND, Token.OR), self._comparison)
+        temporary = self._binary_operation(self._comparison, self.LOGICAL_OPERATORS, self._comparison)
 
         # expression = SYMBOL, EQUAL, expression ;
         if isinstance(temporary, ast.Variable) and self.current_token.type == Token.EQUAL:
-            start_line = temporary.line
+            start = temporary
             self._advance_index()
 
             temporary_expression = self._expression()
 
             temporary = ast.AssignmentOperation(temporary.variable, temporary_expression)
-            temporary.line = start_line
-            temporary.filename = temporary_expression.filename
+            self._locate(temporary, start)
 
         return temporary
 
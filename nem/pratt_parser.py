@@ -0,0 +1,176 @@
+"""Hold PrattParser class.
+
+Holds the PrattParser class which converts a list of tokens into the same Abstract Syntax Tree as class Parser, using
+precedence climbing for the operators.
+
+"""
+
+from nem.parser import Parser
+import nem.nodes as ast
+from nem.token_ import Token
+
+
+class PrattParser(Parser):
+
+    """Convert tokens into an AST with precedence climbing.
+
+    Used for parsing code that's already lexed. Instead of going through a method for every level of precedence, each
+    operator is looked up in a table, so an atom is parsed with a couple of calls instead of eight. Atoms are parsed by
+    the methods of class Parser.
+
+    """
+
+    # Level of precedence of each binary operator, except for the power
+    PRECEDENCES = {
+        Token.AND: 1,
+        Token.OR: 1,
+        Token.IS: 2,
+        Token.LESS: 2,
+        Token.LESS_EQUAL: 2,
+        Token.GREATER: 2,
+        Token.GREATER_EQUAL: 2,
+        Token.PLUS: 3,
+        Token.MINUS: 3,
+        Token.MODULO: 3,
+        Token.ASTERISK: 4,
+        Token.SLASH: 4
+    }
+
+    # Level of precedence of arithmetic operations, the operand of a not
+    ARITHMETIC_PRECEDENCE = 3
+
+    def __init__(self, tokens):
+        """Initialize PrattParser class.
+
+        The tokens can be a list, a TokenBuffer or any other iterable of tokens, which gets read as a whole.
+
+        """
+        self.tokens = tokens if isinstance(tokens, list) else list(tokens)
+        self.index = 0
+
+        self.current_token = self.tokens[0]
+
+    def _advance_index(self):
+        """Advance the current token."""
+        self.index += 1
+        self.current_token = self.tokens[self.index]
+
+    def _power(self):
+        """Parse a power.
+
+        Extended Backus-Naur form:
+            power = atom, { CARET, factor } ;
+
+        """
+        # power = atom, { CARET, factor } ;
+        temporary = self._atom()
+
+        start = temporary
+
+        while self.current_token.type == Token.CARET:
+            self._advance_index()
+
+            temporary_right = self._factor()
+
+            temporary = ast.BinaryOperation(temporary, "^", temporary_right)
+            self._locate(temporary, start)
+
+        return temporary
+
+    def _factor(self):
+        """Parse a factor.
+
+        Extended Backus-Naur form:
+            factor = [ PLUS | MINUS ], power ;
+
+        """
+        # factor = ( PLUS | MINUS ), power ;
+        if self.current_token.type == Token.PLUS or self.current_token.type == Token.MINUS:
+            temporary_sign = self.current_token
+            self._advance_index()
+
+            temporary = ast.UnaryOperation(self._power(), temporary_sign.value)
+            self._locate(temporary, temporary_sign)
+
+            return temporary
+
+        # factor = power ;
+        return self._power()
+
+    def _operations(self, temporary, precedence):
+        """Parse the binary operations of the level of precedence and the levels above it, after the first operand."""
+        start = temporary
+        precedences = self.PRECEDENCES
+
+        # Operators of a higher level bind to the right operand, the ones of the same level make a new left operand
+        while precedences.get(self.current_token.type, 0) >= precedence:
+            temporary_operator = self.current_token
+            self._advance_index()
+
+            temporary_right = self._climb(precedences[temporary_operator.type] + 1)
+
+            temporary = ast.BinaryOperation(temporary, temporary_operator.value, temporary_right)
+            self._locate(temporary, start)
+
+        return temporary
+
+    def _climb(self, precedence):
+        """Parse the binary operations of the level of precedence and the levels above it.
+
+        Extended Backus-Naur form:
+            not        = [ NOT ], arithmetic ;
+            comparison = not, { ( IS | LESS | LESS_EQUAL | GREATER | GREATER_EQUAL ), not } ;
+            expression = comparison, { ( AND | OR ), comparison } ;
+
+        """
+        # not = NOT, arithmetic ;
+        if self.current_token.type == Token.NOT and precedence <= self.ARITHMETIC_PRECEDENCE:
+            temporary_not = self.current_token
+            self._advance_index()
+
+            temporary = ast.UnaryOperation(self._operations(self._factor(), self.ARITHMETIC_PRECEDENCE),
+                                           temporary_not.value)
+            self._locate(temporary, temporary_not)
+
+            return self._operations(temporary, precedence)
+
+        return self._operations(self._factor(), precedence)
+
+    def _expression(self):
+        """Parse an expression.
+
+        Extended Backus-Naur form:
+            expression = comparison, { ( AND | OR ), comparison }
+                       | SYMBOL, EQUAL, expression ;
+
+        """
+        # expression = SYMBOL, EQUAL, expression ;
+        if self.current_token.type == Token.SYMBOL and self.tokens[self.index + 1].type == Token.EQUAL:
+            temporary_symbol = self.current_token
+            self._advance_index()
+            self._advance_index()
+
+            temporary = ast.AssignmentOperation(temporary_symbol.value, self._expression())
+            self._locate(temporary, temporary_symbol)
+
+            return temporary
+
+        # expression = comparison, { ( AND | OR ), comparison } ;
+        return self._climb(1)
+
+
+def main():
+    """Debug the parser.
+
+    Used as the entry-point when the file gets ran directly. Used for debugging the class PrattParser.
+
+    """
+    while True:
+        print(list(PrattParser(Lexer(input(">> ") + "\n", "<stdin>").lex()).parse()))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.lexer import Lexer
+
+    main()
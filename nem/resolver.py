@@ -0,0 +1,138 @@
+"""Hold Resolver class.
+
+Holds the Resolver class which puts the variables of a function in the slots of the frame of a call, and the Layout
+class which names the slots.
+
+"""
+
+import nem.nodes as ast
+
+
+class Layout:
+
+    """Hold the names of the slots of a frame.
+
+    Holds the names of the slots of a frame, the slot of each name, and the identities of the returns in the function
+    that return a call in tail position.
+
+    """
+
+    __slots__ = ("names", "slots", "tails")
+
+    def __init__(self, names, tails=()):
+        """Initialize Layout class."""
+        self.names = tuple(names)
+        self.slots = {name: slot for slot, name in enumerate(self.names)}
+        self.tails = frozenset(tails)
+
+    def __repr__(self):
+        """Represent Layout class."""
+        return "Layout({})".format(repr(list(self.names)))
+
+
+class Resolver:
+
+    """Resolve the variables of functions.
+
+    Used for giving each variable a function names a slot in the frame of a call of the function. Scoping is dynamic,
+    so a variable the function only reads can come from any caller, and it's still looked up by its name, once per
+    call, after which it's read from its slot. Each node naming a variable in the function gets the layout and its
+    slot, except for the ones in the functions it defines, which get their own once they're called.
+
+    """
+
+    # Attribute holding the variable each kind of node names
+    NAMES = {
+        ast.Variable: "variable",
+        ast.AssignmentOperation: "variable",
+        ast.FunctionDefinition: "name",
+        ast.FunctionCall: "name"
+    }
+
+    def resolve(self, parameters, body=None):
+        """Return the layout of the frame of a function, after binding the nodes of the body to it."""
+        temporary_names = dict.fromkeys(parameters)
+        temporary_nodes = []
+
+        # Walked with a stack, since bodies can be nested deeper than Python recurses
+        temporary_stack = [] if body is None else [body]
+
+        while temporary_stack:
+            node = temporary_stack.pop()
+            name = getattr(node, self.NAMES[type(node)]) if type(node) in self.NAMES else None
+
+            # Calls of calls and functions without a name don't name a variable
+            if isinstance(name, str):
+                temporary_names.setdefault(name)
+                temporary_nodes.append(node)
+
+            temporary_children = []
+
+            for field in node.fields():
+                # The body of a function defined or inlined in the function is resolved when it's called
+                if isinstance(node, (ast.FunctionDefinition, ast.InlineCall)) and field == "expression":
+                    continue
+
+                temporary_child = getattr(node, field)
+
+                if isinstance(temporary_child, ast.Node):
+                    temporary_children.append(temporary_child)
+                elif isinstance(temporary_child, list):
+                    temporary_children.extend(element for element in temporary_child if isinstance(element, ast.Node))
+
+            # Reversed, so the slots are in the order the names are in the code
+            temporary_stack.extend(reversed(temporary_children))
+
+        layout = Layout(temporary_names, self._tails(body))
+
+        for node in temporary_nodes:
+            node.layout = layout
+            node.slot = layout.slots[getattr(node, self.NAMES[type(node)])]
+
+        return layout
+
+    @staticmethod
+    def _tails(body):
+        """Return the identities of the returns of calls whose value the function returns, with nothing left to do.
+
+        A return ends the brackets and the if it's in, but not a while, which goes on with the loop, nor the operations
+        and calls, which raise an error for it.
+
+        """
+        temporary_tails = []
+        temporary_stack = [] if body is None else [body]
+
+        while temporary_stack:
+            node = temporary_stack.pop()
+
+            if isinstance(node, ast.Expressions):
+                temporary_stack.extend(node.expressions)
+            elif isinstance(node, ast.IfOtherwise):
+                temporary_stack.extend(branch for branch in (node.if_expression, node.otherwise_expression)
+                                       if branch is not None)
+            elif isinstance(node, ast.Return) and isinstance(node.value, (ast.FunctionCall, ast.InlineCall)):
+                temporary_tails.append(id(node))
+
+        return temporary_tails
+
+
+def main():
+    """Debug the resolver.
+
+    Used as the entry-point when the file gets ran directly. It's usually used for debugging the class Resolver.
+
+    """
+    resolver = Resolver()
+
+    while True:
+        for node in Parser(Lexer(input(">> "), "<stdin>").lex()).parse():
+            if isinstance(node, ast.FunctionDefinition):
+                print(resolver.resolve(node.parameters, node.expression))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.lexer import Lexer
+    from nem.parser import Parser
+
+    main()
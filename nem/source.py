@@ -0,0 +1,127 @@
+"""Locate positions in source code.
+
+Holds class Source which turns offsets into the code into lines and columns.
+
+"""
+
+import array
+import bisect
+import re
+
+
+class Source:
+
+    """Locate positions in source code.
+
+    Tokens and nodes only store an offset into the code and share the Source of their file. The starts of the lines are
+    found the first time a line or a column is needed, so lexing never has to keep count of them. Code read from a
+    stream or released isn't kept, so its columns count bytes instead of characters.
+
+    """
+
+    __slots__ = ("filename", "code", "_line_starts", "_length", "_carriage_return", "_first_line", "_scanned")
+
+    TEXT_NEWLINE = re.compile(r"\r\n?|\n")
+    BINARY_NEWLINE = re.compile(rb"\r\n?|\n")
+
+    # Least amount of code scanned for newlines at once
+    SCAN_SIZE = 1 << 16
+
+    def __init__(self, filename, code=None, position=0, line=1, column=1):
+        """Initialize Source class.
+
+        Without the code, the source has to be fed the code chunk by chunk instead. Code that's only located from a
+        position on, like code lexed starting from there, can be given the line and the column of the position, so the
+        code before it is never scanned. Chunks fed to the source then start at the position.
+
+        """
+        self.filename = filename
+        self.code = code
+
+        self._line_starts = array.array("q", [position - column + 1])
+        self._length = position
+        self._carriage_return = False
+        self._first_line = line
+
+        # Offset up to which the code was scanned for the starts of lines
+        self._scanned = position
+
+    def _newline(self, code):
+        """Return the newline pattern matching the type of the code."""
+        return self.TEXT_NEWLINE if isinstance(code, str) else self.BINARY_NEWLINE
+
+    def feed(self, chunk):
+        """Add the starts of the lines in the next chunk of code, for code that isn't kept in memory."""
+        line_starts = self._line_starts
+        length = self._length
+
+        for newline in self._newline(chunk).finditer(chunk):
+            # A \r\n split between two chunks is still a single newline
+            if newline.start() == 0 and self._carriage_return and chunk[:1] in ("\n", b"\n"):
+                line_starts[-1] += 1
+            else:
+                line_starts.append(length + newline.end())
+
+        self._length += len(chunk)
+        self._carriage_return = chunk[-1:] in ("\r", b"\r")
+
+    def _lines(self, offset):
+        """Return the offsets where the lines start, with all of them up to the offset found."""
+        code = self.code
+
+        if code is not None and self._scanned <= offset and self._scanned < len(code):
+            stop = min(len(code), max(offset + 1, self._scanned + self.SCAN_SIZE))
+
+            # A \r\n is never split between two scans
+            if code[stop - 1:stop] in ("\r", b"\r"):
+                stop = min(len(code), stop + 1)
+
+            newlines = self._newline(code).finditer(code, self._scanned, stop)
+            self._line_starts.extend(newline.end() for newline in newlines)
+            self._scanned = stop
+
+        return self._line_starts
+
+    @classmethod
+    def located(cls, filename, line_starts):
+        """Return the source of code that isn't kept, given the offsets where its lines start as bytes."""
+        source = cls(filename)
+        source._line_starts = array.array("q")
+        source._line_starts.frombytes(line_starts)
+
+        return source
+
+    def lines(self):
+        """Return the offsets where the lines start, with all of them found."""
+        if self.code is not None:
+            return self._lines(len(self.code))
+
+        return self._line_starts
+
+    def release(self):
+        """Drop the code, keeping only the starts of its lines, so a memory-mapped file can be closed."""
+        self.lines()
+        self.code = None
+
+    def line(self, offset):
+        """Return the line of the offset."""
+        return self._first_line + bisect.bisect_right(self._lines(offset), offset) - 1
+
+    def column(self, offset):
+        """Return the column of the offset."""
+        line_starts = self._lines(offset)
+        line_start = line_starts[bisect.bisect_right(line_starts, offset) - 1]
+
+        # Offsets into binary code count bytes, while columns count characters
+        if self.code is not None and not isinstance(self.code, str):
+            return len(bytes(self.code[line_start:offset]).decode(errors="replace")) + 1
+
+        return offset - line_start + 1
+
+    def __deepcopy__(self, memo):
+        """Return the source itself, as copying a symbol table copies the nodes of its functions but not their code."""
+        return self
+
+    def __repr__(self):
+        """Represent Source class."""
+        return "Source({})".format(repr(self.filename))
@@ -0,0 +1,410 @@
+"""Hold StackEvaluator class.
+
+Holds the StackEvaluator class which evaluates the Abstract Syntax Tree like class Evaluator without recursion, so the
+depth of the calls of the code isn't limited by the recursion limit of Python.
+
+"""
+
+from nem.compiler import Compiler
+from nem.evaluator import Evaluator, Signal
+from nem.exceptions import EvaluatorException
+import nem.interpreter
+import nem.nodes as ast
+import nem.stack_parser
+import nem.symbol_table
+import nem.types_ as value
+
+
+class StackEvaluator(Evaluator):
+
+    """Evaluate the AST using an explicit stack.
+
+    Used for evaluating deeply recursive code. Whenever a node has to evaluate one of its nodes, it pushes what's left
+    of it to the stack as a frame, the method and the arguments that finish it once the value of the node is known.
+    Function calls push a frame as well, so the memory used grows with the depth of the calls and the nesting of the
+    code and not the call stack of Python, and the depth of the calls is only limited by LIMIT.
+
+    The depth is the number of calls being made, and the deepest and the largest are the most calls and the most
+    frames there have been at once, which tell how much of the limit the code uses.
+
+    """
+
+    # Most calls that can be made at once
+    LIMIT = 100000
+
+    def __init__(self, abstract_syntax_tree, symbol_table):
+        """Initialize StackEvaluator class."""
+        super().__init__(abstract_syntax_tree, symbol_table)
+
+        # Frames waiting for the value of a node, and the node to evaluate next with its symbol table
+        self.stack = []
+        self.next = None
+
+        self.depth = 0
+        self.deepest = 0
+        self.largest = 0
+
+        # Nodes that evaluate other nodes push a frame for them instead, the others are evaluated like in Evaluator
+        for node_class in list(self.handlers):
+            temporary_method = getattr(self, "_begin_" + node_class.__name__.lower(), None)
+
+            if temporary_method is not None:
+                self.handlers[node_class] = temporary_method
+
+    def _push(self, node, symbol_table, method, *arguments):
+        """Push a frame, then start evaluating the node it waits for."""
+        stack = self.stack
+        stack.append((method, arguments))
+        self.next = node, symbol_table
+
+        if len(stack) > self.largest:
+            self.largest = len(stack)
+
+    def _begin_list(self, node, symbol_table):
+        """Start evaluating a List node."""
+        if not node.elements:
+            return value.List([])
+
+        self._push(node.elements[0], symbol_table, self._end_element, node, symbol_table, [])
+
+    def _end_element(self, temporary_value, node, symbol_table, temporary_elements):
+        """Continue a List node after one of its elements."""
+        if temporary_value.__class__ is Signal:
+            self._raise(temporary_value, Compiler.LIST_ERRORS, node)
+
+        temporary_elements.append(temporary_value)
+
+        if len(temporary_elements) < len(node.elements):
+            self._push(node.elements[len(temporary_elements)], symbol_table, self._end_element, node, symbol_table,
+                       temporary_elements)
+            return None
+
+        return value.List(temporary_elements)
+
+    def _begin_listindex(self, node, symbol_table):
+        """Start evaluating a ListIndex node."""
+        self._push(node.holder, symbol_table, self._end_holder, node, symbol_table)
+
+    def _end_holder(self, temporary_holder, node, symbol_table):
+        """Continue a ListIndex node after its holder."""
+        self._push(node.index, symbol_table, self._end_index, node, temporary_holder)
+
+    def _end_index(self, temporary_index, node, temporary_holder):
+        """Finish a ListIndex node."""
+        if temporary_index.__class__ is Signal:
+            self._raise(temporary_index, Compiler.INDEX_ERRORS, node)
+
+        return self._index(node, temporary_holder, temporary_index)
+
+    def _begin_expressions(self, node, symbol_table):
+        """Start evaluating an Expressions node."""
+        if not node.expressions:
+            return value.Null()
+
+        self._push(node.expressions[0], symbol_table, self._end_expression, node, symbol_table, 0)
+
+    def _end_expression(self, temporary_value, node, symbol_table, index):
+        """Continue an Expressions node after one of its expressions."""
+        index += 1
+
+        # If 'return', 'continue' or 'break' is detected, backpropagate
+        if temporary_value.__class__ is Signal or index == len(node.expressions):
+            return temporary_value
+
+        self._push(node.expressions[index], symbol_table, self._end_expression, node, symbol_table, index)
+
+    def _begin_unaryoperation(self, node, symbol_table):
+        """Start evaluating a UnaryOperation node."""
+        self._push(node.node, symbol_table, self._end_unary_operation, node)
+
+    def _end_unary_operation(self, temporary_value, node):
+        """Finish a UnaryOperation node."""
+        if temporary_value.__class__ is Signal:
+            self._raise(temporary_value, Compiler.UNARY_ERRORS, node)
+
+        return self._unary(node, temporary_value)
+
+    def _begin_binaryoperation(self, node, symbol_table):
+        """Start evaluating a BinaryOperation node."""
+        self._push(node.left_node, symbol_table, self._end_left, node, symbol_table)
+
+    def _end_left(self, temporary_left_value, node, symbol_table):
+        """Continue a BinaryOperation node after its left operand."""
+        # If 'return', 'continue' or 'break' is detected, backpropagate
+        if temporary_left_value.__class__ is Signal:
+            return temporary_left_value
+
+        self._push(node.right_node, symbol_table, self._end_right, node, temporary_left_value)
+
+    def _end_right(self, temporary_right_value, node, temporary_left_value):
+        """Finish a BinaryOperation node."""
+        # If 'return', 'continue' or 'break' is detected, backpropagate
+        if temporary_right_value.__class__ is Signal:
+            return temporary_right_value
+
+        return self._operate(node, temporary_left_value, temporary_right_value)
+
+    def _begin_assignmentoperation(self, node, symbol_table):
+        """Start evaluating an AssignmentOperation node."""
+        self._push(node.value, symbol_table, self._end_assignment, node, symbol_table)
+
+    def _end_assignment(self, temporary_value, node, symbol_table):
+        """Finish an AssignmentOperation node."""
+        if temporary_value.__class__ is Signal:
+            self._raise(temporary_value, Compiler.ASSIGNMENT_ERRORS, node)
+
+        self._set(node, node.variable, temporary_value, symbol_table)
+
+        return temporary_value
+
+    def _begin_ifotherwise(self, node, symbol_table):
+        """Start evaluating an IfOtherwise node."""
+        self._push(node.condition, symbol_table, self._end_condition, node, symbol_table)
+
+    def _end_condition(self, temporary_condition, node, symbol_table):
+        """Continue an IfOtherwise node after its condition."""
+        if temporary_condition.__class__ is Signal:
+            self._raise(temporary_condition, Compiler.CONDITION_ERRORS, node)
+
+        # If condition is true
+        if temporary_condition.value:
+            self._push(node.if_expression, symbol_table, self._end_branch)
+        # Otherwise
+        elif node.otherwise_expression is not None:
+            self._push(node.otherwise_expression, symbol_table, self._end_branch)
+        else:
+            return value.Null()
+
+    @staticmethod
+    def _end_branch(temporary_expression):
+        """Finish an IfOtherwise node."""
+        # If 'return', 'continue' or 'break' is detected, backpropagate
+        if temporary_expression.__class__ is Signal:
+            return temporary_expression
+
+        return value.Null()
+
+    def _begin_while(self, node, symbol_table):
+        """Start evaluating a While node."""
+        self._push(node.condition, symbol_table, self._end_while_condition, node, symbol_table)
+
+    def _end_while_condition(self, temporary_condition, node, symbol_table):
+        """Continue a While node after its condition."""
+        # The condition is checked on every iteration, as it can give a signal on any of them
+        if temporary_condition.__class__ is Signal:
+            self._raise(temporary_condition, Compiler.CONDITION_ERRORS, node)
+
+        if not temporary_condition.value:
+            return value.Null()
+
+        self._push(node.expression, symbol_table, self._end_while_expression, node, symbol_table)
+
+    def _end_while_expression(self, temporary_expression, node, symbol_table):
+        """Continue a While node after an iteration, with the next one."""
+        # If 'break' is detected, break the loop
+        if temporary_expression is self.BREAK:
+            return value.Null()
+
+        if node.cache is not False and self._trace(node, symbol_table):
+            return value.Null()
+
+        self._push(node.condition, symbol_table, self._end_while_condition, node, symbol_table)
+
+    def _begin_functioncall(self, node, symbol_table):
+        """Start evaluating a FunctionCall node."""
+        return self._begin_call(node, symbol_table, False)
+
+    def _begin_inlinecall(self, node, symbol_table):
+        """Start evaluating an InlineCall node."""
+        return self._begin_call(node, symbol_table, False)
+
+    def _begin_call(self, node, symbol_table, tail):
+        """Start a call, finding the function it calls first."""
+        if isinstance(node, ast.InlineCall):
+            return self._begin_arguments(node, value.Function(node.parameters, node.expression), symbol_table, tail)
+
+        temporary_function = self._get(node, node.name, symbol_table)
+
+        if temporary_function is None:
+            # Calls of calls call the function the inner call returns
+            if isinstance(node.name, ast.FunctionCall):
+                self._push(node.name, symbol_table, self._end_function, node, symbol_table, tail)
+                return None
+
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): Function '{}' is not defined"
+                .format(node.filename, node.line, node.name)
+            )
+
+        return self._end_function(temporary_function, node, symbol_table, tail)
+
+    def _end_function(self, temporary_function, node, symbol_table, tail):
+        """Continue a call once the function it calls is found."""
+        self._check_arguments(node, temporary_function)
+
+        return self._begin_arguments(node, temporary_function, symbol_table, tail)
+
+    def _begin_arguments(self, node, function, symbol_table, tail):
+        """Start evaluating the arguments of a call, in the frame of the call."""
+        if tail:
+            temporary_symbol_table = symbol_table.tail(self._layout(function))
+        else:
+            temporary_symbol_table = nem.symbol_table.Frame(self._layout(function), symbol_table)
+
+        return self._end_argument(None, node, function, temporary_symbol_table, tail, 0)
+
+    def _end_argument(self, argument, node, function, symbol_table, tail, index):
+        """Continue the arguments of a call after one of them, then make the call."""
+        if index:
+            if argument.__class__ is Signal:
+                self._raise(argument, Compiler.ARGUMENT_ERRORS, node)
+
+            symbol_table.set(function.parameters[index - 1], argument)
+
+        # Like the zip in Evaluator, which stops at the shorter of the two
+        if index < len(function.parameters) and index < len(node.arguments):
+            self._push(node.arguments[index], symbol_table, self._end_argument, node, function, symbol_table, tail,
+                       index + 1)
+            return None
+
+        # A call in tail position is returned to the call of the function, which makes it in place of its own frame
+        if tail:
+            return Signal("CALL", (node, function, symbol_table))
+
+        return self._call(node, function, symbol_table)
+
+    def _call(self, node, function, symbol_table):
+        """Start a call of a function in its frame, with the parameters set."""
+        if isinstance(function, value.Function):
+            if self.depth >= self.LIMIT:
+                raise EvaluatorException(
+                    "Evaluation Error (File {}) (Line {}): Maximum call depth of {} exceeded"
+                    .format(node.filename, node.line, self.LIMIT)
+                )
+
+            self.depth += 1
+
+            if self.depth > self.deepest:
+                self.deepest = self.depth
+
+            self._push(function.body, symbol_table, self._end_call, node)
+            return None
+
+        return super()._call(node, function, symbol_table)
+
+    def _end_call(self, temporary_return_value, node):
+        """Finish a call once the body of the function is evaluated."""
+        self.depth -= 1
+
+        # Without 'return', the function returns null
+        if temporary_return_value.__class__ is not Signal:
+            return value.Null()
+
+        if temporary_return_value.kind == "RETURN":
+            return temporary_return_value.value
+
+        # Calls in tail position are made in place of the call that returned them
+        if temporary_return_value.kind == "CALL":
+            return self._call(*temporary_return_value.value)
+
+        return value.Null()
+
+    def _begin_return(self, node, symbol_table):
+        """Start evaluating a Return node."""
+        # A call in tail position is made in place of the frame of the function
+        if symbol_table.layout is not None and id(node) in symbol_table.layout.tails:
+            return self._begin_call(node.value, symbol_table, True)
+
+        self._push(node.value, symbol_table, self._end_return, node)
+
+    def _end_return(self, temporary_return_value, node):
+        """Finish a Return node."""
+        if temporary_return_value.__class__ is Signal:
+            self._raise(temporary_return_value, Compiler.RETURN_ERRORS, node)
+
+        return Signal("RETURN", temporary_return_value)
+
+    @staticmethod
+    def _evaluate_import(node, symbol_table):
+        """Evaluate Import node, parsing and evaluating the file without recursing as well."""
+        try:
+            with open("{}.nem".format(node.file), "rb") as nem_file:
+                nem.interpreter.Interpreter(nem_file, node.file, symbol_table, parser=nem.stack_parser.StackParser,
+                                            cache=True, evaluator=StackEvaluator, inline=False)
+        except FileNotFoundError:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): File '{}.nem' doesn't exist"
+                .format(node.filename, node.line, node.file)
+            )
+
+        return value.Null()
+
+    def _evaluate_node(self, node, symbol_table):
+        """Evaluate a node.
+
+        Runs the frames the node pushes until the value of the node is known, leaving the frames pushed before it,
+        like by a handler registered with register that evaluates its nodes with this method.
+
+        """
+        stack = self.stack
+        bottom = len(stack)
+        depth = self.depth
+        handlers = self.handlers
+        temporary = None
+
+        try:
+            while True:
+                if temporary is None:
+                    # Nothing is evaluated yet, so the latest node pushed is started
+                    if self.next is not None:
+                        node, symbol_table = self.next
+                        self.next = None
+
+                    try:
+                        method = handlers[node.__class__]
+                    except KeyError:
+                        method = self._handler(node)
+
+                    temporary = method(node, symbol_table)
+                elif len(stack) > bottom:
+                    # Gives the value to the frame waiting for it
+                    method, arguments = stack.pop()
+                    temporary = method(temporary, *arguments)
+                else:
+                    return temporary
+        except BaseException:
+            # Frames and calls an error leaves behind are dropped, so the evaluator can go on with the next node
+            del stack[bottom:]
+            self.depth = depth
+            self.next = None
+
+            raise
+
+
+def main():
+    """Debug the evaluator.
+
+    Used as the entry-point when the file gets ran directly. Used for debugging the class StackEvaluator.
+
+    """
+    # Built-in variables and functions
+    symbol_table = SymbolTable()
+    symbol_table.set("true", value.Number(1))
+    symbol_table.set("false", value.Number(0))
+    symbol_table.set("print", value.BuiltInFunction(["element"], 0))
+    symbol_table.set("input", value.BuiltInFunction([], 1))
+    symbol_table.set("convert", value.BuiltInFunction(["value", "type"], 2))
+
+    while True:
+        evaluator = StackEvaluator(Parser(Lexer(input(">> ") + "\n", "<stdin>").lex()).parse(), symbol_table)
+
+        print(list(evaluator.evaluate()), "(deepest {}, largest {})".format(evaluator.deepest, evaluator.largest))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.lexer import Lexer
+    from nem.parser import Parser
+    from nem.symbol_table import SymbolTable
+
+    main()
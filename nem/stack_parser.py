@@ -0,0 +1,467 @@
+"""Hold StackParser class.
+
+Holds the StackParser class which converts a list of tokens into the same Abstract Syntax Tree as class Parser without
+recursion, so the depth of the code isn't limited by the recursion limit of Python.
+
+"""
+
+import nem.nodes as ast
+from nem.pratt_parser import PrattParser
+from nem.token_ import Token
+
+
+class StackParser(PrattParser):
+
+    """Convert tokens into an AST using an explicit stack.
+
+    Used for parsing machine-generated code, with deeply nested brackets or very long lists. Whenever a rule has to
+    parse an expression, it pushes what's left of it to the stack as a frame, the method and the arguments that finish
+    it once the expression is parsed. The memory used grows with the nesting of the code and not the call stack.
+
+    """
+
+    def _push(self, *frame):
+        """Push a frame, then start parsing the expression it waits for."""
+        self.stack.append(frame)
+        self.action = self._begin_expression
+
+    def _begin_expression(self):
+        """Start parsing an expression."""
+        # expression = SYMBOL, EQUAL, expression ;
+        if self.current_token.type == Token.SYMBOL and self.tokens[self.index + 1].type == Token.EQUAL:
+            temporary_symbol = self.current_token
+            self._advance_index()
+            self._advance_index()
+
+            self._push(self._end_assignment, temporary_symbol)
+            return None
+
+        # expression = comparison, { ( AND | OR ), comparison } ;
+        return self._begin_climb(1)
+
+    def _end_assignment(self, temporary_expression, temporary_symbol):
+        """Finish an assignment."""
+        temporary = ast.AssignmentOperation(temporary_symbol.value, temporary_expression)
+        self._locate(temporary, temporary_symbol)
+
+        return temporary
+
+    def _begin_climb(self, precedence):
+        """Start parsing the binary operations of the level of precedence and the levels above it."""
+        stack = self.stack
+        stack.append((self._end_operand, precedence))
+
+        # not = NOT, arithmetic ;
+        if self.current_token.type == Token.NOT and precedence <= self.ARITHMETIC_PRECEDENCE:
+            temporary_not = self.current_token
+            self._advance_index()
+
+            stack.append((self._end_not, temporary_not))
+            stack.append((self._end_operand, self.ARITHMETIC_PRECEDENCE))
+
+        return self._begin_factor()
+
+    def _end_operand(self, temporary, precedence):
+        """Continue the binary operations after their first operand."""
+        return self._continue_operations(temporary, temporary, precedence)
+
+    def _continue_operations(self, temporary, start, precedence):
+        """Parse the next binary operation of the level of precedence or a level above it."""
+        temporary_precedence = self.PRECEDENCES.get(self.current_token.type, 0)
+
+        if temporary_precedence < precedence:
+            return temporary
+
+        temporary_operator = self.current_token
+        self._advance_index()
+
+        self.stack.append((self._end_binary_operation, temporary, start, temporary_operator, precedence))
+
+        return self._begin_climb(temporary_precedence + 1)
+
+    def _end_binary_operation(self, temporary_right, temporary_left, start, temporary_operator, precedence):
+        """Finish a binary operation and continue with the next one."""
+        temporary = ast.BinaryOperation(temporary_left, temporary_operator.value, temporary_right)
+        self._locate(temporary, start)
+
+        return self._continue_operations(temporary, start, precedence)
+
+    def _end_not(self, temporary_arithmetic, temporary_not):
+        """Finish a not."""
+        temporary = ast.UnaryOperation(temporary_arithmetic, temporary_not.value)
+        self._locate(temporary, temporary_not)
+
+        return temporary
+
+    def _begin_factor(self):
+        """Start parsing a factor."""
+        # factor = ( PLUS | MINUS ), power ;
+        if self.current_token.type == Token.PLUS or self.current_token.type == Token.MINUS:
+            temporary_sign = self.current_token
+            self._advance_index()
+
+            self.stack.append((self._end_sign, temporary_sign))
+
+        # power = atom, { CARET, factor } ;
+        self.stack.append((self._end_base,))
+
+        return self._begin_atom()
+
+    def _end_sign(self, temporary_power, temporary_sign):
+        """Finish a sign."""
+        temporary = ast.UnaryOperation(temporary_power, temporary_sign.value)
+        self._locate(temporary, temporary_sign)
+
+        return temporary
+
+    def _end_base(self, temporary):
+        """Continue a power after its atom."""
+        return self._exponents(temporary, temporary)
+
+    def _exponents(self, temporary, start):
+        """Parse the next exponent of a power."""
+        if self.current_token.type != Token.CARET:
+            return temporary
+
+        self._advance_index()
+
+        self.stack.append((self._end_exponent, temporary, start))
+
+        return self._begin_factor()
+
+    def _end_exponent(self, temporary_right, temporary_left, start):
+        """Finish an exponent and continue with the next one."""
+        temporary = ast.BinaryOperation(temporary_left, "^", temporary_right)
+        self._locate(temporary, start)
+
+        return self._exponents(temporary, start)
+
+    def _begin_atom(self):
+        """Start parsing an atom."""
+        try:
+            temporary_atom = self.STACK_ATOMS[self.current_token.type]
+        except KeyError:
+            raise self._exception("Expected an atom")
+
+        return temporary_atom(self)
+
+    def _begin_expressions(self):
+        """Start parsing an expressions atom."""
+        # atom = LEFT_BRACKET, expression, { expression }, RIGHT_BRACKET ;
+        start = self.current_token
+        self._advance_index()
+
+        self._push(self._end_expressions, start, [])
+
+    def _end_expressions(self, temporary_expression, start, temporary_expressions):
+        """Continue an expressions atom after one of its expressions."""
+        temporary_expressions.append(temporary_expression)
+
+        if self.current_token.type != Token.RIGHT_BRACKET:
+            self._push(self._end_expressions, start, temporary_expressions)
+            return None
+
+        self._advance_index()
+
+        temporary = ast.Expressions(temporary_expressions)
+        self._locate(temporary, start)
+
+        return temporary
+
+    def _begin_symbol(self):
+        """Start parsing a symbol atom."""
+        # atom = SYMBOL, { arguments }, { list_index } ;
+        temporary_symbol = self.current_token
+        self._advance_index()
+
+        return self._calls(temporary_symbol)
+
+    def _calls(self, temporary_call):
+        """Parse the next arguments of a symbol atom."""
+        # arguments = LEFT_BRACKET, [ expression, { COMMA, expression } ], RIGHT_BRACKET ;
+        while self.current_token.type == Token.LEFT_BRACKET:
+            self._advance_index()
+
+            if self.current_token.type != Token.RIGHT_BRACKET:
+                self._push(self._end_argument, temporary_call, [])
+                return None
+
+            # Calls of calls are named by the call instead of a symbol
+            if isinstance(temporary_call, Token):
+                temporary = ast.FunctionCall(temporary_call.value, [])
+            else:
+                temporary = ast.FunctionCall(temporary_call, [])
+
+            self._locate(temporary, temporary_call)
+            self._advance_index()
+
+            temporary_call = temporary
+
+        return self._symbol_indexes(temporary_call)
+
+    def _end_argument(self, temporary_expression, temporary_call, temporary_arguments):
+        """Continue arguments after one of them."""
+        temporary_arguments.append(temporary_expression)
+
+        if self.current_token.type == Token.COMMA:
+            self._advance_index()
+
+            self._push(self._end_argument, temporary_call, temporary_arguments)
+            return None
+
+        if self.current_token.type == Token.RIGHT_BRACKET:
+            # Like in class Parser, only a symbol can be called with arguments
+            if not isinstance(temporary_call, Token):
+                raise self._exception("Expected a symbol to call with arguments")
+
+            temporary = ast.FunctionCall(temporary_call.value, temporary_arguments)
+            self._locate(temporary, temporary_call)
+            self._advance_index()
+
+            return self._calls(temporary)
+
+        raise self._exception("Expected a closing bracket")
+
+    def _index(self, holder, start, indexes):
+        """Start parsing a list index, to be continued by the indexes method."""
+        # list_index = LEFT_SQUARE, expression, RIGHT_SQUARE ;
+        self._advance_index()
+
+        self._push(self._end_index, holder, start, indexes)
+
+    def _end_index(self, temporary_expression, holder, start, indexes):
+        """Finish a list index and continue with the next one."""
+        if self.current_token.type != Token.RIGHT_SQUARE:
+            raise self._exception("Expected a closing square bracket")
+
+        temporary = ast.ListIndex(holder, temporary_expression)
+        self._locate(temporary, start)
+        self._advance_index()
+
+        return indexes(temporary)
+
+    def _symbol_indexes(self, temporary_call):
+        """Parse the next list index of a symbol atom."""
+        if self.current_token.type == Token.LEFT_SQUARE:
+            if isinstance(temporary_call, Token):
+                self._index(self._locate(ast.Variable(temporary_call.value), temporary_call), temporary_call,
+                            self._symbol_indexes)
+            else:
+                self._index(temporary_call, temporary_call, self._symbol_indexes)
+
+            return None
+
+        if isinstance(temporary_call, Token):
+            temporary = ast.Variable(temporary_call.value)
+            self._locate(temporary, temporary_call)
+
+            return temporary
+
+        return temporary_call
+
+    def _begin_text(self):
+        """Start parsing a text atom."""
+        # atom = TEXT, { list_index } ;
+        temporary_text = self.current_token
+        self._advance_index()
+
+        return self._text_indexes(temporary_text)
+
+    def _text_indexes(self, temporary_text):
+        """Parse the next list index of a text atom."""
+        if self.current_token.type == Token.LEFT_SQUARE:
+            if isinstance(temporary_text, Token):
+                self._index(self._locate(ast.Text(temporary_text.value), temporary_text), temporary_text,
+                            self._text_indexes)
+            else:
+                self._index(temporary_text, temporary_text, self._text_indexes)
+
+            return None
+
+        if isinstance(temporary_text, Token):
+            temporary = ast.Text(temporary_text.value)
+            self._locate(temporary, temporary_text)
+
+            return temporary
+
+        return temporary_text
+
+    def _begin_list(self):
+        """Start parsing a list atom."""
+        # list = LEFT_SQUARE, [ expression, { COMMA, expression } ], RIGHT_SQUARE ;
+        start = self.current_token
+        self._advance_index()
+
+        if self.current_token.type != Token.RIGHT_SQUARE:
+            self._push(self._end_element, start, [])
+            return None
+
+        temporary = ast.List([])
+        self._locate(temporary, start)
+        self._advance_index()
+
+        return self._list_indexes(temporary)
+
+    def _end_element(self, temporary_expression, start, temporary_elements):
+        """Continue a list after one of its elements."""
+        temporary_elements.append(temporary_expression)
+
+        if self.current_token.type == Token.COMMA:
+            self._advance_index()
+
+            self._push(self._end_element, start, temporary_elements)
+            return None
+
+        if self.current_token.type == Token.RIGHT_SQUARE:
+            temporary = ast.List(temporary_elements)
+            self._locate(temporary, start)
+            self._advance_index()
+
+            return self._list_indexes(temporary)
+
+        raise self._exception("Expected a closing square bracket")
+
+    def _list_indexes(self, temporary_list):
+        """Parse the next list index of a list atom."""
+        # atom = list, { list_index } ;
+        if self.current_token.type == Token.LEFT_SQUARE:
+            self._index(temporary_list, temporary_list, self._list_indexes)
+            return None
+
+        return temporary_list
+
+    def _begin_return(self):
+        """Start parsing a return atom."""
+        # atom = RETURN, expression ;
+        start = self.current_token
+        self._advance_index()
+
+        self._push(self._end_return, start)
+
+    def _end_return(self, temporary_expression, start):
+        """Finish a return atom."""
+        temporary = ast.Return(temporary_expression)
+        self._locate(temporary, start)
+
+        return temporary
+
+    def _begin_if(self):
+        """Start parsing an if."""
+        # if = IF, expression, expression, [ OTHERWISE, expression ] ;
+        start = self.current_token
+        self._advance_index()
+
+        self._push(self._end_condition, start)
+
+    def _end_condition(self, temporary_condition, start):
+        """Continue an if after its condition."""
+        self._push(self._end_if_expression, start, temporary_condition)
+
+    def _end_if_expression(self, temporary_if_expression, start, temporary_condition):
+        """Continue an if after its expression."""
+        if self.current_token.type == Token.OTHERWISE:
+            self._advance_index()
+
+            self._push(self._end_otherwise_expression, start, temporary_condition, temporary_if_expression)
+            return None
+
+        temporary = ast.IfOtherwise(temporary_condition, temporary_if_expression)
+        self._locate(temporary, start)
+
+        return temporary
+
+    def _end_otherwise_expression(self, temporary_else_expression, start, temporary_condition,
+                                  temporary_if_expression):
+        """Finish an if with an otherwise."""
+        temporary = ast.IfOtherwise(temporary_condition, temporary_if_expression, temporary_else_expression)
+        self._locate(temporary, start)
+
+        return temporary
+
+    def _begin_while(self):
+        """Start parsing a while."""
+        # while = WHILE, expression, expression ;
+        start = self.current_token
+        self._advance_index()
+
+        self._push(self._end_while_condition, start)
+
+    def _end_while_condition(self, temporary_condition, start):
+        """Continue a while after its condition."""
+        self._push(self._end_while, start, temporary_condition)
+
+    def _end_while(self, temporary_expression, start, temporary_condition):
+        """Finish a while."""
+        temporary = ast.While(temporary_condition, temporary_expression)
+        self._locate(temporary, start)
+
+        return temporary
+
+    def _begin_function(self):
+        """Start parsing a function."""
+        self._push(self._end_function, *self._signature())
+
+    def _end_function(self, temporary_expression, start, temporary_name, temporary_parameters):
+        """Finish a function."""
+        temporary = ast.FunctionDefinition(temporary_name, temporary_parameters, temporary_expression)
+        self._locate(temporary, start)
+
+        return temporary
+
+    # Atom parsers, looked up by the type of the first token of the atom. An atom parser either returns the atom or
+    # pushes a frame and returns None
+    STACK_ATOMS = {
+        Token.NUMBER: PrattParser._atom_number,
+        Token.LEFT_BRACKET: _begin_expressions,
+        Token.SYMBOL: _begin_symbol,
+        Token.IF: _begin_if,
+        Token.WHILE: _begin_while,
+        Token.FUNCTION: _begin_function,
+        Token.TEXT: _begin_text,
+        Token.LEFT_SQUARE: _begin_list,
+        Token.RETURN: _begin_return,
+        Token.CONTINUE: PrattParser._atom_continue,
+        Token.BREAK: PrattParser._atom_break,
+        Token.NULL: PrattParser._atom_null,
+        Token.IMPORT: PrattParser._atom_import
+    }
+
+    def _expression(self):
+        """Parse an expression.
+
+        Extended Backus-Naur form:
+            expression = comparison, { ( AND | OR ), comparison }
+                       | SYMBOL, EQUAL, expression ;
+
+        """
+        stack = self.stack = []
+        self.action = self._begin_expression
+        temporary = None
+
+        while True:
+            if temporary is None:
+                # Nothing is parsed yet, so the latest action is started
+                temporary = self.action()
+            elif stack:
+                # Gives the parsed expression to the frame waiting for it
+                frame = stack.pop()
+                temporary = frame[0](temporary, *frame[1:])
+            else:
+                return temporary
+
+
+def main():
+    """Debug the parser.
+
+    Used as the entry-point when the file gets ran directly. Used for debugging the class StackParser.
+
+    """
+    while True:
+        print(list(StackParser(Lexer(input(">> ") + "\n", "<stdin>").lex()).parse()))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.lexer import Lexer
+
+    main()
@@ -4,8 +4,6 @@ Holds class SymbolTable. Used for storing variable names and their values.
 
 """
 
-import copy
-
 
 class SymbolTable:
 
@@ -20,12 +18,34 @@ class SymbolTable:
         self.parent = None
         self.symbols = {}
 
+        # Layout of the slots of a Frame, which a table only has when it's a Frame
+        self.layout = None
+
     def get(self, name):
-        """Return the value of the symbol with the specified name."""
+        """Return the value of the symbol with the specified name.
+
+        A symbol that's only in a parent is kept in the table once it's found, so it's found right away the next time.
+        The parent doesn't change while its scope is in use, so the value stays the same.
+
+        """
         temporary_value = self.symbols.get(name, None)
 
         if temporary_value is None and self.parent is not None:
-            temporary_value = self.parent.get(name)
+            temporary_table = self.parent
+
+            # Scopes are walked up without recursing, as a deep chain of calls gives a deep chain of scopes
+            while temporary_table.__class__ is SymbolTable:
+                temporary_value = temporary_table.symbols.get(name, None)
+
+                if temporary_value is not None or temporary_table.parent is None:
+                    break
+
+                temporary_table = temporary_table.parent
+            else:
+                temporary_value = temporary_table.get(name)
+
+            if temporary_value is not None:
+                self.symbols[name] = temporary_value
 
         return temporary_value
 
@@ -33,9 +53,131 @@ class SymbolTable:
         """Set the value of the symbol with the specified name."""
         self.symbols[name] = value
 
+    def scope(self):
+        """Return an empty table with this table as its parent, for a function call.
+
+        The symbols are read from the parent, which doesn't change until the call returns, and the ones the call sets
+        are only set in the scope, so it's the same as a copy to the code using it, while it takes the same time
+        however many symbols the parent has.
+
+        """
+        temporary_object = SymbolTable()
+        temporary_object.parent = self
+
+        return temporary_object
+
+    def flatten(self):
+        """Return the symbols of the table, including the ones of its parents."""
+        temporary_tables = [self]
+
+        while temporary_tables[-1].parent is not None:
+            temporary_tables.append(temporary_tables[-1].parent)
+
+        temporary_symbols = {}
+
+        for temporary_table in reversed(temporary_tables):
+            temporary_symbols.update(temporary_table.symbols)
+
+            # A Frame keeps the variables that have a slot in its slots
+            if temporary_table.layout is not None:
+                for name, temporary_value in zip(temporary_table.layout.names, temporary_table.slots):
+                    if temporary_value is not None:
+                        temporary_symbols[name] = temporary_value
+
+        return temporary_symbols
+
     def copy(self):
-        """Copy object."""
-        temporary_object = copy.deepcopy(self)
+        """Return a table with the same symbols and this table as its parent.
+
+        Unlike a scope, the copy keeps the symbols the table has now, even if the table changes. The values are shared,
+        as they're never changed in place.
+
+        """
+        temporary_object = SymbolTable()
         temporary_object.parent = self
+        temporary_object.symbols = self.flatten()
+
+        return temporary_object
+
+
+class Frame(SymbolTable):
+
+    """Store the variables of a function call in slots.
+
+    Used instead of a copy of the table of the caller. Each name in the layout of the function has a slot, and names
+    without one, like the ones an import sets, are stored in the symbols. A slot that isn't set yet gets the value from
+    the caller the first time it's read, which is the same value a copy would have, since the caller doesn't change
+    until the call returns.
+
+    """
+
+    def __init__(self, layout, parent):
+        """Initialize Frame class."""
+        super().__init__()
+        self.parent = parent
+        self.layout = layout
+        self.slots = [None] * len(layout.names)
+
+    def get(self, name):
+        """Return the value of the symbol with the specified name.
+
+        Frames are walked up without recursing, like the scopes of class SymbolTable, and each one with a slot for the
+        name keeps the value in it.
+
+        """
+        temporary_table = self
+        temporary_slots = []
+
+        while temporary_table.__class__ is Frame:
+            temporary_slot = temporary_table.layout.slots.get(name)
+
+            if temporary_slot is None:
+                temporary_value = temporary_table.symbols.get(name, None)
+            else:
+                temporary_value = temporary_table.slots[temporary_slot]
+
+                if temporary_value is None:
+                    temporary_slots.append((temporary_table.slots, temporary_slot))
+
+            if temporary_value is not None:
+                break
+
+            temporary_table = temporary_table.parent
+        else:
+            temporary_value = temporary_table.get(name)
+
+        for slots, temporary_slot in temporary_slots:
+            slots[temporary_slot] = temporary_value
+
+        return temporary_value
+
+    def set(self, name, value):
+        """Set the value of the symbol with the specified name."""
+        temporary_slot = self.layout.slots.get(name)
+
+        if temporary_slot is None:
+            self.symbols[name] = value
+        else:
+            self.slots[temporary_slot] = value
+
+    def tail(self, layout):
+        """Return the frame of a call the function makes in tail position, in place of this one.
+
+        The frame has the parent of this one, and the variables of this one are copied into it, so it has the same
+        values as a frame of a call made by this one, without keeping this one. Calls in tail position then don't
+        make the chain of frames longer.
+
+        """
+        temporary_object = Frame(layout, self.parent)
+        temporary_slots = layout.slots
+
+        for name, temporary_value in list(self.symbols.items()) + list(zip(self.layout.names, self.slots)):
+            if temporary_value is not None:
+                temporary_slot = temporary_slots.get(name)
+
+                if temporary_slot is None:
+                    temporary_object.symbols[name] = temporary_value
+                else:
+                    temporary_object.slots[temporary_slot] = temporary_value
 
         return temporary_object
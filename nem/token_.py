@@ -1,9 +1,11 @@
 """Represent a token.
 
-Holds class Token which is used when the code is being lexed.
+Holds class Token which is used when the code is being lexed, and class TokenBuffer which stores many tokens compactly.
 
 """
 
+import array
+
 
 class Token:
 
@@ -13,59 +15,123 @@ class Token:
 
     """
 
+    __slots__ = ("type", "value", "source", "offset")
+
     # Tokens
-    NUMBER = "NUMBER"
-    TEXT = "TEXT"
-    SYMBOL = "SYMBOL"
-    NULL = "NULL"
-    COMMA = "COMMA"
-    CARET = "CARET"
-    ASTERISK = "ASTERISK"
-    SLASH = "SLASH"
-    PLUS = "PLUS"
-    MINUS = "MINUS"
-    EQUAL = "EQUAL"
-    WHILE = "WHILE"
-    LEFT_BRACKET = "LEFT_BRACKET"
-    RIGHT_BRACKET = "RIGHT_BRACKET"
-    IF = "IF"
-    OTHERWISE = "OTHERWISE"
-    FUNCTION = "FUNCTION"
-    IMPORT = "IMPORT"
-    LEFT_SQUARE = "LEFT_SQUARE"
-    RIGHT_SQUARE = "RIGHT_SQUARE"
-    BREAK = "BREAK"
-    CONTINUE = "CONTINUE"
-    RETURN = "RETURN"
-    NOT = "NOT"
-    OR = "OR"
-    AND = "AND"
-    LESS = "LESS"
-    LESS_EQUAL = "LESS_EQUAL"
-    GREATER = "GREATER"
-    GREATER_EQUAL = "GREATER_EQUAL"
-    IS = "IS"
-    MODULO = "MODULO"
-    EOF = "EOF"
-
-    def __init__(self, type_, value, filename, line):
+    NUMBER = 0
+    TEXT = 1
+    SYMBOL = 2
+    NULL = 3
+    COMMA = 4
+    CARET = 5
+    ASTERISK = 6
+    SLASH = 7
+    PLUS = 8
+    MINUS = 9
+    EQUAL = 10
+    WHILE = 11
+    LEFT_BRACKET = 12
+    RIGHT_BRACKET = 13
+    IF = 14
+    OTHERWISE = 15
+    FUNCTION = 16
+    IMPORT = 17
+    LEFT_SQUARE = 18
+    RIGHT_SQUARE = 19
+    BREAK = 20
+    CONTINUE = 21
+    RETURN = 22
+    NOT = 23
+    OR = 24
+    AND = 25
+    LESS = 26
+    LESS_EQUAL = 27
+    GREATER = 28
+    GREATER_EQUAL = 29
+    IS = 30
+    MODULO = 31
+    EOF = 32
+
+    # Token names, indexed by token
+    NAMES = (
+        "NUMBER", "TEXT", "SYMBOL", "NULL", "COMMA", "CARET", "ASTERISK", "SLASH", "PLUS", "MINUS", "EQUAL", "WHILE",
+        "LEFT_BRACKET", "RIGHT_BRACKET", "IF", "OTHERWISE", "FUNCTION", "IMPORT", "LEFT_SQUARE", "RIGHT_SQUARE",
+        "BREAK", "CONTINUE", "RETURN", "NOT", "OR", "AND", "LESS", "LESS_EQUAL", "GREATER", "GREATER_EQUAL", "IS",
+        "MODULO", "EOF"
+    )
+
+    def __init__(self, type_, value, source, offset):
         """Initialize class Token.
 
-        Used for initializing the Token class.
+        Used for initializing the Token class. The position of the token is an offset into its source.
 
         """
         self.type = type_
         self.value = value
-        self.filename = filename
-        self.line = line
+        self.source = source
+        self.offset = offset
+
+    @property
+    def filename(self):
+        """Return the name of the file the token is in."""
+        return self.source.filename
+
+    @property
+    def line(self):
+        """Return the line of the token."""
+        return self.source.line(self.offset)
+
+    @property
+    def column(self):
+        """Return the column of the token."""
+        return self.source.column(self.offset)
 
     def __repr__(self):
         """Represent Token class."""
-        return "Token({}, {}, {}, {})".format(repr(self.type), repr(self.value), repr(self.filename), repr(self.line))
+        return "Token(Token.{}, {}, {}, {})".format(self.NAMES[self.type], repr(self.value), repr(self.source),
+                                                   repr(self.offset))
 
     def __eq__(self, other):
         """Check equality of Token class."""
         if isinstance(other, Token):
-            return self.type == other.type and self.value == other.value and self.line == other.line
+            return self.type == other.type and self.value == other.value and self.offset == other.offset
         else:
             raise NotImplementedError
+
+
+class TokenBuffer:
+
+    """Store tokens as parallel arrays.
+
+    Used for lexing large sources in bulk. Types and offsets are kept in typed arrays instead of one object per token.
+
+    """
+
+    def __init__(self, source):
+        """Initialize TokenBuffer class."""
+        self.source = source
+
+        self.types = array.array("B")
+        self.values = []
+        self.offsets = array.array("q")
+
+    def __len__(self):
+        """Return the number of tokens."""
+        return len(self.types)
+
+    def __getitem__(self, index):
+        """Return the token at the index."""
+        return Token(self.types[index], self.values[index], self.source, self.offsets[index])
+
+    def __iter__(self):
+        """Iterate over the tokens."""
+        source = self.source
+
+        for type_, value, offset in zip(self.types, self.values, self.offsets):
+            yield Token(type_, value, source, offset)
+
+    def append(self, type_, value, offset):
+        """Append a token."""
+        self.types.append(type_)
+        self.values.append(value)
+        self.offsets.append(offset)
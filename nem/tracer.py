@@ -0,0 +1,490 @@
+"""Trace hot loops.
+
+Holds class Tracer which compiles the trace of an iteration of a hot while loop into a Python function, and class
+Trace which holds that function.
+
+"""
+
+import operator
+
+import nem.nodes as ast
+import nem.types_ as value
+
+
+class Trace:
+
+    """Hold the function compiled from the trace of a loop.
+
+    Holds the function, its source and how many times its guards failed before it ran enough iterations to pay off.
+
+    """
+
+    __slots__ = ("function", "source", "failures")
+
+    def __init__(self, function, source):
+        """Initialize Trace class."""
+        self.function = function
+        self.source = source
+        self.failures = 0
+
+    def __repr__(self):
+        """Represent Trace class."""
+        return "Trace({})".format(repr(self.source))
+
+    def run(self, symbol_table):
+        """Run the loop from the start of its next iteration, and return whether it ended.
+
+        Otherwise a guard failed, and the loop goes on in the evaluator from the start of the iteration it failed in.
+
+        """
+        temporary_iterations = self.function(symbol_table)
+
+        if temporary_iterations is None:
+            return True
+
+        if temporary_iterations < Tracer.HOT:
+            self.failures += 1
+
+        return False
+
+
+class Tracer:
+
+    """Compile hot loops into Python functions.
+
+    Used by class Evaluator once a while loop has ran HOT iterations. Its next iteration is traced: the condition and
+    the body are evaluated on the values of the variables, without changing them, while the operations and the branch
+    each if takes are recorded as Python source. Only integers and the operations on them that give an integer or a
+    truth value, assignments and ifs get traced, so an iteration has nothing to undo and can be ran again from its
+    start.
+
+    The source loads the variables the loop reads once, guarding they're integers, and runs the iterations on Python
+    integers, guarding each operation gives the number class Number would. The branch an if didn't take is compiled
+    along with the one it took, without the values, unless it can't be, in which case the if is guarded to take the
+    same branch. The variables are stored back once the condition is false or a guard fails, in which case the
+    evaluator runs the iteration the guard failed in.
+
+    """
+
+    # Iterations a loop runs in the evaluator before it's traced
+    HOT = 100
+
+    # Times the guards of a trace can fail before it runs HOT iterations, after which the loop is traced again
+    FAILURES = 8
+
+    # Integers a number keeps as they are, as they don't change when turned into a float
+    EXACT = 1 << 53
+
+    # Operations on integers that give an integer, and the Python operator and operation of each one
+    ARITHMETIC = {
+        "+": ("+", operator.add), "-": ("-", operator.sub), "*": ("*", operator.mul), "%": ("%", operator.mod)
+    }
+
+    # Operations on integers that give a truth value, and the Python operator and operation of each one
+    COMPARISONS = {
+        "is": ("==", operator.eq), "<": ("<", operator.lt), "<=": ("<=", operator.le), ">": (">", operator.gt),
+        ">=": (">=", operator.ge)
+    }
+
+    # Operations that give one of their operands, by whether the left one is true
+    LOGICAL = {"and": lambda left, right: left and right, "or": lambda left, right: left or right}
+
+    def __init__(self):
+        """Initialize Tracer class."""
+        self._reset(None)
+
+    def _reset(self, symbol_table):
+        """Start tracing another loop, in the symbol table."""
+        self.symbol_table = symbol_table
+        self.lines = []
+        self.loads = []
+        self.temporaries = 0
+
+        # Local variable each variable of the loop is kept in between iterations, in the order they're first used
+        self.variables = {}
+
+        # Source and value of each variable in the traced iteration so far, and the variables it assigns
+        self.names = {}
+        self.values = {}
+        self.assigned = set()
+
+        # Value each loaded variable has when the loop is traced, and the variables that may not be set in an iteration
+        self.loaded = {}
+        self.unset = set()
+
+        # Whether the branch being traced isn't the one the iteration takes, so the variables have no value
+        self.blind = False
+
+        # Whether the loop can't be traced at all, as opposed to only with the values it has now
+        self.unsupported = False
+
+    def trace(self, node, symbol_table):
+        """Return the trace of the next iteration of the While node.
+
+        Returns None if the iteration can't be traced with the values the loop has now, and False if the loop can't be
+        traced at all.
+
+        """
+        self._reset(symbol_table)
+
+        temporary_condition = self._expression(node.condition)
+
+        # Only an iteration the loop goes on with can be traced
+        if temporary_condition is None or not temporary_condition[1]:
+            return False if self.unsupported else None
+
+        self._line("if not {}:".format(temporary_condition[0]))
+
+        # The condition can assign variables too, which are kept when the loop ends
+        for line in self._commit():
+            self._line("    " + line)
+
+        self._line("    ended = True")
+        self._line("    break")
+
+        if not self._statement(node.expression):
+            return False if self.unsupported else None
+
+        source = self._source()
+        namespace = {"number": value.Number, "box": self.box}
+        exec(compile(source, "<trace>", "exec"), namespace)
+
+        return Trace(namespace["trace"], source)
+
+    @staticmethod
+    def box(integer):
+        """Return the number of an integer, without converting it to a float and back."""
+        temporary = value.Number.__new__(value.Number)
+        temporary.value = integer
+
+        return temporary
+
+    def _source(self):
+        """Return the source of the function running the iterations."""
+        temporary_lines = ["def trace(symbol_table):", "    get = symbol_table.get"]
+        temporary_lines.extend("    " + line for line in self.loads)
+        temporary_lines.extend(["    iterations = 0", "    ended = False", "    while True:"])
+        temporary_lines.extend("        " + line for line in self.lines)
+
+        # The variables only change once the iteration is over, so the iteration a guard fails in can be ran again
+        temporary_lines.extend("        " + line for line in self._commit())
+
+        temporary_lines.append("        iterations += 1")
+
+        for name, variable in self.variables.items():
+            if name in self.assigned:
+                temporary_lines.append("    if {} is not None:".format(variable))
+                temporary_lines.append("        symbol_table.set({!r}, box({}))".format(name, variable))
+
+        temporary_lines.append("    return None if ended else iterations")
+
+        return "\n".join(temporary_lines)
+
+    def _commit(self):
+        """Return the lines setting the variables the iteration assigned so far."""
+        temporary_names = [name for name in self.variables if name in self.assigned]
+
+        if not temporary_names:
+            return []
+
+        # They're set at once, as a variable can be assigned the value another one had before the iteration
+        return ["{}, = {},".format(", ".join(self.variables[name] for name in temporary_names),
+                                   ", ".join(self.names[name] for name in temporary_names))]
+
+    def _line(self, line):
+        """Add a line of source to the iteration."""
+        self.lines.append(line)
+
+    def _temporary(self):
+        """Return the name of a new temporary variable."""
+        self.temporaries += 1
+
+        return "_{}".format(self.temporaries)
+
+    def _guard(self, condition):
+        """Add a guard leaving the loop to the evaluator when the condition is true."""
+        self._line("if {}:".format(condition))
+        self._line("    break")
+
+    def _unsupported(self):
+        """Stop tracing the loop for good."""
+        self.unsupported = True
+
+        return None
+
+    def _statement(self, node):
+        """Trace a node whose value isn't used, returning whether it could be traced."""
+        if isinstance(node, ast.Expressions):
+            return all(self._statement(expression) for expression in node.expressions)
+
+        if isinstance(node, ast.IfOtherwise):
+            return self._if(node)
+
+        if isinstance(node, ast.Null):
+            return True
+
+        return self._expression(node) is not None
+
+    def _if(self, node):
+        """Trace IfOtherwise node, returning whether it could be traced."""
+        temporary_condition = self._expression(node.condition)
+
+        if temporary_condition is None:
+            return False
+
+        condition, taken = temporary_condition
+        temporary_branches = [self._branch(node.if_expression, taken is not None and not taken),
+                              self._branch(node.otherwise_expression, taken is not None and taken)]
+
+        # The branch the iteration takes has to be traced, and a branch that can't be is left to the evaluator
+        if taken is not None and not temporary_branches[0 if taken else 1]:
+            return False
+
+        if not temporary_branches[0] and not temporary_branches[1]:
+            return False
+
+        self._merge([branch for branch in temporary_branches if branch],
+                    temporary_branches[0 if taken else 1] if taken is not None else None)
+
+        for keyword, branch in (("if {}:".format(condition), temporary_branches[0]),
+                                ("else:", temporary_branches[1])):
+            self._line(keyword)
+            self.lines.extend("    " + line for line in ((branch[0] or ["pass"]) if branch else ["break"]))
+
+        return True
+
+    def _branch(self, node, blind):
+        """Trace a branch of an if, returning its lines, variables and values, or None if it can't be traced."""
+        temporary_state = (self.lines, self.names, self.values, self.unset, self.blind, self.unsupported,
+                           set(self.assigned))
+        self.lines, self.names, self.values, self.unset = [], dict(self.names), dict(self.values), set(self.unset)
+
+        # The variables have no value in a branch that isn't taken, since the iteration doesn't get there
+        if blind:
+            self.blind = True
+            self.values = dict.fromkeys(self.values)
+
+        traced = node is None or self._statement(node)
+        temporary_branch = (self.lines, self.names, self.values, self.unset) if traced else None
+
+        # A branch that isn't taken and can't be traced doesn't stop the loop from being traced
+        self.lines, self.names, self.values, self.unset, self.blind, unsupported, assigned = temporary_state
+        self.assigned = self.assigned if traced else assigned
+        self.unsupported = unsupported or self.unsupported and not blind
+
+        return temporary_branch
+
+    def _merge(self, branches, taken):
+        """Merge the variables of the branches of an if, so the rest of the iteration uses the same source for each."""
+        self.unset = set().union(*(unset for lines, names, values, unset in branches))
+
+        for name in dict.fromkeys(name for lines, names, values, unset in branches for name in names):
+            temporary_sources = [names.get(name, self.variables[name]) for lines, names, values, unset in branches]
+
+            if len(set(temporary_sources)) == 1:
+                self.names[name] = temporary_sources[0]
+            else:
+                temporary = self._temporary()
+
+                for (lines, names, values, unset), source in zip(branches, temporary_sources):
+                    lines.append("{} = {}".format(temporary, source))
+
+                self.names[name] = temporary
+
+            # A variable a branch doesn't set keeps the value it had before the iteration, which it may not have
+            if any(name not in names for lines, names, values, unset in branches) and name not in self.loaded:
+                if not self._load(name):
+                    self.unset.add(name)
+
+            self.values[name] = taken[2].get(name, self.loaded.get(name)) if taken is not None else None
+
+    def _expression(self, node):
+        """Trace a node, returning the source and the value of the integer it gives, or None if it can't be traced."""
+        node = self._operand(node)
+        method = getattr(self, "_trace_" + type(node).__name__.lower(), None)
+
+        return self._unsupported() if method is None else method(node)
+
+    def _trace_number(self, node):
+        """Trace Number node."""
+        temporary_value = value.Number(node.value).value
+
+        if temporary_value.__class__ is not int:
+            return self._unsupported()
+
+        return repr(temporary_value), temporary_value
+
+    def _trace_variable(self, node):
+        """Trace Variable node."""
+        name = node.variable
+
+        # The variable may be read before it's set, which the evaluator raises an error for
+        if name in self.unset:
+            return None
+
+        if name not in self.names:
+            if name not in self.loaded and not self._load(name):
+                return None
+
+            self.names[name], self.values[name] = self.variables[name], self.loaded[name]
+
+        return self.names[name], None if self.blind else self.values[name]
+
+    def _load(self, name):
+        """Load the variable before the loop, returning whether it's an integer now."""
+        temporary_value = self.symbol_table.get(name)
+
+        # The variables have to be integers when the loop is traced, and whenever the trace is ran
+        if temporary_value.__class__ is not value.Number or temporary_value.value.__class__ is not int:
+            return False
+
+        if name not in self.variables:
+            self.variables[name] = "v{}".format(len(self.variables))
+
+        temporary_variable = self.variables[name]
+
+        self.loads.append("{} = get({!r})".format(temporary_variable, name))
+        self.loads.append("if {0}.__class__ is not number or {0}.value.__class__ is not int:"
+                          .format(temporary_variable))
+        self.loads.append("    return 0")
+        self.loads.append("{0} = {0}.value".format(temporary_variable))
+
+        self.loaded[name] = temporary_value.value
+
+        return True
+
+    def _trace_assignmentoperation(self, node):
+        """Trace AssignmentOperation node."""
+        temporary_value = self._expression(node.value)
+
+        if temporary_value is None:
+            return None
+
+        # Variables the loop only assigns are stored back once they're assigned in an iteration
+        if node.variable not in self.variables:
+            temporary_variable = self.variables[node.variable] = "v{}".format(len(self.variables))
+            self.loads.append("{} = None".format(temporary_variable))
+
+        self.names[node.variable], self.values[node.variable] = temporary_value
+        self.assigned.add(node.variable)
+        self.unset.discard(node.variable)
+
+        return temporary_value
+
+    def _trace_unaryoperation(self, node):
+        """Trace UnaryOperation node."""
+        if node.operator not in ("-", "+", "not"):
+            return self._unsupported()
+
+        temporary_operand = self._expression(node.node)
+
+        if temporary_operand is None:
+            return None
+
+        if node.operator == "+":
+            return temporary_operand
+
+        temporary = self._temporary()
+
+        if node.operator == "-":
+            self._line("{} = -{}".format(temporary, temporary_operand[0]))
+
+            return temporary, None if temporary_operand[1] is None else -temporary_operand[1]
+
+        self._line("{} = 0 if {} else 1".format(temporary, temporary_operand[0]))
+
+        return temporary, None if temporary_operand[1] is None else 0 if temporary_operand[1] else 1
+
+    def _trace_binaryoperation(self, node):
+        """Trace BinaryOperation node."""
+        operator_ = node.operator
+
+        if operator_ not in self.ARITHMETIC and operator_ not in self.COMPARISONS and operator_ not in self.LOGICAL:
+            return self._unsupported()
+
+        temporary_left = self._expression(node.left_node)
+
+        if temporary_left is None:
+            return None
+
+        temporary_right = self._expression(node.right_node)
+
+        if temporary_right is None:
+            return None
+
+        (left, left_value), (right, right_value) = temporary_left, temporary_right
+        temporary = self._temporary()
+
+        # Operations in a branch that isn't taken have no value
+        known = left_value is not None and right_value is not None
+
+        if operator_ in self.LOGICAL:
+            self._line("{} = {} {} {}".format(temporary, left, operator_, right))
+
+            return temporary, self.LOGICAL[operator_](left_value, right_value) if known else None
+
+        if operator_ in self.COMPARISONS:
+            operation, function = self.COMPARISONS[operator_]
+            self._line("{} = 1 if {} {} {} else 0".format(temporary, left, operation, right))
+
+            return temporary, (1 if function(left_value, right_value) else 0) if known else None
+
+        operation, function = self.ARITHMETIC[operator_]
+
+        # Dividing by zero is an error, which the evaluator raises
+        if operator_ == "%":
+            if right_value == 0:
+                return None
+
+            if not isinstance(self._operand(node.right_node), ast.Number):
+                self._guard("{} == 0".format(right))
+
+        temporary_value = function(left_value, right_value) if known else None
+
+        # Bigger integers are turned into a float, which the evaluator does
+        if known and not -self.EXACT <= temporary_value <= self.EXACT:
+            return None
+
+        self._line("{} = {} {} {}".format(temporary, left, operation, right))
+
+        # The remainder is always smaller than the divisor
+        if operator_ != "%":
+            self._guard("not {} <= {} <= {}".format(-self.EXACT, temporary, self.EXACT))
+
+        return temporary, temporary_value
+
+    @staticmethod
+    def _operand(node):
+        """Return the expression in the brackets around an operand, which gives the same value."""
+        while isinstance(node, ast.Expressions) and len(node.expressions) == 1:
+            node = node.expressions[0]
+
+        return node
+
+
+def main():
+    """Debug the tracer.
+
+    Used as the entry-point when the file gets ran directly. It's usually used for debugging the class Tracer.
+
+    """
+    from nem.symbol_table import SymbolTable
+
+    tracer = Tracer()
+    symbol_table = SymbolTable()
+
+    while True:
+        for node in Parser(Lexer(input(">> "), "<stdin>").lex()).parse():
+            if isinstance(node, ast.While):
+                print(tracer.trace(node, symbol_table))
+            else:
+                print(Evaluator([node], symbol_table).evaluate().__next__())
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.evaluator import Evaluator
+    from nem.lexer import Lexer
+    from nem.parser import Parser
+
+    main()
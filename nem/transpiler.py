@@ -0,0 +1,609 @@
+"""Transpile the AST into Python.
+
+Holds class Transpiler which turns nodes into Python source, and class PythonEvaluator which evaluates the Abstract
+Syntax Tree created by the parser by compiling that source with compile() and running it.
+
+"""
+
+from nem.closures import ClosureEvaluator
+from nem.compiler import Code, Compiler
+from nem.evaluator import Evaluator
+from nem.exceptions import EvaluatorException
+from nem.vm import VirtualMachine
+import nem.interpreter
+import nem.nodes as ast
+import nem.types_ as value
+
+
+class Transpiler:
+
+    """Transpile nodes into Python source.
+
+    Each top-level expression and the body of each function becomes a Python function taking the symbol table. Nem
+    scoping is dynamic, so variables stay in the dictionary of the symbol table, while the value of each node is kept
+    in a temporary local variable. While loops become while loops, and return, continue and break become what they end
+    up in, a continue or a break of the loop, a return from the function or the error they cause. Values and nodes the
+    source needs are passed to it as the constants _c0, _c1, etc.
+
+    """
+
+    # Number operations of BINARY that give a number, and the Python operator of each one
+    ARITHMETIC = {"+": "+", "-": "-", "%": "%", "*": "*"}
+
+    # Number operations of BINARY that give a truth value, and the Python operator of each one
+    COMPARISONS = {"is": "==", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+    def __init__(self):
+        """Initialize Transpiler class."""
+        self._reset()
+
+    def _reset(self):
+        """Start transpiling another function."""
+        self.lines = []
+        self.constants = []
+        self.indentation = 0
+        self.temporaries = 0
+
+        # Index of each constant, by its identity
+        self._indexes = {}
+
+        # Names of the constants that are numbers
+        self.numbers = set()
+
+        # Names of the symbol table, and of its dictionary, expressions are evaluated in
+        self.table = "symbol_table"
+        self.symbols = "symbols"
+
+    def _line(self, line):
+        """Add a line of source."""
+        self.lines.append("    " * self.indentation + line)
+
+    def _start(self, line):
+        """Add a line starting a block and return where the block starts."""
+        self._line(line)
+        self.indentation += 1
+
+        return len(self.lines)
+
+    def _end(self, start):
+        """End the block that starts at the start."""
+        if len(self.lines) == start:
+            self._line("pass")
+
+        self.indentation -= 1
+
+    def _temporary(self):
+        """Return the name of a new temporary variable."""
+        self.temporaries += 1
+
+        return "_{}".format(self.temporaries)
+
+    def _constant(self, constant):
+        """Return the name of the constant, adding it if it's not in the constants yet."""
+        index = self._indexes.get(id(constant))
+
+        if index is None:
+            index = self._indexes[id(constant)] = len(self.constants)
+            self.constants.append(constant)
+
+        return "_c{}".format(index)
+
+    def _signal(self, context, kind, value_):
+        """Transpile a return, continue or break into what it ends up in, its kind being its index in the errors."""
+        if context[0] == Compiler.ERROR:
+            location = self._constant(context[2])
+            self._line("raise EvaluatorException({}.format({}.filename, {}.line))"
+                       .format(self._constant(context[1][kind]), location, location))
+        elif context[0] == Compiler.LOOP:
+            # Continue and return go on with the loop, break leaves it
+            self._line("break" if kind == 2 else "continue")
+        elif context[0] == Compiler.FUNCTION:
+            # Only return gives the function a value
+            self._line("return {}".format(value_ if kind == 0 else "NULL"))
+
+        return "NULL"
+
+    def _transpile_number(self, node, _):
+        """Transpile Number node."""
+        constant = self._constant(value.Number(node.value))
+        self.numbers.add(constant)
+
+        return constant
+
+    def _transpile_variable(self, node, _):
+        """Transpile Variable node."""
+        temporary = self._temporary()
+
+        self._line("{} = {}.get({!r})".format(temporary, self.symbols, node.variable))
+        start = self._start("if {} is None:".format(temporary))
+        self._line("{} = variable({}, {!r}, {})".format(temporary, self.table, node.variable, self._constant(node)))
+        self._end(start)
+
+        return temporary
+
+    def _transpile_text(self, node, _):
+        """Transpile Text node."""
+        return self._constant(value.Text(node.text))
+
+    def _transpile_list(self, node, _):
+        """Transpile List node."""
+        elements = [self._transpile_node(element, (Compiler.ERROR, Compiler.LIST_ERRORS, node))
+                    for element in node.elements]
+        temporary = self._temporary()
+
+        self._line("{} = List([{}])".format(temporary, ", ".join(elements)))
+
+        return temporary
+
+    def _transpile_listindex(self, node, context):
+        """Transpile ListIndex node."""
+        holder = self._transpile_node(node.holder, context)
+        index = self._transpile_node(node.index, (Compiler.ERROR, Compiler.INDEX_ERRORS, node))
+        temporary = self._temporary()
+
+        self._line("{} = index_value({}, {}, {})".format(temporary, self._constant(node), holder, index))
+
+        return temporary
+
+    def _transpile_expressions(self, node, context):
+        """Transpile Expressions node."""
+        temporary = "NULL"
+
+        for expression in node.expressions:
+            temporary = self._transpile_node(expression, context)
+
+        return temporary
+
+    def _transpile_unaryoperation(self, node, _):
+        """Transpile UnaryOperation node."""
+        operand = self._transpile_node(node.node, (Compiler.ERROR, Compiler.UNARY_ERRORS, node))
+        temporary = self._temporary()
+
+        if node.operator not in Code.UNARY_OPERATORS:
+            self._line("raise EvaluatorException(\"Evaluation Error (File {{}}) (Line {{}}): Unary operator {!r} not "
+                       "implemented\".format({}.filename, {}.line))"
+                       .format(node.operator, self._constant(node), self._constant(node)))
+
+            return "NULL"
+
+        self._line("{} = unary({}, {!r}, {})".format(temporary, self._constant(node), node.operator, operand))
+
+        return temporary
+
+    def _transpile_binaryoperation(self, node, context):
+        """Transpile BinaryOperation node."""
+        left = self._transpile_node(node.left_node, context)
+        right = self._transpile_node(node.right_node, context)
+        temporary = self._temporary()
+
+        if node.operator not in Code.BINARY_OPERATORS:
+            self._line("raise EvaluatorException(\"Evaluation Error (File {{}}) (Line {{}}): Binary operator {!r} not "
+                       "implemented\".format({}.filename, {}.line))"
+                       .format(node.operator, self._constant(node), self._constant(node)))
+
+            return "NULL"
+
+        generic = "{} = binary({}, {}, {}, {})".format(temporary, Code.BINARY_OPERATORS.index(node.operator),
+                                                      self._constant(node), left, right)
+
+        if node.operator not in self.ARITHMETIC and node.operator not in self.COMPARISONS:
+            self._line(generic)
+
+            return temporary
+
+        # Gives the same number the methods of class Number would, without calling them
+        if node.operator in self.ARITHMETIC:
+            fast = "{} = number({}.value {} {}.value)".format(temporary, left, self.ARITHMETIC[node.operator], right)
+        else:
+            fast = "{} = TRUE if {}.value {} {}.value else FALSE".format(temporary, left,
+                                                                        self.COMPARISONS[node.operator], right)
+
+        # Operands that are numbers in the constants aren't checked
+        checks = ["{}.__class__ is Number".format(operand) for operand in (left, right) if operand not in self.numbers]
+
+        if checks:
+            start = self._start("if {}:".format(" and ".join(checks)))
+            self._line(fast)
+            self._end(start)
+
+            start = self._start("else:")
+            self._line(generic)
+            self._end(start)
+        else:
+            self._line(fast)
+
+        return temporary
+
+    def _transpile_assignmentoperation(self, node, _):
+        """Transpile AssignmentOperation node."""
+        temporary = self._transpile_node(node.value, (Compiler.ERROR, Compiler.ASSIGNMENT_ERRORS, node))
+
+        self._line("{}[{!r}] = {}".format(self.symbols, node.variable, temporary))
+
+        return temporary
+
+    def _transpile_ifotherwise(self, node, context):
+        """Transpile IfOtherwise node."""
+        condition = self._transpile_node(node.condition, (Compiler.ERROR, Compiler.CONDITION_ERRORS, node))
+
+        start = self._start("if {}.value:".format(condition))
+        self._transpile_node(node.if_expression, context)
+        self._end(start)
+
+        if node.otherwise_expression is not None:
+            start = self._start("else:")
+            self._transpile_node(node.otherwise_expression, context)
+            self._end(start)
+
+        # Only return, continue and break make it out of an if
+        return "NULL"
+
+    def _transpile_while(self, node, _):
+        """Transpile While node."""
+        # The condition is checked at the start of the loop, so continue checks it as well
+        body = self._start("while True:")
+
+        # The condition is checked for return, continue and break on every iteration, as it can give one on any of them
+        condition = self._transpile_node(node.condition, (Compiler.ERROR, Compiler.CONDITION_ERRORS, node))
+        end = self._start("if not {}.value:".format(condition))
+        self._line("break")
+        self._end(end)
+
+        self._transpile_node(node.expression, (Compiler.LOOP,))
+
+        self._end(body)
+
+        return "NULL"
+
+    def _transpile_functiondefinition(self, node, _):
+        """Transpile FunctionDefinition node."""
+        temporary = self._temporary()
+
+        self._line("{} = {}[{!r}] = Function({}, {})".format(temporary, self.symbols, node.name,
+                                                            self._constant(node.parameters),
+                                                            self._constant(node.expression)))
+
+        return temporary
+
+    def _transpile_functioncall(self, node, context):
+        """Transpile FunctionCall node."""
+        # Calls of calls call the function the inner call returns
+        if isinstance(node.name, ast.FunctionCall):
+            function = self._transpile_node(node.name, context)
+        else:
+            function = self._temporary()
+
+            self._line("{} = {}.get({!r})".format(function, self.symbols, node.name))
+            start = self._start("if {} is None:".format(function))
+            self._line("{} = find({}, {!r}, {})".format(function, self.table, node.name, self._constant(node)))
+            self._end(start)
+
+        start = self._start("if len({}.parameters) != {}:".format(function, len(node.arguments)))
+        self._line("check_arguments({}, {}, {})".format(self._constant(node), function, len(node.arguments)))
+        self._end(start)
+
+        # Arguments are evaluated in the symbol table of the call
+        table, symbols = self.table, self.symbols
+        self.table, self.symbols = self._temporary(), self._temporary()
+
+        self._line("{} = {}.scope()".format(self.table, table))
+        self._line("{} = {}.symbols".format(self.symbols, self.table))
+
+        for index, argument in enumerate(node.arguments):
+            argument = self._transpile_node(argument, (Compiler.ERROR, Compiler.ARGUMENT_ERRORS, node))
+            self._line("{}[{}.parameters[{}]] = {}".format(self.symbols, function, index, argument))
+
+        temporary = self._temporary()
+
+        start = self._start("if {}.__class__ is Function:".format(function))
+        self._line("{} = body({})({})".format(temporary, function, self.table))
+        self._end(start)
+        start = self._start("else:")
+        self._line("{} = call({}, {}, {})".format(temporary, self._constant(node), function, self.table))
+        self._end(start)
+
+        self.table, self.symbols = table, symbols
+
+        return temporary
+
+    def _transpile_inlinecall(self, node, context):
+        """Transpile InlineCall node."""
+        function = self._constant(value.Function(node.parameters, node.expression))
+
+        # Arguments are evaluated in the symbol table of the call
+        table, symbols = self.table, self.symbols
+        self.table, self.symbols = self._temporary(), self._temporary()
+
+        self._line("{} = {}.scope()".format(self.table, table))
+        self._line("{} = {}.symbols".format(self.symbols, self.table))
+
+        for parameter, argument in zip(node.parameters, node.arguments):
+            argument = self._transpile_node(argument, (Compiler.ERROR, Compiler.ARGUMENT_ERRORS, node))
+            self._line("{}[{!r}] = {}".format(self.symbols, parameter, argument))
+
+        temporary = self._temporary()
+        self._line("{} = body({})({})".format(temporary, function, self.table))
+
+        self.table, self.symbols = table, symbols
+
+        return temporary
+
+    def _transpile_import(self, node, _):
+        """Transpile Import node."""
+        temporary = self._temporary()
+
+        self._line("{} = import_({}, {})".format(temporary, self._constant(node), self.table))
+
+        return temporary
+
+    def _transpile_return(self, node, context):
+        """Transpile Return node."""
+        temporary = self._transpile_node(node.value, (Compiler.ERROR, Compiler.RETURN_ERRORS, node))
+
+        return self._signal(context, 0, temporary)
+
+    def _transpile_continue(self, _, context):
+        """Transpile Continue node."""
+        return self._signal(context, 1, None)
+
+    def _transpile_break(self, _, context):
+        """Transpile Break node."""
+        return self._signal(context, 2, None)
+
+    @staticmethod
+    def _transpile_null(_, __):
+        """Transpile Null node."""
+        return "NULL"
+
+    def _transpile_node(self, node, context):
+        """Transpile a node, adding the lines that evaluate it, and return the Python expression of its value.
+
+        The context is what return, continue and break in the node end up in, the same as for class Compiler.
+
+        """
+        try:
+            method = getattr(self, "_transpile_{}".format(type(node).__name__.lower()))
+        except AttributeError:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): Node '{}' is not defined"
+                .format(node.filename, node.line, type(node).__name__)
+            )
+
+        return method(node, context)
+
+    def _source(self, name):
+        """Return the name, the source and the constants of the function that was transpiled."""
+        return name, "\n".join(["def {}(symbol_table):".format(name), "    symbols = symbol_table.symbols"] +
+                               self.lines), self.constants
+
+    def transpile(self, node):
+        """Transpile a top-level expression into a function returning its value.
+
+        Returns the name of the function, its source and the constants it uses.
+
+        """
+        self._reset()
+        self.indentation = 1
+
+        self._line("return {}".format(self._transpile_node(node, (Compiler.ERROR, Compiler.TOP_LEVEL_ERRORS, node))))
+
+        return self._source("line_{}".format(node.line))
+
+    def function(self, function):
+        """Transpile the body of a function into a function returning the value the function gives.
+
+        Returns the name of the function, its source and the constants it uses.
+
+        """
+        self._reset()
+        self.indentation = 1
+
+        self._transpile_node(function.body, (Compiler.FUNCTION,))
+        self._line("return NULL")
+
+        return self._source("function_{}".format(function.body.line))
+
+    @classmethod
+    def _definitions(cls, node):
+        """Yield the functions defined in the node, in the order they're defined in."""
+        if isinstance(node, ast.FunctionDefinition):
+            yield value.Function(node.parameters, node.expression)
+
+        for field in node.fields():
+            children = getattr(node, field)
+
+            for child in children if isinstance(children, list) else [children]:
+                if isinstance(child, ast.Node):
+                    yield from cls._definitions(child)
+
+    def emit(self, abstract_syntax_tree):
+        """Yield the Python source of each top-level expression and of the functions defined in it.
+
+        Each source starts with comments holding the constants it uses.
+
+        """
+        for node in abstract_syntax_tree:
+            for name, source, constants in [self.transpile(node)] + list(map(self.function, self._definitions(node))):
+                yield "\n".join(["# _c{} = {!r}".format(index, constant) for index, constant in enumerate(constants)] +
+                                [source])
+
+
+class PythonEvaluator:
+
+    """Evaluate the AST as Python.
+
+    Used instead of class Evaluator, with the same results. Each top-level expression gets transpiled into Python
+    source, which is compiled with compile() and ran, so the Python interpreter runs Nem code. Functions get transpiled
+    the first time they're called. Code Python can't compile, like loops nested too deeply, is evaluated with closures
+    instead.
+
+    """
+
+    def __init__(self, abstract_syntax_tree, symbol_table):
+        """Initialize PythonEvaluator class."""
+        self.abstract_syntax_tree = abstract_syntax_tree
+        self.symbol_table = symbol_table
+
+        self.transpiler = Transpiler()
+        self.closures = ClosureEvaluator(None, symbol_table)
+
+        # Compiled function of the body of each function, by the identity of the body, which is kept along with it
+        self.functions = {}
+
+        # Names the transpiled source uses, other than its constants
+        self.namespace = {
+            "EvaluatorException": EvaluatorException,
+            "NULL": value.Null(),
+            "TRUE": VirtualMachine.TRUE,
+            "FALSE": VirtualMachine.FALSE,
+            "Number": value.Number,
+            "List": value.List,
+            "Function": value.Function,
+            "number": self.number,
+            "binary": self.binary,
+            "unary": VirtualMachine.unary,
+            "index_value": VirtualMachine.index_value,
+            "check_arguments": VirtualMachine.check_arguments,
+            "variable": self.variable,
+            "find": self.find,
+            "body": self.body,
+            "call": self.call,
+            "import_": self._import
+        }
+
+    @staticmethod
+    def number(result):
+        """Return the number of the result of an operation on the values of two numbers."""
+        if result.__class__ is int and -VirtualMachine.EXACT <= result <= VirtualMachine.EXACT:
+            temporary = value.Number.__new__(value.Number)
+            temporary.value = result
+
+            return temporary
+
+        return value.Number(result)
+
+    @staticmethod
+    def binary(index, node, left, right):
+        """Apply the binary operator at the index of the operators."""
+        try:
+            return VirtualMachine.BINARY_OPERATIONS[index](left, right)
+        except (NotImplementedError, TypeError):
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): Cannot apply binary operator '{}' to '{}' and '{}'"
+                .format(node.filename, node.line, node.operator, type(left).__name__, type(right).__name__)
+            )
+
+    @staticmethod
+    def variable(symbol_table, name, node):
+        """Return the value of a variable that isn't in the symbols of the symbol table itself."""
+        temporary = symbol_table.get(name)
+
+        if temporary is None:
+            raise EvaluatorException("Evaluation Error (File {}) (Line {}): Variable '{}' is not defined"
+                                     .format(node.filename, node.line, name))
+
+        return temporary
+
+    @staticmethod
+    def find(symbol_table, name, node):
+        """Return the function called by name that isn't in the symbols of the symbol table itself."""
+        temporary = symbol_table.get(name)
+
+        if temporary is None:
+            raise EvaluatorException("Evaluation Error (File {}) (Line {}): Function '{}' is not defined"
+                                     .format(node.filename, node.line, name))
+
+        return temporary
+
+    def call(self, node, function, symbol_table):
+        """Call a function that isn't a Function itself, with its arguments already set in the symbol table."""
+        if isinstance(function, value.Function):
+            return self.body(function)(symbol_table)
+        elif isinstance(function, value.BuiltInFunction):
+            return Evaluator.call_built_in(node, function, symbol_table)
+
+        raise EvaluatorException(
+            "Evaluation Error (File {}) (Line {}): Function type '{}' not implemented"
+            .format(node.filename, node.line, type(function))
+        )
+
+    def _compile(self, transpile, fallback):
+        """Return the function compiled from what transpile returns, or what fallback returns if it can't be."""
+        try:
+            name, source, constants = transpile()
+
+            namespace = dict(self.namespace)
+            namespace.update(("_c{}".format(index), constant) for index, constant in enumerate(constants))
+
+            exec(compile(source, "<nem>", "exec"), namespace)
+        except (SyntaxError, RecursionError, MemoryError):
+            # Python limits how deeply blocks are nested
+            return fallback()
+
+        return namespace[name]
+
+    def body(self, function):
+        """Return the compiled function of the body of a function, compiling it the first time."""
+        compiled = self.functions.get(id(function.body))
+
+        if compiled is not None and compiled[0] is function.body:
+            return compiled[1]
+
+        body = self._compile(lambda: self.transpiler.function(function), lambda: self.closures.function(function))
+        self.functions[id(function.body)] = function.body, body
+
+        return body
+
+    @staticmethod
+    def _import(node, symbol_table):
+        """Import a file, evaluating it as Python as well."""
+        try:
+            with open("{}.nem".format(node.file), "rb") as nem_file:
+                nem.interpreter.Interpreter(nem_file, node.file, symbol_table, cache=True,
+                                            evaluator=PythonEvaluator, inline=False)
+        except FileNotFoundError:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): File '{}.nem' doesn't exist"
+                .format(node.filename, node.line, node.file)
+            )
+
+        return value.Null()
+
+    def _evaluate_all(self):
+        """Evaluate all nodes."""
+        for node in self.abstract_syntax_tree:
+            expression = self._compile(
+                lambda: self.transpiler.transpile(node),
+                lambda: self.closures.compile(node)
+            )
+
+            yield expression(self.symbol_table)
+
+    def evaluate(self):
+        """Evaluate the AST.
+
+        Transpiles each top-level expression of the Abstract Syntax Tree created by the parser into Python and runs it.
+
+        """
+        return self._evaluate_all()
+
+
+def main():
+    """Debug the transpiler.
+
+    Used as the entry-point when the file gets ran directly. Used for debugging the class Transpiler.
+
+    """
+    transpiler = Transpiler()
+
+    while True:
+        for source in transpiler.emit(Parser(Lexer(input(">> ") + "\n", "<stdin>").lex()).parse()):
+            print(source)
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.lexer import Lexer
+    from nem.parser import Parser
+
+    main()
@@ -0,0 +1,336 @@
+"""Hold VirtualMachine class.
+
+Holds the VirtualMachine class which evaluates the Abstract Syntax Tree created by the parser by compiling it into
+bytecode and running it.
+
+"""
+
+import operator
+
+from nem.compiler import Code, Compiler
+from nem.evaluator import Evaluator
+from nem.exceptions import EvaluatorException
+import nem.interpreter
+import nem.types_ as value
+
+
+class VirtualMachine:
+
+    """Evaluate the AST as bytecode.
+
+    Used instead of class Evaluator, with the same results. Each top-level expression is compiled into bytecode and ran
+    by a loop over its instructions, with an explicit stack of values and of function calls. Functions get compiled the
+    first time they're called.
+
+    """
+
+    # Operations of BINARY, indexed by its argument
+    BINARY_OPERATIONS = (
+        operator.add, operator.sub, operator.mod, operator.mul, operator.truediv, operator.pow,
+        lambda left, right: left or right, lambda left, right: left and right,
+        operator.eq, operator.lt, operator.le, operator.gt, operator.ge
+    )
+
+    # Operations of BINARY on the values of two numbers, which skip the methods of class Number, or None
+    NUMBER_OPERATIONS = (
+        operator.add, operator.sub, operator.mod, operator.mul, None, None, None, None,
+        operator.eq, operator.lt, operator.le, operator.gt, operator.ge
+    )
+
+    # Integers a number keeps as they are, as they don't change when turned into a float
+    EXACT = 1 << 53
+
+    TRUE = value.Number(1)
+    FALSE = value.Number(0)
+
+    def __init__(self, abstract_syntax_tree, symbol_table):
+        """Initialize VirtualMachine class."""
+        self.abstract_syntax_tree = abstract_syntax_tree
+        self.symbol_table = symbol_table
+
+        self.compiler = Compiler()
+
+    @staticmethod
+    def unary(node, operator_, operand):
+        """Apply a unary operator."""
+        if operator_ == "not":
+            if isinstance(operand, (value.Number, value.Text, value.List)):
+                return value.Number(0 if operand.value else 1)
+            elif isinstance(operand, value.Null):
+                return value.Number(1)
+        elif isinstance(operand, value.Number):
+            return operand if operator_ == "+" else value.Number(-operand.value)
+
+        raise EvaluatorException(
+            "Evaluation Error (File {}) (Line {}): Cannot apply unary operator '{}' on '{}'"
+            .format(node.filename, node.line, operator_, type(operand).__name__)
+        )
+
+    @staticmethod
+    def index_value(node, holder, index):
+        """Index a text or a list."""
+        if not isinstance(index, value.Number):
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): List index has to be a number"
+                .format(node.filename, node.line)
+            )
+
+        try:
+            # Text indexing
+            if isinstance(holder, value.Text):
+                return value.Text(holder.value[index.value])
+            # List indexing
+            elif isinstance(holder, value.List):
+                return holder.value[index.value]
+            else:
+                raise EvaluatorException(
+                    "Evaluation Error (Filename {}) (Line {}): '{}' does not support indexing"
+                    .format(node.filename, node.line, type(holder).__name__)
+                )
+        except IndexError:
+            raise EvaluatorException(
+                "Evaluation Error (Filename {}) (Line {}): Index out of range"
+                .format(node.filename, node.line)
+            )
+
+    @staticmethod
+    def check_arguments(node, function, count):
+        """Check the number of arguments of a function call."""
+        difference = len(function.parameters) - count
+
+        if difference > 0:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): Function call for function '{}' is missing {} argument(s)"
+                .format(node.filename, node.line, node.name, difference)
+            )
+        elif difference < 0:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): Function call for function '{}' has too many argument(s) ({})"
+                .format(node.filename, node.line, node.name, abs(difference))
+            )
+
+    def _run(self, code, symbol_table):
+        """Run the code of a top-level expression and return its value."""
+        instructions = code.instructions
+        constants = code.constants
+        symbols = symbol_table.symbols
+        index = 0
+
+        # Values, and the code, the next index and the start of the values of each function being called
+        stack = []
+        calls = []
+        base = 0
+
+        binary_operations = self.BINARY_OPERATIONS
+        number_operations = self.NUMBER_OPERATIONS
+        number = value.Number
+        exact = self.EXACT
+        true = self.TRUE
+        false = self.FALSE
+
+        # Opcodes are compared as local variables, which is faster than looking them up in class Code every time
+        (CONSTANT, LOAD, STORE, POP, BINARY, UNARY, LIST, INDEX, JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, FUNCTION, FIND,
+         ENTER, ARGUMENT, CALL, RETURN, IMPORT, RAISE, END, ASSIGN) = range(len(Code.NAMES))
+
+        while True:
+            opcode, argument = instructions[index]
+            index += 1
+
+            if opcode == LOAD:
+                temporary = symbols.get(constants[argument])
+
+                if temporary is None:
+                    temporary = symbol_table.get(constants[argument])
+
+                    if temporary is None:
+                        node = code.location(index - 1)
+                        raise EvaluatorException("Evaluation Error (File {}) (Line {}): Variable '{}' is not defined"
+                                                 .format(node.filename, node.line, constants[argument]))
+
+                stack.append(temporary)
+            elif opcode == CONSTANT:
+                stack.append(constants[argument])
+            elif opcode == BINARY:
+                right = stack.pop()
+                left = stack[-1]
+
+                # Gives the same number the methods of class Number would, without calling them
+                if number_operations[argument] is not None and type(left) is number and type(right) is number:
+                    temporary = number_operations[argument](left.value, right.value)
+
+                    if temporary.__class__ is bool:
+                        stack[-1] = true if temporary else false
+                    elif temporary.__class__ is int and -exact <= temporary <= exact:
+                        stack[-1] = number.__new__(number)
+                        stack[-1].value = temporary
+                    else:
+                        stack[-1] = number(temporary)
+
+                    continue
+
+                try:
+                    stack[-1] = binary_operations[argument](left, right)
+                except (NotImplementedError, TypeError):
+                    node = code.location(index - 1)
+                    raise EvaluatorException(
+                        "Evaluation Error (File {}) (Line {}): Cannot apply binary operator '{}' to '{}' and '{}'"
+                        .format(node.filename, node.line, node.operator, type(left).__name__, type(right).__name__)
+                    )
+            elif opcode == ASSIGN:
+                symbols[constants[argument]] = stack.pop()
+            elif opcode == STORE:
+                symbols[constants[argument]] = stack[-1]
+            elif opcode == POP:
+                del stack[-argument:]
+            elif opcode == JUMP_IF_FALSE:
+                if not stack.pop().value:
+                    index = argument
+            elif opcode == JUMP_IF_TRUE:
+                if stack.pop().value:
+                    index = argument
+            elif opcode == JUMP:
+                index = argument
+            elif opcode == FIND:
+                temporary = symbols.get(constants[argument])
+
+                if temporary is None:
+                    temporary = symbol_table.get(constants[argument])
+
+                    if temporary is None:
+                        node = code.location(index - 1)
+                        raise EvaluatorException("Evaluation Error (File {}) (Line {}): Function '{}' is not defined"
+                                                 .format(node.filename, node.line, node.name))
+
+                stack.append(temporary)
+            elif opcode == ENTER:
+                temporary = stack[-1]
+
+                if len(temporary.parameters) != argument:
+                    self.check_arguments(code.location(index - 1), temporary, argument)
+
+                # The symbol table of the caller waits on the stack until the call returns
+                stack.append(symbol_table)
+                symbol_table = symbol_table.scope()
+                symbols = symbol_table.symbols
+            elif opcode == ARGUMENT:
+                temporary = stack.pop()
+                symbols[stack[-2].parameters[argument]] = temporary
+            elif opcode == CALL:
+                temporary = stack[-2]
+
+                if isinstance(temporary, value.Function):
+                    calls.append((code, index, base))
+
+                    code = self.compiler.function(temporary)
+                    instructions = code.instructions
+                    constants = code.constants
+                    index = 0
+                    base = len(stack)
+                elif isinstance(temporary, value.BuiltInFunction):
+                    temporary = Evaluator.call_built_in(code.location(index - 1), temporary, symbol_table)
+
+                    symbol_table = stack.pop()
+                    symbols = symbol_table.symbols
+                    stack[-1] = temporary
+                else:
+                    node = code.location(index - 1)
+                    raise EvaluatorException(
+                        "Evaluation Error (File {}) (Line {}): Function type '{}' not implemented"
+                        .format(node.filename, node.line, type(temporary))
+                    )
+            elif opcode == RETURN:
+                temporary = stack.pop()
+                del stack[base:]
+
+                code, index, base = calls.pop()
+                instructions = code.instructions
+                constants = code.constants
+
+                symbol_table = stack.pop()
+                symbols = symbol_table.symbols
+                stack[-1] = temporary
+            elif opcode == LIST:
+                if argument:
+                    temporary = value.List(stack[-argument:])
+                    del stack[-argument:]
+                else:
+                    temporary = value.List([])
+
+                stack.append(temporary)
+            elif opcode == INDEX:
+                temporary = stack.pop()
+                stack[-1] = self.index_value(code.location(index - 1), stack[-1], temporary)
+            elif opcode == UNARY:
+                stack[-1] = self.unary(code.location(index - 1), Code.UNARY_OPERATORS[argument], stack[-1])
+            elif opcode == FUNCTION:
+                node = constants[argument]
+
+                temporary = value.Function(node.parameters, node.expression)
+                symbols[node.name] = temporary
+
+                stack.append(temporary)
+            elif opcode == END:
+                return stack.pop()
+            elif opcode == IMPORT:
+                stack.append(self._import(code.location(index - 1), symbol_table))
+            elif opcode == RAISE:
+                node = code.location(index - 1)
+                raise EvaluatorException(constants[argument].format(node.filename, node.line))
+            else:
+                raise EvaluatorException("Evaluation Error: Opcode {} not implemented".format(opcode))
+
+    @staticmethod
+    def _import(node, symbol_table):
+        """Import a file, evaluating it with a virtual machine as well."""
+        try:
+            with open("{}.nem".format(node.file), "rb") as nem_file:
+                nem.interpreter.Interpreter(nem_file, node.file, symbol_table, cache=True,
+                                            evaluator=VirtualMachine, inline=False)
+        except FileNotFoundError:
+            raise EvaluatorException(
+                "Evaluation Error (File {}) (Line {}): File '{}.nem' doesn't exist"
+                .format(node.filename, node.line, node.file)
+            )
+
+        return value.Null()
+
+    def _evaluate_all(self):
+        """Evaluate all nodes."""
+        for node in self.abstract_syntax_tree:
+            yield self._run(self.compiler.compile(node), self.symbol_table)
+
+    def evaluate(self):
+        """Evaluate the AST.
+
+        Compiles each top-level expression of the Abstract Syntax Tree created by the parser and runs it.
+
+        """
+        return self._evaluate_all()
+
+
+def main():
+    """Debug the virtual machine.
+
+    Used as the entry-point when the file gets ran directly. Used for debugging the class VirtualMachine.
+
+    """
+    # Built-in variables and functions
+    symbol_table = SymbolTable()
+    symbol_table.set("true", value.Number(1))
+    symbol_table.set("false", value.Number(0))
+    symbol_table.set("print", value.BuiltInFunction(["element"], 0))
+    symbol_table.set("input", value.BuiltInFunction([], 1))
+    symbol_table.set("convert", value.BuiltInFunction(["value", "type"], 2))
+
+    while True:
+        print(list(VirtualMachine(Parser(Lexer(input(">> ") + "\n", "<stdin>").lex()).parse(), symbol_table)
+                   .evaluate()))
+
+
+if __name__ == "__main__":
+    # Only activates when the file gets ran directly.
+    from nem.lexer import Lexer
+    from nem.parser import Parser
+    from nem.symbol_table import SymbolTable
+
+    main()
@@ -0,0 +1,141 @@
+"""Test for Cache class.
+
+Unit testing for the Cache class.
+
+"""
+
+
+import os
+import pathlib
+import tempfile
+import unittest
+from nem.cache import Cache
+from nem.interpreter import Interpreter
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.symbol_table import SymbolTable
+from nem.types_ import *
+
+
+class CacheTestCase(unittest.TestCase):
+
+    """Unit test Cache class.
+
+    Used for unit testing the Cache class.
+
+    """
+
+    def test_load(self):
+        """Test the load method.
+
+        Tests running code with and without a valid cache.
+
+        """
+        symbol_table = SymbolTable()
+        symbol_table.set("true", Number(1))
+        symbol_table.set("false", Number(0))
+        symbol_table.set("print", BuiltInFunction(["element"], 0))
+        symbol_table.set("input", BuiltInFunction([], 1))
+        symbol_table.set("convert", BuiltInFunction(["value", "type"], 2))
+
+        with open("test_cases/test_evaluator.in", "rb") as _input:
+            _input = _input.read()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.nem")
+
+            with open(path, "wb") as nem_file:
+                nem_file.write(_input)
+
+            with open(path, "rb") as nem_file:
+                interpreter = Interpreter(nem_file, path, symbol_table, cache=True)
+
+            self.assertIsNotNone(interpreter.parser)
+            self.assertTrue(os.path.exists(os.path.join(directory, "__nemcache__", "test.nemc")))
+
+            with open(path, "rb") as nem_file:
+                cached = Interpreter(nem_file, path, symbol_table, cache=True)
+
+            # Loaded nodes are located in the code they're loaded for
+            parsed = list(Parser(Lexer(_input, path).lex()).parse())
+            self.assertIsNone(cached.parser)
+            self.assertEqual(repr(cached.ast), repr(parsed))
+            self.assertEqual([node.line for node in cached.ast], [node.line for node in parsed])
+            self.assertEqual(repr(cached.return_values), repr(interpreter.return_values))
+
+            # Files are hashed in chunks, the same as the code they hold
+            cache = Cache(path)
+            cache.CHUNK_SIZE = 7
+
+            with open(path, "rb") as nem_file:
+                self.assertEqual(cache.header(nem_file), cache.header(_input))
+                self.assertEqual(nem_file.tell(), 0)
+
+            self.assertEqual(cache.header(pathlib.Path(path)), cache.header(_input))
+
+            # Different code or another version of Nem isn't loaded
+            self.assertIsNotNone(cache.load(cache.header(_input), path))
+            self.assertIsNone(cache.load(cache.header(_input + b"\n1\n"), path))
+
+            cache.VERSION = "0.0.0"
+            self.assertIsNone(cache.load(cache.header(_input), path))
+
+            with open(cache.path, "r+b") as cache_file:
+                cache_file.seek(-8, os.SEEK_END)
+                cache_file.write(b"\0" * 8)
+
+            self.assertIsNone(Cache(path).load(Cache(path).header(_input), path))
+
+    def test_dump(self):
+        """Test the dump method.
+
+        Tests when code gets cached.
+
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.nem")
+
+            with open(path, "wb") as nem_file:
+                nem_file.write(b"a = 1\nb\nc = 2\n")
+
+            # Code that fails while it's evaluated is still cached once all of it is parsed
+            with self.assertRaises(Exception):
+                Interpreter(pathlib.Path(path), path, SymbolTable(), cache=True)
+
+            self.assertEqual([node.line for node in Cache(path).load(Cache(path).header(pathlib.Path(path)), path)],
+                             [1, 2, 3])
+
+            # Code that doesn't parse isn't
+            os.remove(Cache(path).path)
+
+            with open(path, "wb") as nem_file:
+                nem_file.write(b"a = 1\nb\nc = (\n")
+
+            with self.assertRaises(Exception):
+                Interpreter(pathlib.Path(path), path, SymbolTable(), cache=True)
+
+            self.assertFalse(os.path.exists(Cache(path).path))
+
+            # Streams that can't be read again and code run with the cache turned off aren't cached
+            read, write = os.pipe()
+            os.write(write, b"a = 1\n")
+            os.close(write)
+
+            with open(read, "rb") as pipe:
+                self.assertEqual(Interpreter(pipe, path, SymbolTable(), cache=True).symbol_table.get("a").value, 1)
+
+            self.assertFalse(os.path.exists(Cache(path).path))
+
+            Cache.ENABLED = False
+
+            try:
+                Interpreter("a = 1\n", path, SymbolTable(), cache=True)
+            finally:
+                Cache.ENABLED = True
+
+            self.assertFalse(os.path.exists(Cache(path).path))
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
@@ -0,0 +1,87 @@
+"""Test for ClosureEvaluator class.
+
+Unit testing for the ClosureEvaluator class.
+
+"""
+
+
+import unittest
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.closures import ClosureEvaluator
+from nem.evaluator import Evaluator
+from nem.interpreter import Interpreter
+from nem.symbol_table import SymbolTable
+from nem.types_ import *
+from nem.exceptions import EvaluatorException
+
+
+class ClosureEvaluatorTestCase(unittest.TestCase):
+
+    """Unit test ClosureEvaluator class.
+
+    Used for unit testing the ClosureEvaluator class.
+
+    """
+
+    def test_evaluate(self):
+        """Test the evaluate method.
+
+        Tests the closure evaluator gives the same values as the evaluator.
+
+        """
+        symbol_table = SymbolTable()
+        symbol_table.set("true", Number(1))
+        symbol_table.set("false", Number(0))
+        symbol_table.set("print", BuiltInFunction(["element"], 0))
+        symbol_table.set("input", BuiltInFunction([], 1))
+        symbol_table.set("convert", BuiltInFunction(["value", "type"], 2))
+
+        with open("test_cases/test_evaluator.in") as _input:
+            _input = _input.read()
+
+        with open("test_cases/test_evaluator.out") as output:
+            output = output.read()
+
+        self.assertEqual(
+            "".join(map(repr, ClosureEvaluator(Parser(Lexer(_input, "test").lex()).parse(), symbol_table).evaluate())),
+            output
+        )
+
+        with open("test_cases/test_evaluator.in", "rb") as _input:
+            interpreter = Interpreter(_input, "test", symbol_table, evaluator=ClosureEvaluator)
+
+        self.assertIsInstance(interpreter.evaluator, ClosureEvaluator)
+        self.assertEqual("".join(map(repr, interpreter.return_values)), output)
+
+        # Return, continue and break end up where they would with the evaluator
+        for code in ("function f() (while (0) (return 5)\nreturn 6)\nf()\n",
+                     "i = 0\nwhile (i < 5) (i = i + 1\nif (i is 2) (continue)\nif (i is 4) (break))\ni\n",
+                     "function g(a, b) (return a - b)\ng(3, 1 + g(2, 1))\n",
+                     "function h() (return function k() (return 7))\nh()()\n",
+                     "function m(a) (if (a) (break) otherwise (return 2) + 1)\n[m(0), m(1)]\n",
+                     "[1, \"a\", [2]][2][0] + 1 * 2 ^ 3\n"):
+            self.assertEqual(
+                repr(list(ClosureEvaluator(Parser(Lexer(code, "test").lex()).parse(), symbol_table.copy())
+                          .evaluate())),
+                repr(list(Evaluator(Parser(Lexer(code, "test").lex()).parse(), symbol_table.copy()).evaluate()))
+            )
+
+        for code in ("\nvariable", "import \"test\"\n", "nem(1, 2)\n", "[1, 2][2]\n", "22 * [1, 2]\n",
+                     "[1, 2] ^ [1, 2]\n", "a = return 1\n", "while (return 1) (print(1))\n",
+                     "if (return 1) (print(1))\n", "return 2\n", "function f(a) (a)\nf()\n", "-\"a\"\n",
+                     # The condition of a loop can give a signal after its first iteration too
+                     "i = 0\nwhile ((if ((i = i + 1) is 2) (return 5)) or (i < 3)) (i)\n"):
+            with self.assertRaises(EvaluatorException):
+                list(ClosureEvaluator(Parser(Lexer(code, "<stdin>").lex()).parse(), symbol_table).evaluate())
+
+        # Functions are compiled once, the first time they're called
+        evaluator = ClosureEvaluator(Parser(Lexer("function f() (1)\nf()\nf()\n", "test").lex()).parse(),
+                                     SymbolTable())
+        list(evaluator.evaluate())
+        self.assertEqual(len(evaluator.functions), 1)
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
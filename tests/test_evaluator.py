@@ -9,8 +9,10 @@ import unittest
 from nem.lexer import Lexer
 from nem.parser import Parser
 from nem.evaluator import Evaluator
+from nem.interpreter import Interpreter
 from nem.symbol_table import SymbolTable
 from nem.types_ import *
+import nem.nodes as ast
 from nem.exceptions import EvaluatorException
 
 
@@ -46,6 +48,17 @@ class ParserTestCase(unittest.TestCase):
             output
         )
 
+        # Functions of a memory-mapped file can be called, as their code isn't copied along with them
+        with open("test_cases/test_evaluator.in", "rb") as _input:
+            interpreter = Interpreter(_input, "test", symbol_table)
+
+        self.assertEqual("".join(map(repr, interpreter.return_values)), output)
+
+        # The file is unmapped once it's evaluated, while its nodes keep their lines
+        self.assertEqual(interpreter.lexer.mappings, [])
+        self.assertIsNone(interpreter.lexer.source.code)
+        self.assertEqual(symbol_table.get("fib").body.line, 3)
+
         with self.assertRaises(EvaluatorException):
             list(Evaluator(Parser(Lexer("\nvariable", "<stdin>").lex()).parse(), symbol_table).evaluate())
 
@@ -77,6 +90,98 @@ class ParserTestCase(unittest.TestCase):
         with self.assertRaises(EvaluatorException):
             list(Evaluator(Parser(Lexer("return 2\n", "<stdin>").lex()).parse(), symbol_table).evaluate())
 
+    def test_cache(self):
+        """Test the inline caches of binary operations.
+
+        Tests binary operations on numbers give the same values as the methods of the numbers, until they're evaluated
+        with anything else.
+
+        """
+        definition, *calls = Parser(Lexer("function f(a, b) (return [a + b, a % b, a < b, a / b])\n"
+                                          "f(2, 3)\nf(2 ^ 60, 1.5)\nf(-7, 2)\nf(\"a\", \"b\")\nf(2, 3)\n", "test").lex()
+                                    ).parse()
+        symbol_table = SymbolTable()
+        values = list(Evaluator([definition] + calls[:3], symbol_table).evaluate())
+        addition, remainder, comparison, division = definition.expression.expressions[0].value.elements
+
+        expected = [List([Number(5), Number(2), Number(1), Number(2 / 3)]),
+                    List([Number(2 ** 60 + 1.5), Number(1), Number(0), Number(2 ** 60 / 1.5)]),
+                    List([Number(-5), Number(1), Number(1), Number(-3.5)])]
+
+        self.assertEqual(repr(values[1:]), repr(expected))
+        self.assertIs(addition.cache, Evaluator.NUMBER_OPERATIONS["+"])
+        self.assertIs(comparison.cache, Evaluator.NUMBER_OPERATIONS["<"])
+        self.assertIs(division.cache, False)
+
+        with self.assertRaises(EvaluatorException):
+            list(Evaluator(calls[3:4], symbol_table).evaluate())
+
+        # Text deoptimizes the operations, which still give the same values
+        self.assertEqual((addition.cache, remainder.cache, comparison.cache),
+                         (False, False, Evaluator.NUMBER_OPERATIONS["<"]))
+        self.assertEqual(repr(list(Evaluator(calls[4:], symbol_table).evaluate())), repr(expected[:1]))
+
+    def test_signal(self):
+        """Test return, continue and break.
+
+        Tests the signals get passed up to the node that handles them, and are errors anywhere else.
+
+        """
+        code = ("function f(n) (i = 0\nj = 0\nwhile (i < n) (i = i + 1\nif (i is 2) (continue)\nif (i is 4) (break)\n"
+                "j = j + i)\nreturn [i, j])\n"
+                "[f(2), f(10)]\n")
+
+        evaluator = Evaluator(Parser(Lexer(code, "test").lex()).parse(), SymbolTable())
+        self.assertEqual(repr(list(evaluator.evaluate())[-1]),
+                         repr(List([List([Number(2), Number(1)]), List([Number(4), Number(4)])])))
+        self.assertIs(evaluator._evaluate_node(Parser(Lexer("break\n", "test").lex()).parse().__next__(), None),
+                      Evaluator.BREAK)
+
+        # The condition of a loop can give a signal after its first iteration too
+        with self.assertRaises(EvaluatorException):
+            list(Evaluator(Parser(Lexer("i = 0\nwhile ((if ((i = i + 1) is 2) (return 5)) or (i < 3)) (i)\n", "test")
+                                  .lex()).parse(), SymbolTable()).evaluate())
+
+    def test_handlers(self):
+        """Test the handlers of the nodes.
+
+        Tests nodes that aren't in module nodes can be evaluated once they're registered, and that an evaluator can
+        override the handler of a class of node without changing any other evaluator.
+
+        """
+        class Twice(ast.Node):
+            __slots__ = ("node",)
+
+            def __init__(self, node):
+                self.node = node
+
+        class Decimal(ast.Number):
+            __slots__ = ()
+
+        class PluginEvaluator(Evaluator):
+            pass
+
+        PluginEvaluator.register(Twice, lambda evaluator, node, symbol_table:
+                                 evaluator._evaluate_node(node.node, symbol_table) * Number(2))
+
+        self.assertEqual(repr(list(PluginEvaluator([Twice(Decimal("1.5"))], SymbolTable()).evaluate())),
+                         repr([Number(3)]))
+        self.assertNotIn(Twice, Evaluator.HANDLERS)
+
+        with self.assertRaises(EvaluatorException):
+            list(Evaluator([Twice(Decimal("1.5"))], SymbolTable()).evaluate())
+
+        # Counts the binary operations evaluated, wrapping the handler it replaces
+        evaluator = Evaluator(Parser(Lexer("1 + 2 * 3\n", "test").lex()).parse(), SymbolTable())
+        operations = []
+        handler = evaluator.override(ast.BinaryOperation, lambda node, symbol_table:
+                                     operations.append(node.operator) or handler(node, symbol_table))
+
+        self.assertEqual(repr(list(evaluator.evaluate())), repr([Number(7)]))
+        self.assertEqual(operations, ["+", "*"])
+        self.assertIsNot(Evaluator([], SymbolTable()).handlers[ast.BinaryOperation],
+                         evaluator.handlers[ast.BinaryOperation])
+
 
 if __name__ == '__main__':
     # Only activates when the file gets ran directly.
@@ -0,0 +1,93 @@
+"""Test for Document class.
+
+Unit testing for the Document class.
+
+"""
+
+
+import unittest
+from nem.incremental import Document
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.exceptions import LexerException, ParserException
+
+
+class DocumentTestCase(unittest.TestCase):
+
+    """Unit test Document class.
+
+    Used for unit testing the Document class.
+
+    """
+
+    def assertParsed(self, document):
+        """Assert that the document holds the same tokens and AST as parsing its code from scratch."""
+        tokens = list(Lexer(document.code, "<stdin>").lex())
+
+        self.assertEqual([(token.type, token.value, token.line, token.column) for token in document.tokens],
+                         [(token.type, token.value, token.line, token.column) for token in tokens])
+        self.assertEqual(repr(document.ast), repr(list(Parser(tokens).parse())))
+        self.assertEqual([node.line for node in document.ast], [node.line for node in Parser(tokens).parse()])
+
+    def test_edit(self):
+        """Test the edit method.
+
+        Tests lexing and parsing edited code.
+
+        """
+        with open("test_cases/test_parser.in") as _input:
+            _input = _input.read()
+
+        document = Document(_input, "<stdin>")
+        self.assertParsed(document)
+
+        # Only the expressions around the edit are parsed again
+        before = list(document.ast)
+        position = document.code.index("b = a[1]")
+        document.edit(position, position + len("b = a[1]"), "b = a[2]\nc = 3 +\n4")
+        self.assertParsed(document)
+        self.assertIs(document.ast[0], before[0])
+        self.assertIs(document.ast[-1], before[-1])
+        self.assertEqual(len(document.ast), len(before) + 1)
+        self.assertEqual(sum(any(node is before_node for before_node in before) for node in document.ast), 8)
+
+        # Tokens are read out of the segments, by index as well
+        tokens = list(document.tokens)
+        self.assertEqual([document.tokens[index] for index in range(-len(tokens), len(tokens))], tokens + tokens)
+
+        # The edit joins two expressions into one
+        position = document.code.index("c = 3")
+        document.edit(position, position, "a1 ")
+        self.assertParsed(document)
+
+        document.edit(0, 0, "\n\n")
+        self.assertParsed(document)
+        self.assertEqual(document.ast[0].line, 5)
+
+        document.edit(len(document.code), len(document.code), "\nlast")
+        self.assertParsed(document)
+
+        # Invalid code keeps the last valid AST until it's fixed
+        valid = list(document.ast)
+        position = document.code.index("b = a[2]")
+
+        with self.assertRaises(LexerException):
+            document.edit(position, position, "\"")
+
+        self.assertEqual(document.ast, valid)
+
+        with self.assertRaises(ParserException):
+            document.edit(position + 1, position + 1, "text\" [")
+
+        document.edit(position + len("\"text\" ["), position + len("\"text\" ["), "0]")
+        self.assertEqual(document.code[position:position + len("\"text\" [0]b = a[2]")], "\"text\" [0]b = a[2]")
+        self.assertParsed(document)
+
+        document.edit(0, len(document.code), "")
+        self.assertParsed(document)
+        self.assertEqual(document.ast, [])
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
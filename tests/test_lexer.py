@@ -5,8 +5,11 @@ Unit testing for the Lexer class.
 """
 
 
+import io
+import pathlib
 import unittest
 from nem.lexer import Lexer
+from nem.source import Source
 from nem.token_ import Token
 from nem.exceptions import LexerException
 
@@ -30,11 +33,69 @@ class LexerTestCase(unittest.TestCase):
         with open("test_cases/test_lexer.in") as _input:
             _input = _input.read()
 
+        source = Source("<stdin>", _input)
+
         with open("test_cases/test_lexer.out") as output:
             output = eval(output.read())
 
         self.assertEqual(list(Lexer(_input, "<stdin>").lex()), output)
 
+        self.assertEqual(list(Lexer(_input, "<stdin>").lex_buffer()), output)
+
+        with open("test_cases/test_lexer.in", "rb") as binary_input:
+            self.assertEqual(list(Lexer(binary_input, "<stdin>").lex()), output)
+
+        # A memory-mapped file is unmapped once the lexer is closed, but its tokens still have lines
+        with Lexer(pathlib.Path("test_cases/test_lexer.in"), "<stdin>") as mapped_lexer:
+            tokens = list(mapped_lexer.lex())
+            mappings = mapped_lexer.mappings
+
+        self.assertEqual(tokens, output)
+        self.assertTrue(mappings and all(mapping.closed for mapping in mappings))
+        self.assertIsNone(mapped_lexer.source.code)
+        self.assertEqual([token.line for token in tokens], [token.line for token in output])
+
+        # Streams that can't be memory-mapped are read in chunks, with tokens spanning the chunk boundaries
+        chunked_lexer = Lexer(io.BytesIO(_input.encode()), "<stdin>")
+        chunked_lexer.CHUNK_SIZE = 3
+        self.assertEqual(list(chunked_lexer.lex()), output)
+
+        # Offsets grow with the carriage returns, but lines stay the same
+        chunked_lexer = Lexer(io.BytesIO(_input.replace("\n", "\r\n").encode()), "<stdin>")
+        chunked_lexer.CHUNK_SIZE = 3
+        self.assertEqual([(token.type, token.value, token.line) for token in chunked_lexer.lex()],
+                         [(token.type, token.value, token.line) for token in output])
+
+        # A stream can start in the middle of a line of the code it's a part of
+        tokens = list(Lexer(io.BytesIO(b"b = 2\nc"), "<stdin>", 10, 3, 5).lex())
+        self.assertEqual([(token.offset, token.line, token.column) for token in tokens],
+                         [(10, 3, 5), (12, 3, 7), (14, 3, 9), (16, 4, 1), (17, 4, 2)])
+
+        token = list(Lexer("a = 1\n  b = \"\n\"\n", "<stdin>").lex())[5]
+        self.assertEqual((token.filename, token.line, token.column), ("<stdin>", 2, 7))
+
+        self.assertEqual(
+            list(Lexer("_" * 100000 + " = " + "1" * 100000 + "\n", "<stdin>").lex()),
+            [Token(Token.SYMBOL, "_" * 100000, source, 0), Token(Token.EQUAL, "=", source, 100001),
+             Token(Token.NUMBER, "1" * 100000, source, 100003), Token(Token.EOF, None, source, 200003)]
+        )
+
+        # Lexes the parts in separate processes, never splitting inside of a text or after a quotation mark in a comment
+        parallel_lexer = Lexer(_input, "<stdin>")
+        parallel_lexer.PARALLEL_SIZE = 0
+        self.assertEqual(list(parallel_lexer.lex_parallel(3)), output)
+
+        tricky = "a = \"\n\n\n\n\"\n# \"\n\n\nb\n" * 4
+        self.assertEqual(Lexer(tricky, "<stdin>")._split(tricky, 8), [0, 11, 19, 30, 38, 49, 55, 68, 76])
+        parallel_lexer = Lexer(tricky.encode(), "<stdin>")
+        parallel_lexer.PARALLEL_SIZE = 0
+        self.assertEqual(list(parallel_lexer.lex_parallel(8)), list(Lexer(tricky.encode(), "<stdin>").lex()))
+
+        parallel_lexer = Lexer("a\n" * 10 + "@", "<stdin>")
+        parallel_lexer.PARALLEL_SIZE = 0
+        with self.assertRaisesRegex(LexerException, r"\(Line 11\) \(Column 1\)"):
+            parallel_lexer.lex_parallel(4)
+
         with self.assertRaises(LexerException):
             list(Lexer("\n@", "<stdin>").lex())
 
@@ -0,0 +1,217 @@
+"""Test for Optimizer class.
+
+Unit testing for the Optimizer class.
+
+"""
+
+
+import unittest
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.stack_parser import StackParser
+from nem.evaluator import Evaluator
+from nem.closures import ClosureEvaluator
+from nem.vm import VirtualMachine
+from nem.transpiler import PythonEvaluator
+from nem.stack_evaluator import StackEvaluator
+from nem.optimizer import Optimizer
+from nem.interpreter import Interpreter
+from nem.symbol_table import SymbolTable
+from nem.nodes import *
+import nem.types_ as value
+from nem.exceptions import EvaluatorException
+
+
+class OptimizerTestCase(unittest.TestCase):
+
+    """Unit test Optimizer class.
+
+    Used for unit testing the Optimizer class.
+
+    """
+
+    @staticmethod
+    def _parse(code):
+        """Parse the code into a list of nodes."""
+        return list(Parser(Lexer(code, "test").lex()).parse())
+
+    def test_optimize(self):
+        """Test the optimize method.
+
+        Tests the literals get folded, the identities of numbers simplified and everything else left alone.
+
+        """
+        optimizer = Optimizer(2)
+
+        for code, ast in (("1 + 2 * 3\n", [Number("7")]),
+                          ("-(4 - 6) ^ 2\n", [Number("-4")]),
+                          ("\"ab\" * 2 + \"c\"\n", [Text("ababc")]),
+                          ("[1, [2, \"a\"]][1] + [null]\n", [List([Number("2"), Text("a"), Null()])]),
+                          ("1 / 0\n", [Null()]),
+                          ("(y - 1) * 1 + 0\n", [Expressions([BinaryOperation(Variable("y"), "-", Number("1"))])]),
+                          ("0 - (y % 2)\n", [UnaryOperation(
+                              Expressions([BinaryOperation(Variable("y"), "%", Number("2"))]), "-")]),
+                          ("(y ^ 2) ^ 0\n", [Expressions([
+                              Expressions([BinaryOperation(Variable("y"), "^", Number("2"))]), Number("1")])]),
+                          ("x + 0\n", [BinaryOperation(Variable("x"), "+", Number("0"))]),
+                          ("(return 1) - 0\n", [BinaryOperation(Expressions([Return(Number("1"))]), "-", Number("0"))]),
+                          ("-\"a\"\n", [UnaryOperation(Text("a"), "-")]),
+                          ("[1][2]\n", [ListIndex(List([Number("1")]), Number("2"))])):
+            self.assertEqual(repr(list(optimizer.optimize(self._parse(code)))), repr(ast))
+
+        # Level 1 only folds
+        self.assertEqual(repr(list(Optimizer(1).optimize(self._parse("x - 0\n(1 + 2)\n")))),
+                         repr([BinaryOperation(Variable("x"), "-", Number("0")), Expressions([Number("3")])]))
+
+        # The folded literal is where the operation was, and the parsed AST isn't changed
+        ast = self._parse("\n\nz = 1 + 2 + z\n")
+        optimized = list(optimizer.optimize(ast))
+        self.assertEqual(optimized[0].value.left_node.line, 3)
+        self.assertEqual(repr(ast[0].value.left_node), repr(BinaryOperation(Number("1"), "+", Number("2"))))
+
+        # Operations that raise an error aren't folded, nor text repeated into text too big to be worth folding
+        self.assertEqual(repr(list(optimizer.optimize(self._parse("2 ^ 2000.5\n\"a\" * 100000\n")))),
+                         repr([BinaryOperation(Number("2"), "^", Number("2000.5")),
+                               BinaryOperation(Text("a"), "*", Number("100000"))]))
+
+        # Code nested deeper than Python recurses, which class StackParser parses
+        symbol_table = SymbolTable()
+        symbol_table.set("x", value.Number(1))
+
+        optimized = list(Optimizer(1).optimize(StackParser(Lexer("(" * 3000 + "x + 1 * 2" + ")" * 3000 + "\n", "test")
+                                                           .lex()).parse()))
+        self.assertEqual(repr(optimized), repr([Expressions([BinaryOperation(Variable("x"), "+", Number("2"))])]))
+        self.assertEqual(repr(list(StackEvaluator(optimized, symbol_table).evaluate())), repr([value.Number(3)]))
+
+        optimized = list(Optimizer(1).optimize(StackParser(Lexer("[" * 3000 + "1" + "]" * 3000 + "[0][0]\n", "test")
+                                                           .lex()).parse()))[0]
+
+        for _ in range(2998):
+            self.assertIsInstance(optimized, List)
+            optimized = optimized.elements[0]
+
+        self.assertEqual(repr(optimized), repr(Number("1")))
+
+    def test_eliminate(self):
+        """Test the optimize method on dead code.
+
+        Tests the code that's never evaluated, and the literals whose values are never used, get dropped.
+
+        """
+        optimizer = Optimizer(1)
+
+        for code, ast in (("function f() (1\nx\n\"a\"\nreturn 3\n4)\n",
+                           [FunctionDefinition("f", [], Expressions([Variable("x"), Return(Number("3"))]))]),
+                          ("function g() (if 1 (return 1)\n3)\n",
+                           [FunctionDefinition("g", [], Expressions([Return(Number("1"))]))]),
+                          ("function h() ((a = 1\n[2])\n(b))\n",
+                           [FunctionDefinition("h", [], Expressions([AssignmentOperation("a", Number("1")),
+                                                                     Variable("b")]))]),
+                          ("if (1) (x = 2) otherwise (y)\n",
+                           [Expressions([AssignmentOperation("x", Number("2")), Null()])]),
+                          ("if 0 (x)\n", [Null()]),
+                          ("if \"\" (x) otherwise (break)\n", [Expressions([Break()])]),
+                          ("while (not 0 and 0) (x)\n", [Null()]),
+                          ("while 1 (break)\n", [While(Number("1"), Expressions([Break()]))]),
+                          ("if (x) (1) otherwise (2)\n", [IfOtherwise(Expressions([Variable("x")]),
+                                                                      Expressions([Number("1")]),
+                                                                      Expressions([Number("2")]))])):
+            self.assertEqual(repr(list(optimizer.optimize(self._parse(code)))), repr(ast))
+
+    def test_evaluate(self):
+        """Test evaluating the optimized AST.
+
+        Tests the optimized AST gives the same values and errors as the parsed one.
+
+        """
+        with open("test_cases/test_evaluator.in") as _input:
+            _input = _input.read()
+
+        for level in (1, 2):
+            values = list(Evaluator(Optimizer(level).optimize(self._parse(_input)), self._symbols()).evaluate())
+            expected = list(Evaluator(self._parse(_input), self._symbols()).evaluate())
+
+            # Functions hold their optimized body
+            self.assertEqual(repr([element for element in values if not isinstance(element, value.Function)]),
+                             repr([element for element in expected if not isinstance(element, value.Function)]))
+
+        for code in ("1 - \"a\"\n", "\n-[1] + 0\n", "[1, 2][2]\n", "x - 0\n",
+                     "(return 1) - 0\n", "\nif (1) (break)\n", "a = if 1 (return 2)\n"):
+            with self.assertRaises(EvaluatorException) as expected:
+                list(Evaluator(self._parse(code), SymbolTable()).evaluate())
+
+            with self.assertRaises(EvaluatorException) as error:
+                list(Evaluator(Optimizer(2).optimize(self._parse(code)), SymbolTable()).evaluate())
+
+            self.assertEqual(str(error.exception), str(expected.exception))
+
+        interpreter = Interpreter("a = 2 ^ 10\n", "test", SymbolTable(), optimization=1)
+        self.assertEqual(repr(interpreter.return_values), "(Number(1024),)")
+
+    def test_inline(self):
+        """Test the optimize method on calls.
+
+        Tests the calls of small functions nothing else binds get inlined, and give the same values with every engine.
+
+        """
+        code = ("function add(a, b) (return a + b)\n"
+                "function twice(x) (y = add(x, x)\nreturn y)\n"
+                "function fact(n) (if (n < 2) (return 1)\nreturn n * fact(n - 1))\n"
+                "function f() (return 1)\n"
+                "f = 2\n"
+                "function element() (return 3)\n"
+                "[add(1, 2), twice(5), fact(5), add(1, 2, 3)]\n")
+        optimized = list(Optimizer(2, symbol_table=self._symbols()).optimize(self._parse(code)))
+
+        self.assertEqual(repr(optimized[1].expression.expressions[0].value),
+                         repr(InlineCall("add", ["a", "b"], Expressions([Return(BinaryOperation(Variable("a"), "+",
+                                                                                                Variable("b")))]),
+                                         [Variable("x"), Variable("x")])))
+
+        # Recursive functions, functions whose name is bound again and calls with the wrong arity are left alone
+        self.assertEqual([type(element).__name__ for element in optimized[-1].elements],
+                         ["InlineCall", "InlineCall", "FunctionCall", "FunctionCall"])
+        self.assertIsInstance(optimized[2].expression.expressions[1].value.right_node, FunctionCall)
+        self.assertEqual(Optimizer(2).names, set())
+
+        for names, code in ((set(), "function f() (return 1)\nimport \"lib\"\nf()\n"),
+                            ({"g", "h"}, "function f() (return 1)\nfunction g() (return 2)\nfunction h(f) (f)\n"),
+                            (set(), "function f() (return 1)\nfunction f() (return 2)\n")):
+            optimizer = Optimizer(2)
+            list(optimizer.optimize(self._parse(code)))
+            self.assertEqual(optimizer.names, names)
+
+        self.assertEqual(repr(list(Optimizer(2, inline=False).optimize(self._parse("function f() (1)\nf()\n")))[1]),
+                         repr(FunctionCall("f", [])))
+
+        code = ("n = 10\n"
+                "function scale(v) (return v * n)\n"
+                "function g(n) (return scale(2))\n"
+                "function h(a) (if (a < 3) (return a)\nreturn a + 1)\n"
+                "[scale(1), g(3), h(4), n]\n")
+        expected = list(Evaluator(self._parse(code), self._symbols()).evaluate())[-1]
+
+        # Scoping is dynamic, so the inlined body still sees the variables of the caller
+        for evaluator in (Evaluator, ClosureEvaluator, VirtualMachine, PythonEvaluator):
+            values = list(evaluator(Optimizer(2, symbol_table=self._symbols()).optimize(self._parse(code)),
+                                    self._symbols()).evaluate())
+            self.assertEqual(repr(values[-1]), repr(expected))
+
+        self.assertEqual(repr(expected), "List([Number(10), Number(6), Number(5), Number(10)])")
+
+    @staticmethod
+    def _symbols():
+        """Return the symbol table with the built-in variables and functions."""
+        symbol_table = SymbolTable()
+        symbol_table.set("true", value.Number(1))
+        symbol_table.set("false", value.Number(0))
+        symbol_table.set("print", value.BuiltInFunction(["element"], 0))
+        symbol_table.set("input", value.BuiltInFunction([], 1))
+        symbol_table.set("convert", value.BuiltInFunction(["value", "type"], 2))
+
+        return symbol_table
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
@@ -33,6 +33,19 @@ class ParserTestCase(unittest.TestCase):
             output = output.read()
 
         self.assertEqual("".join(list(map(repr, Parser(Lexer(_input, "<stdin>").lex()).parse()))), output)
+        self.assertEqual("".join(list(map(repr, Parser(Lexer(_input, "<stdin>").lex_buffer()).parse()))), output)
+
+        # Nodes are slotted and compared attribute by attribute, location included
+        tokens = list(Lexer(_input, "<stdin>").lex())
+        parsed = list(Parser(tokens).parse())
+        self.assertEqual(parsed, list(Parser(tokens).parse()))
+        self.assertEqual(parsed, list(Parser(Lexer(_input, "<stdin>").lex()).parse()))
+        self.assertNotEqual(parsed, list(Parser(Lexer("\n" + _input, "<stdin>").lex()).parse()))
+        self.assertNotEqual(parsed, list(Parser(Lexer(_input, "other").lex()).parse()))
+        self.assertFalse(any(hasattr(node, "__dict__") for node in parsed))
+        self.assertEqual(List([Number("1"), Null()]), List([Number("1"), Null()]))
+        self.assertNotEqual(List([Number("1"), Null()]), List([Number("2"), Null()]))
+        self.assertIsNone(Null().line)
 
         with self.assertRaises(ParserException):
             list(Parser(Lexer("\n2+", "<stdin>").lex()).parse())
@@ -64,6 +77,9 @@ class ParserTestCase(unittest.TestCase):
         with self.assertRaises(ParserException):
             list(Parser(Lexer("import\n", "<stdin>").lex()).parse())
 
+        with self.assertRaises(ParserException):
+            list(Parser(Lexer("f()(1)\n", "<stdin>").lex()).parse())
+
 
 if __name__ == '__main__':
     # Only activates when the file gets ran directly.
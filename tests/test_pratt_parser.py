@@ -0,0 +1,55 @@
+"""Test for PrattParser class.
+
+Unit testing for the PrattParser class.
+
+"""
+
+
+import unittest
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.pratt_parser import PrattParser
+from nem.exceptions import ParserException
+
+
+class PrattParserTestCase(unittest.TestCase):
+
+    """Unit test PrattParser class.
+
+    Used for unit testing the PrattParser class.
+
+    """
+
+    def test_parse(self):
+        """Test the parse method.
+
+        Tests the parser against class Parser.
+
+        """
+        with open("test_cases/test_parser.in") as _input:
+            _input = _input.read()
+
+        with open("test_cases/test_parser.out") as output:
+            output = output.read()
+
+        self.assertEqual("".join(list(map(repr, PrattParser(Lexer(_input, "<stdin>").lex()).parse()))), output)
+        self.assertEqual("".join(list(map(repr, PrattParser(Lexer(_input, "<stdin>").lex_buffer()).parse()))), output)
+
+        for code in ("a < not b + 1 or not c * -2 ^ -3 ^ 4 and d is e % f - g / h\n",
+                     "x = y = not 1 < 2 >= 3\n",
+                     "-a ^ b + (c d)[1] * f(1, 2)[3]\n"):
+            expected = list(Parser(Lexer(code, "<stdin>").lex()).parse())
+            parsed = list(PrattParser(Lexer(code, "<stdin>").lex()).parse())
+
+            self.assertEqual(repr(parsed), repr(expected))
+            self.assertEqual([node.column for node in parsed], [node.column for node in expected])
+
+        for code in ("\n2+", "import\n", "nem(1, 2\n", "function nem(a,\n", "[1,2,3\n", "a[1\n", "not not a\n",
+                     "a + not b\n", "a and b = 1\n", "f()(1)\n", "a[f()(1)]\n"):
+            with self.assertRaises(ParserException):
+                list(PrattParser(Lexer(code, "<stdin>").lex()).parse())
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
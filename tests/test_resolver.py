@@ -0,0 +1,126 @@
+"""Test for Resolver class.
+
+Unit testing for the Resolver class.
+
+"""
+
+
+import pickle
+import unittest
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.evaluator import Evaluator
+from nem.resolver import Resolver
+from nem.symbol_table import Frame, SymbolTable
+from nem.types_ import *
+
+
+class ResolverTestCase(unittest.TestCase):
+
+    """Unit test Resolver class.
+
+    Used for unit testing the Resolver class.
+
+    """
+
+    def test_resolve(self):
+        """Test the resolve method.
+
+        Tests the variables a function names get slots, other than the ones of the functions it defines.
+
+        """
+        definition = next(Parser(Lexer("function f(a, b) (c = a + d\nfunction g(e) (e + h)\ng(c))\n", "test").lex())
+                          .parse())
+        layout = Resolver().resolve(definition.parameters, definition.expression)
+
+        self.assertEqual(layout.names, ("a", "b", "c", "d", "g"))
+
+        assignment, function, call = definition.expression.expressions
+        self.assertIs(assignment.layout, layout)
+        self.assertEqual(assignment.slot, 2)
+        self.assertEqual(assignment.value.right_node.slot, 3)
+        self.assertEqual((function.slot, call.slot, call.arguments[0].slot), (4, 4, 2))
+        self.assertIsNone(function.expression.expressions[0].left_node.layout)
+
+        # The slot isn't kept when the node is pickled
+        self.assertIsNone(pickle.loads(pickle.dumps(assignment)).layout)
+        self.assertEqual(repr(pickle.loads(pickle.dumps(assignment))), repr(assignment))
+
+    def test_frame(self):
+        """Test evaluating calls in frames.
+
+        Tests calls see the variables of their caller, without changing them.
+
+        """
+        symbol_table = SymbolTable()
+        symbol_table.set("print", BuiltInFunction(["element"], 0))
+
+        code = ("x = 1\n"
+                "function f(a, b) (x = x + a + b\nreturn x)\n"
+                "f(2, a)\n"
+                "x\n"
+                "function g(n) (if (n < 1) (return 0)\nreturn n + g(n - 1))\n"
+                "g(50)\n"
+                "function h() (return y)\n"
+                "function k(y) (return h())\n"
+                "k(3)\n")
+
+        values = list(Evaluator(Parser(Lexer(code, "test").lex()).parse(), symbol_table).evaluate())
+
+        # Arguments are evaluated in the frame of the call, so b is the a before it
+        self.assertEqual(repr([element for element in values if not isinstance(element, Function)]),
+                         repr([Number(1), Number(5), Number(1), Number(1275), Number(3)]))
+
+        # Names without a slot, like the ones an import sets, are kept in the symbols
+        frame = Frame(Resolver().resolve(["a"]), symbol_table)
+        frame.set("a", Number(1))
+        frame.set("z", Number(2))
+
+        self.assertEqual(repr(frame.symbols), "{'z': Number(2)}")
+        self.assertEqual(repr(frame.get("x")), "Number(1)")
+        self.assertEqual(sorted(frame.copy().symbols), ["a", "f", "g", "h", "k", "print", "x", "z"])
+
+    def test_tail(self):
+        """Test calls in tail position.
+
+        Tests the returns of calls are only made in place of the frame when nothing is left to do in the function, and
+        that the calls see the same variables as before.
+
+        """
+        definition = next(Parser(Lexer("function f(n) (if (n) (return g(n)) otherwise (return [g(n)])\n"
+                                       "while 1 (return g(n))\nreturn 1 + g(n)\nreturn g(n))\n", "test").lex()).parse())
+        layout = Resolver().resolve(definition.parameters, definition.expression)
+        branch, loop, operation, last = definition.expression.expressions
+
+        self.assertEqual(layout.tails, {id(branch.if_expression.expressions[0]), id(last)})
+
+        frame = Frame(Resolver().resolve(["a", "b"]), SymbolTable())
+        frame.set("a", Number(1))
+        frame.set("c", Number(2))
+        tail = frame.tail(Resolver().resolve(["b", "a"]))
+
+        self.assertIsNone(tail.parent.parent)
+        self.assertEqual(repr((tail.slots, tail.symbols)), "([None, Number(1)], {'c': Number(2)})")
+
+        symbol_table = SymbolTable()
+        symbol_table.set("print", BuiltInFunction(["element"], 0))
+
+        code = ("function count(n, total) (if (n < 1) (return total)\n"
+                "return count(n - 1, total + n))\n"
+                "function even(n) (if (n < 1) (return 1) otherwise (return odd(n - 1)))\n"
+                "function odd(n) (if (n < 1) (return 0)\nreturn even(n - 1))\n"
+                "function h() (return y)\n"
+                "function k(y) (return h())\n"
+                "function m(n) (y = n\nreturn k(y + 1) + 1)\n"
+                "count(5000, 0)\n"
+                "even(5001)\n"
+                "m(3)\n")
+
+        # Deeper than Python recurses, and total adds the n of the call, since it's set first
+        values = list(Evaluator(Parser(Lexer(code, "test").lex()).parse(), symbol_table).evaluate())
+        self.assertEqual(repr(values[-3:]), repr([Number(12497500), Number(0), Number(5)]))
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Test for StackEvaluator class.
+
+Unit testing for the StackEvaluator class.
+
+"""
+
+
+import sys
+import unittest
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.evaluator import Evaluator
+from nem.stack_evaluator import StackEvaluator
+from nem.interpreter import Interpreter
+from nem.symbol_table import SymbolTable
+from nem.types_ import *
+from nem.exceptions import EvaluatorException
+
+
+class StackEvaluatorTestCase(unittest.TestCase):
+
+    """Unit test StackEvaluator class.
+
+    Used for unit testing the StackEvaluator class.
+
+    """
+
+    @staticmethod
+    def _parse(code):
+        """Parse the code into a list of nodes."""
+        return list(Parser(Lexer(code, "test").lex()).parse())
+
+    def test_evaluate(self):
+        """Test the evaluate method.
+
+        Tests the stack evaluator gives the same values and errors as the evaluator.
+
+        """
+        symbol_table = SymbolTable()
+        symbol_table.set("true", Number(1))
+        symbol_table.set("false", Number(0))
+        symbol_table.set("print", BuiltInFunction(["element"], 0))
+        symbol_table.set("input", BuiltInFunction([], 1))
+        symbol_table.set("convert", BuiltInFunction(["value", "type"], 2))
+
+        with open("test_cases/test_evaluator.in") as _input:
+            _input = _input.read()
+
+        with open("test_cases/test_evaluator.out") as output:
+            output = output.read()
+
+        self.assertEqual("".join(map(repr, StackEvaluator(self._parse(_input), symbol_table).evaluate())), output)
+
+        with open("test_cases/test_evaluator.in", "rb") as _input:
+            interpreter = Interpreter(_input, "test", symbol_table, evaluator=StackEvaluator)
+
+        self.assertIsInstance(interpreter.evaluator, StackEvaluator)
+        self.assertEqual("".join(map(repr, interpreter.return_values)), output)
+
+        for code in ("function f() (while (0) (return 5)\nreturn 6)\nf()\n",
+                     "i = 0\nwhile (i < 5) (i = i + 1\nif (i is 2) (continue)\nif (i is 4) (break))\ni\n",
+                     "function g(a, b) (return a - b)\ng(3, 1 + g(2, 1))\n",
+                     "function h() (return function k() (return 7))\nfunction m() (return h()())\n[h()(), m()]\n",
+                     "[1, \"a\", [2]][2][0] + 1 * 2 ^ 3\n"):
+            self.assertEqual(repr(list(StackEvaluator(self._parse(code), symbol_table.copy()).evaluate())),
+                             repr(list(Evaluator(self._parse(code), symbol_table.copy()).evaluate())))
+
+        for code in ("\nvariable", "import \"test\"\n", "nem(1, 2)\n", "[1, 2][2]\n", "22 * [1, 2]\n",
+                     "[1, 2] ^ [1, 2]\n", "a = return 1\n", "while (return 1) (print(1))\n",
+                     "if (return 1) (print(1))\n", "return 2\n", "function f(a) (a)\nf()\n", "-\"a\"\n"):
+            with self.assertRaises(EvaluatorException):
+                list(StackEvaluator(self._parse(code), symbol_table).evaluate())
+
+    def test_depth(self):
+        """Test the depth of the calls.
+
+        Tests calls far deeper than the recursion limit of Python, up to the limit of the stack evaluator, which calls
+        in tail position don't count towards.
+
+        """
+        evaluator = StackEvaluator(self._parse("function down(n) (if (n is 0) (return 0) otherwise "
+                                               "(return 1 + down(n - 1)))\n"
+                                               "down(19999)\ndown(30)\n"), SymbolTable())
+        evaluator.LIMIT = 20000
+        values = evaluator.evaluate()
+
+        next(values)
+        self.assertGreater(20000, sys.getrecursionlimit())
+        self.assertEqual(repr(next(values)), "Number(19999)")
+        self.assertEqual((evaluator.depth, evaluator.deepest), (0, 20000))
+        self.assertGreater(evaluator.largest, 20000)
+
+        # The frames and the calls the error leaves behind are dropped, so the evaluator can evaluate other nodes
+        evaluator.LIMIT = 10
+
+        with self.assertRaises(EvaluatorException):
+            next(values)
+
+        self.assertEqual((evaluator.depth, evaluator.stack), (0, []))
+        self.assertEqual(repr(evaluator._evaluate_node(self._parse("down(5)\n")[0], evaluator.symbol_table)),
+                         "Number(5)")
+
+        evaluator = StackEvaluator(self._parse("function loop(n) (if (n is 0) (return 0)\nreturn loop(n - 1))\n"
+                                               "loop(1000)\n"), SymbolTable())
+        evaluator.LIMIT = 10
+
+        self.assertEqual(repr(list(evaluator.evaluate())[-1]), "Number(0)")
+        self.assertEqual(evaluator.deepest, 1)
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
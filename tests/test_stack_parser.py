@@ -0,0 +1,75 @@
+"""Test for StackParser class.
+
+Unit testing for the StackParser class.
+
+"""
+
+
+import unittest
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.stack_parser import StackParser
+from nem.exceptions import ParserException
+import nem.nodes as ast
+
+
+class StackParserTestCase(unittest.TestCase):
+
+    """Unit test StackParser class.
+
+    Used for unit testing the StackParser class.
+
+    """
+
+    def test_parse(self):
+        """Test the parse method.
+
+        Tests the parser against class Parser and on deeply nested code.
+
+        """
+        with open("test_cases/test_parser.in") as _input:
+            _input = _input.read()
+
+        with open("test_cases/test_parser.out") as output:
+            output = output.read()
+
+        self.assertEqual("".join(list(map(repr, StackParser(Lexer(_input, "<stdin>").lex()).parse()))), output)
+
+        for code in ("a < not b + 1 or not c * -2 ^ -3 ^ 4 and d is e % f - g / h\n",
+                     "x = y = not 1 < 2 >= 3\n",
+                     "-a ^ b + (c d)[1] * f(1, 2)[3]\n",
+                     "if a b otherwise while (c) [d, \"e\"[0]][1]\nfunction f(x, y) return f()()[x]\n"):
+            expected = list(Parser(Lexer(code, "<stdin>").lex()).parse())
+            parsed = list(StackParser(Lexer(code, "<stdin>").lex()).parse())
+
+            self.assertEqual(repr(parsed), repr(expected))
+            self.assertEqual([node.column for node in parsed], [node.column for node in expected])
+
+        for code in ("\n2+", "import\n", "nem(1, 2\n", "function nem(a,\n", "[1,2,3\n", "a[1\n", "not not a\n",
+                     "a + not b\n", "a and b = 1\n", "a[f()(1)]\n", "f()(1)\n", "a[1][f()(1)]\n", "g(f()(1))\n"):
+            with self.assertRaises(ParserException):
+                list(StackParser(Lexer(code, "<stdin>").lex()).parse())
+
+        # Calling a call with arguments fails at the same place as in class Parser
+        for code in ("f()(1)\n", "a[f()(1)]\n", "g(f()(1))\n"):
+            with self.assertRaises(ParserException) as expected:
+                list(Parser(Lexer(code, "<stdin>").lex()).parse())
+
+            with self.assertRaises(ParserException) as parsed:
+                list(StackParser(Lexer(code, "<stdin>").lex()).parse())
+
+            self.assertEqual(str(parsed.exception), str(expected.exception))
+
+        # Far deeper than the recursion limit
+        parsed = list(StackParser(Lexer("(" * 20000 + "-1" + ")" * 20000 + "\n", "<stdin>").lex()).parse())
+
+        for _ in range(20000):
+            self.assertIsInstance(parsed[0], ast.Expressions)
+            parsed = parsed[0].expressions
+
+        self.assertEqual(repr(parsed), "[UnaryOperation(Number('1'), '-')]")
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Test for SymbolTable class.
+
+Unit testing for the SymbolTable class.
+
+"""
+
+
+import unittest
+from nem.symbol_table import SymbolTable
+from nem.types_ import *
+
+
+class SymbolTableTestCase(unittest.TestCase):
+
+    """Unit test SymbolTable class.
+
+    Used for unit testing the SymbolTable class.
+
+    """
+
+    def test_scope(self):
+        """Test the scope method.
+
+        Tests scopes start empty, read the symbols of their parents and keep the ones they set to themselves.
+
+        """
+        symbol_table = SymbolTable()
+        symbol_table.set("a", Number(1))
+        symbol_table.set("b", Number(2))
+
+        scope = symbol_table.scope()
+        self.assertEqual(scope.symbols, {})
+
+        scope.set("a", Number(3))
+
+        # A chain deeper than Python recurses
+        for _ in range(5000):
+            scope = scope.scope()
+
+        self.assertEqual(repr([scope.get("a"), scope.get("b"), scope.get("c")]),
+                         repr([Number(3), Number(2), None]))
+        self.assertEqual(repr(symbol_table.get("a")), "Number(1)")
+
+        # Symbols found in a parent are kept in the scope
+        self.assertEqual(sorted(scope.symbols), ["a", "b"])
+        self.assertEqual(sorted(scope.flatten()), ["a", "b"])
+
+    def test_copy(self):
+        """Test the copy method.
+
+        Tests copies keep the symbols the table had, even once the table changes.
+
+        """
+        symbol_table = SymbolTable()
+        symbol_table.set("a", Number(1))
+
+        copy = symbol_table.copy()
+        symbol_table.set("a", Number(2))
+        copy.set("b", Number(3))
+
+        self.assertEqual(repr([copy.get("a"), copy.get("b"), symbol_table.get("b")]),
+                         repr([Number(1), Number(3), None]))
+        self.assertIs(copy.parent, symbol_table)
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Test for Tracer class.
+
+Unit testing for the Tracer class.
+
+"""
+
+
+import unittest
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.evaluator import Evaluator
+from nem.closures import ClosureEvaluator
+from nem.tracer import Trace, Tracer
+from nem.symbol_table import SymbolTable
+from nem.types_ import *
+
+
+class TracerTestCase(unittest.TestCase):
+
+    """Unit test Tracer class.
+
+    Used for unit testing the Tracer class.
+
+    """
+
+    @staticmethod
+    def _parse(code):
+        """Parse the code into a list of nodes."""
+        return list(Parser(Lexer(code, "test").lex()).parse())
+
+    @staticmethod
+    def _symbols():
+        """Return the symbol table with the built-in functions."""
+        symbol_table = SymbolTable()
+        symbol_table.set("print", BuiltInFunction(["element"], 0))
+
+        return symbol_table
+
+    def test_trace(self):
+        """Test the trace method.
+
+        Tests loops on integers get traced along both branches of their ifs, and that loops which can't be traced are
+        told apart from the ones that can't be traced with the values they have now.
+
+        """
+        symbol_table = self._symbols()
+        *initialize, loop = self._parse("i = 0\ntotal = 0\n"
+                                        "while ((i = i + 1) < 10) (if (i % 3 is 0) (total = total - i) otherwise "
+                                        "(total = total + i * 2)\nlast = total)\n")
+        list(Evaluator(initialize, symbol_table).evaluate())
+
+        trace = Tracer().trace(loop, symbol_table)
+
+        self.assertIsInstance(trace, Trace)
+        self.assertIn("else:", trace.source)
+        self.assertNotIn("break\n        else", trace.source)
+
+        # The variables are only set once the loop ends, along with the ones its condition assigned
+        symbol_table.set("total", Number(0))
+        self.assertTrue(trace.run(symbol_table))
+        self.assertEqual(repr([symbol_table.get(name) for name in ("i", "total", "last")]),
+                         repr([Number(10), Number(36), Number(36)]))
+
+        # A variable that isn't an integer leaves the loop to the evaluator
+        symbol_table.set("i", Number(0.5))
+        self.assertFalse(trace.run(symbol_table))
+        self.assertEqual(trace.failures, 1)
+
+        self.assertIsNone(Tracer().trace(loop, symbol_table))
+
+        symbol_table.set("i", Number(0))
+
+        for code in ("while (i < 10) (print(i))\n", "while (i < 10) (i = i + 0.5)\n", "while (i < 10) (break)\n"):
+            self.assertIs(Tracer().trace(self._parse(code)[0], symbol_table), False)
+
+    def test_evaluate(self):
+        """Test evaluating hot loops.
+
+        Tests loops give the same values once they're traced, including when the guards of the trace fail because the
+        variables overflow or stop being integers.
+
+        """
+        code = ("i = 0\ntotal = 0\nx = 1\ny = 0\n"
+                "while ((i = i + 1) < 300) (\n"
+                "    total = total + i % 7\n"
+                "    if (i % 3 is 0) (total = total - 1) otherwise (y = y + i)\n"
+                "    if (i > 100) (x = x * 3)\n"
+                "    if (i is 250) (z = \"a\")\n"
+                "    if (i > 250) (z = z + \"b\")\n"
+                ")\n"
+                "[i, total, x, y, z]\n")
+
+        evaluator = Evaluator(self._parse(code), self._symbols())
+        evaluator.tracer.HOT = 10
+        values = list(evaluator.evaluate())
+        expected = list(ClosureEvaluator(self._parse(code), self._symbols()).evaluate())
+
+        # Numbers past the integers a float holds exactly are rounded, as they are without the trace
+        self.assertEqual(repr(values[-1]), repr(expected[-1]))
+        self.assertNotEqual(values[-1].value[2].value, 3 ** 199)
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()
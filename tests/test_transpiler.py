@@ -0,0 +1,102 @@
+"""Test for Transpiler and PythonEvaluator classes.
+
+Unit testing for the Transpiler and PythonEvaluator classes.
+
+"""
+
+
+import unittest
+from nem.lexer import Lexer
+from nem.parser import Parser
+from nem.evaluator import Evaluator
+from nem.transpiler import PythonEvaluator, Transpiler
+from nem.interpreter import Interpreter
+from nem.symbol_table import SymbolTable
+from nem.types_ import *
+from nem.exceptions import EvaluatorException
+
+
+class TranspilerTestCase(unittest.TestCase):
+
+    """Unit test Transpiler and PythonEvaluator classes.
+
+    Used for unit testing the Transpiler and PythonEvaluator classes.
+
+    """
+
+    def test_evaluate(self):
+        """Test the evaluate method.
+
+        Tests the transpiled code gives the same values as the evaluator.
+
+        """
+        symbol_table = SymbolTable()
+        symbol_table.set("true", Number(1))
+        symbol_table.set("false", Number(0))
+        symbol_table.set("print", BuiltInFunction(["element"], 0))
+        symbol_table.set("input", BuiltInFunction([], 1))
+        symbol_table.set("convert", BuiltInFunction(["value", "type"], 2))
+
+        with open("test_cases/test_evaluator.in") as _input:
+            _input = _input.read()
+
+        with open("test_cases/test_evaluator.out") as output:
+            output = output.read()
+
+        self.assertEqual(
+            "".join(map(repr, PythonEvaluator(Parser(Lexer(_input, "test").lex()).parse(), symbol_table).evaluate())),
+            output
+        )
+
+        with open("test_cases/test_evaluator.in", "rb") as _input:
+            interpreter = Interpreter(_input, "test", symbol_table, evaluator=PythonEvaluator)
+
+        self.assertIsInstance(interpreter.evaluator, PythonEvaluator)
+        self.assertEqual("".join(map(repr, interpreter.return_values)), output)
+
+        # Return, continue and break end up where they would with the evaluator, including in loops nested more deeply
+        # than Python can compile
+        for code in ("function f() (while (0) (return 5)\nreturn 6)\nf()\n",
+                     "i = 0\nwhile (i < 5) (i = i + 1\nif (i is 2) (continue)\nif (i is 4) (break))\ni\n",
+                     "function g(a, b) (return a - b)\ng(3, 1 + g(2, 1))\n",
+                     "function h() (return function k() (return 7))\nh()()\n",
+                     "function m(a) (if (a) (break) otherwise (return 2) + 1)\n[m(0), m(1)]\n",
+                     "i = 0\n" + "while (i < 3) (" * 30 + "i = i + 1" + ")" * 30 + "\ni\n",
+                     "[1, \"a\", [2]][2][0] + 1 * 2 ^ 3\n1 / 0\n"):
+            self.assertEqual(
+                repr(list(PythonEvaluator(Parser(Lexer(code, "test").lex()).parse(), symbol_table.copy())
+                          .evaluate())),
+                repr(list(Evaluator(Parser(Lexer(code, "test").lex()).parse(), symbol_table.copy()).evaluate()))
+            )
+
+        for code in ("\nvariable", "import \"test\"\n", "nem(1, 2)\n", "[1, 2][2]\n", "22 * [1, 2]\n",
+                     "[1, 2] ^ [1, 2]\n", "a = return 1\n", "while (return 1) (print(1))\n",
+                     "if (return 1) (print(1))\n", "return 2\n", "function f(a) (a)\nf()\n", "-\"a\"\n",
+                     # The condition of a loop can give a signal after its first iteration too
+                     "i = 0\nwhile ((if ((i = i + 1) is 2) (return 5)) or (i < 3)) (i)\n"):
+            with self.assertRaises(EvaluatorException):
+                list(PythonEvaluator(Parser(Lexer(code, "<stdin>").lex()).parse(), symbol_table).evaluate())
+
+    def test_emit(self):
+        """Test the emit method.
+
+        Tests the Python source of the top-level expressions and of the functions defined in them.
+
+        """
+        sources = list(Transpiler().emit(Parser(Lexer("function f(a) (while (a) (break))\nf(0)\n", "test").lex())
+                                         .parse()))
+
+        self.assertEqual(len(sources), 3)
+        self.assertIn("def line_1(symbol_table):", sources[0])
+        self.assertIn("def function_1(symbol_table):", sources[1])
+        self.assertIn("while True:", sources[1])
+        self.assertIn("break", sources[1])
+        self.assertIn("# _c1 = Number(0)", sources[2])
+
+        for source in sources:
+            compile(source, "<nem>", "exec")
+
+
+if __name__ == '__main__':
+    # Only activates when the file gets ran directly.
+    unittest.main()